@@ -1,3 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import sys
+
+API_NAMES = ("generate", "load_context", "GenerationResult")
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # the api imports pyang, lxml, jinja2 and xmltodict, it is imported when it is used instead of when the
+        # command line tool starts.
+        if name in API_NAMES:
+            from . import api
+            return getattr(api, name)
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+else:
+    from .api import generate, load_context, GenerationResult
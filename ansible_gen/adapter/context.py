@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""context.py docstrings.
+This module holds the state of a generation run, which is passed explicitly through adapter and generator so that
+several generations can run in one process.
+"""
+
+
+class GenerationContext(object):
+    """
+    The state shared by the scripts generated in one run.
+        yang_dir: The directory of yang files.
+        features: The xmlns which need to be parsed, None means all modules.
+        yang_handler: The parsed YangParser, None before load_yang(), or the SchemaSnapshot the scripts are generated
+                      from without pyang.
+        messages: The lines reported when the run finishes, such as where each script is saved.
+        yang_headers: A dict. {module name: YangHeader} of the yang files of yang_dir, None before
+                      get_yang_headers().
+    The yang_handler is only read while generating scripts, besides the XpathInfoCache it fills, so one loaded
+    context can be used by several generations, each of them records its own messages by fork().
+    """
+
+    def __init__(self, yang_dir=None, features=None, yang_handler=None):
+        self.yang_dir = yang_dir
+        self.features = features
+        self.yang_handler = yang_handler
+        self.messages = []
+        self.yang_headers = None
+
+    @property
+    def ctx(self):
+        """The pyang Context of the parsed yang files."""
+        return self.yang_handler.ctx
+
+    def load_yang(self, module_cache=None, context_cache=None, jobs=1):
+        """Parse the yang files of yang_dir.
+        Args:
+            module_cache: A ModuleCache shared with other contexts, the yang files whose modules are cached with the
+                          same content are not parsed again.
+            context_cache: A ContextCache, the parsed yang files are loaded from it if they did not change since
+                           they were saved, else they are parsed and saved into it.
+            jobs: The number of processes parsing the yang files.
+        Returns:
+            self
+        """
+        # pyang is imported only when the yang files are parsed.
+        from .utils.yang_parse.yang_parser import YangParser
+        key = None
+        if context_cache is not None:
+            key = context_cache.get_key(self.yang_dir, self.features)
+            self.yang_handler = context_cache.load(key)
+            if self.yang_handler is not None:
+                return self
+        cache_dir = context_cache.cache_dir if context_cache is not None else None
+        self.yang_handler = YangParser(self.yang_dir, self.features, cache_dir).parse(module_cache, jobs)
+        if context_cache is not None:
+            context_cache.store(key, self.yang_handler)
+        return self
+
+    def get_yang_headers(self):
+        """Get the headers of the yang files of yang_dir, read once for this context.
+        Returns:
+            A dict. {module name: YangHeader}, see NamespaceIndex.scan().
+        """
+        if self.yang_headers is None:
+            from .utils.yang_parse.namespace_index import get_namespace_index
+            cache_dir = getattr(self.yang_handler, "cache_dir", None)
+            self.yang_headers, _ = get_namespace_index(cache_dir).scan(self.yang_dir, set())
+        return self.yang_headers
+
+    def fork(self):
+        """Get a context sharing the parsed yang files, with its own messages.
+        Returns:
+            A GenerationContext.
+        """
+        return GenerationContext(self.yang_dir, self.features, self.yang_handler)
+
+    def add_message(self, message):
+        self.messages.append(message)
+
+    def get_message(self):
+        """Get the messages the same way as they are printed, each line starts with a line break."""
+        return "".join("\n" + message for message in self.messages)
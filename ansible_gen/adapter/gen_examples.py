@@ -11,10 +11,19 @@ from .utils.xml_parse.xml_parser import get_operations_attr
 if sys.version < '3':
     str = unicode
 
-EXAMPLE_STR = ''
-LEVEL = 0
 module_files = []
 
+
+class ExampleState(object):
+    """
+    The example text of one instance-xml and the indent level while it is generated.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.level = 0
+
+
 def get_module_file(xml_dir, mod_files):
     """Get instance-xml's path.
     Args:
@@ -58,8 +67,6 @@ def gen_examples(module_files_dict, script_name, pkg_type, operation_dict_result
     """
     Generate example string.
     """
-    global EXAMPLE_STR
-    global LEVEL
     if pkg_type == "config":
         process = get_cfg_str
     elif pkg_type == "rpc":
@@ -85,6 +92,7 @@ def gen_examples(module_files_dict, script_name, pkg_type, operation_dict_result
         for key, v in file_dict.items():
             examples_str += '  - name: ' + os.path.basename(key) + '\n'
             examples_str += '    %s:' % script_name + '\n'
+            example_state = ExampleState()
             for xml_type, xml_dict in v.items():
                 examples_str += '      operation_type: ' + xml_type + '\n'
                 if xml_type == 'config':
@@ -101,20 +109,20 @@ def gen_examples(module_files_dict, script_name, pkg_type, operation_dict_result
                                         break
 
                 if pkg_type == "config":
-                    examples_str += process(xml_dict, argument_spec)
+                    examples_str += process(xml_dict, argument_spec, state=example_state)
                 else:
-                    examples_str += process(xml_dict, argument_spec)
-            EXAMPLE_STR = ''
-            LEVEL = 0
+                    examples_str += process(xml_dict, argument_spec, state=example_state)
 
         examples_str += '      provider: "{{ netconf }}"' + '\n'
         examples_str += '\n'
     return examples_str
 
-def get_filter_str(data, argument_spec):
+def get_filter_str(data, argument_spec, state=None):
     """
     Generate the example of filter.
     """
+    if state is None:
+        state = ExampleState()
     def get_leaf_str(data, indent, argument_spec, parent_node_type=None):
         leaf_str = ''
         list_flag = ""
@@ -156,19 +164,23 @@ def get_filter_str(data, argument_spec):
     if data:
         task_str += get_leaf_str(data, indent, argument_spec)
     else:
-        task_str += '    ' + '  ' * LEVEL + 'get_all: True' + '\n'
+        task_str += '    ' + '  ' * state.level + 'get_all: True' + '\n'
     return task_str
 
 
-def get_cfg_str(data, argument_spec, parent_node_type=None):
+def get_cfg_str(data, argument_spec, parent_node_type=None, state=None):
     """
-    Generate the example of config.
+    Generate the example of config.(recursive function).
+    Args:
+        state: The ExampleState the text is appended to, a new one if None.
+    Returns:
+        The text of state.
     """
+    if state is None:
+        state = ExampleState()
     if isinstance(data, OrderedDict):
-        global LEVEL
-        LEVEL += 1
+        state.level += 1
         for k, v in data.items():
-            global EXAMPLE_STR
             if not argument_spec.get(k):
                 continue
             if argument_spec[k].get("options"):
@@ -182,28 +194,28 @@ def get_cfg_str(data, argument_spec, parent_node_type=None):
 
             if isinstance(v, OrderedDict):
                 if parent_node_type and parent_node_type == "list":
-                    EXAMPLE_STR += '    ' + '  ' * LEVEL + '- ' + k + ': ' + '\n'
-                    LEVEL += 1
-                    get_cfg_str(v, argument_spec_options, parent_node_type_temp)
-                    LEVEL -= 1
+                    state.text += '    ' + '  ' * state.level + '- ' + k + ': ' + '\n'
+                    state.level += 1
+                    get_cfg_str(v, argument_spec_options, parent_node_type_temp, state)
+                    state.level -= 1
                 else:
-                    EXAMPLE_STR += '    ' + '  ' * LEVEL + k + ': ' + '\n'
-                    get_cfg_str(v, argument_spec_options, parent_node_type_temp)
+                    state.text += '    ' + '  ' * state.level + k + ': ' + '\n'
+                    get_cfg_str(v, argument_spec_options, parent_node_type_temp, state)
             elif isinstance(v, list):
                 for item in v:
                     if parent_node_type and parent_node_type == "list":
-                        EXAMPLE_STR += '    ' + '  ' * LEVEL + '- ' + k + ': ' + '\n'
-                        LEVEL += 1
-                        get_cfg_str(item, argument_spec_options, parent_node_type_temp)
-                        LEVEL -= 1
+                        state.text += '    ' + '  ' * state.level + '- ' + k + ': ' + '\n'
+                        state.level += 1
+                        get_cfg_str(item, argument_spec_options, parent_node_type_temp, state)
+                        state.level -= 1
                     else:
-                        EXAMPLE_STR += '    ' + '  ' * LEVEL + k + ': ' + '\n'
-                        get_cfg_str(item, argument_spec_options, parent_node_type_temp)
+                        state.text += '    ' + '  ' * state.level + k + ': ' + '\n'
+                        get_cfg_str(item, argument_spec_options, parent_node_type_temp, state)
             else:
                 if v:
                     if argument_spec[k].get("type") and argument_spec[k]["type"] == "str":
                         v = '\"' + v + '\"'
-                    EXAMPLE_STR += '    ' + '  ' * LEVEL + k + ': ' + v + '\n'
+                    state.text += '    ' + '  ' * state.level + k + ': ' + v + '\n'
                 else:
                     if argument_spec[k].get("type") and argument_spec[k]["type"] == "dict":
                         value_empty = '{}'
@@ -211,25 +223,27 @@ def get_cfg_str(data, argument_spec, parent_node_type=None):
                         value_empty = '[]'
                     else:
                         value_empty = '\"\"'
-                    EXAMPLE_STR += '    ' + '  ' * LEVEL + k + ': ' + value_empty + '\n'
+                    state.text += '    ' + '  ' * state.level + k + ': ' + value_empty + '\n'
 
-    LEVEL -= 1
-    return EXAMPLE_STR
+    state.level -= 1
+    return state.text
 
 
-def create_example(full_xml_file_path, script_name, pkg_type, argument_spec):
+def create_example(full_xml_file_path, script_name, pkg_type, argument_spec, module_files=None):
     """Generate example.
     Args:
         full_xml_file_path: The path of full-xml.
         script_name: The file name of full-xml.
         pkg_type: Type of xml. The value is "config" or "filter".
+        module_files: The paths of instance-xml recorded in the work plan, scan the directory of full-xml if None.
     Returns:
         example_str: The example string.
         Compare the instance-xml's structure with full-xml,to make sure instance-xml is a subset of full-xml.
     """
     # Get all instance-xml.
-    module_files = get_module_file(os.path.dirname(full_xml_file_path), [])
-    module_files.sort()
+    if module_files is None:
+        module_files = get_module_file(os.path.dirname(full_xml_file_path), [])
+    module_files = sorted(module_files)
     module_files_dict = []
     operation_dict_result = []
     for file in module_files:
@@ -6,12 +6,14 @@ import time
 import logging
 import re
 from .utils.xml_parse.xml_parser import xml_to_ordered_dict
-from .utils.yang_parse.yang_parser import YangParser
 from .utils.yang_parse.interfaces import get_leaf_info_for_doc, get_leafinfos_from_xml_dict, \
     get_module_description, make_argument_spec, get_key_leafs, get_all_lists, check_all_node_exists
+from .utils.yang_parse.schema_snapshot import SchemaSnapshot
+from .utils.yang_parse.yang_header import get_dependency_files
 from .utils.base_util import error_write
+from .work_plan import build_work_plan
+from .context import GenerationContext
 
-YANG_HANDLER = ''  # define the global YANG_HANDLER
 DEFAULT_INDENT = ' ' * 4
 
 
@@ -30,105 +32,105 @@ def get_features_namespace(xml_dir):
     :param xml_dir: the xml dir.
     :return:features_namespace: the set of all xmlns which need to be parsed.
     """
-    features_namespace = set()
-    files = os.listdir(xml_dir)
-    for file in files:
-        if os.path.isfile(os.path.join(xml_dir, file)):
-            if not file.endswith("_example.xml"):
-                with open(os.path.join(xml_dir, file), 'r') as xml_file:
-                    xml_str = xml_file.read()
-                if xml_str.strip() == '':
-                    logging.error("%s is empty", file)
-                else:
-                    xmlns = list()
-                    for item in re.findall(r'xmlns.*?="(.*?)"', xml_str):
-                        xmlns.append(item)
-                    for item in re.findall(r"xmlns.*?='(.*?)'", xml_str):
-                        xmlns.append(item)
-                    if xmlns:
-                        for xmlns_item in xmlns:
-                            features_namespace.add(xmlns_item)
-                    else:
-                        logging.error("%s has no xmlns", file)
-        else:
-            features_namespace = features_namespace | get_features_namespace(os.path.join(xml_dir, file))
-
-    return features_namespace
+    return build_work_plan(xml_dir).get_namespaces()
 
 
-def get_yang_handlers(yang_dir, xml_dir):
+def get_generation_context(yang_dir, xml_dir, features=None, module_cache=None, context_cache=None, jobs=1):
     """
-    get the yang_handler of the yang_dir
-    :param dir: the dir containing yang files
-    :return:YANG_HANDLER
+    parse the yang files of the yang_dir into a new generation context
+    :param yang_dir: the dir containing yang files
+    :param xml_dir: the xml dir
+    :param features: the xmlns which need to be parsed, all xmlns under xml_dir by default, see
+                     WorkPlan.get_namespaces(). All yang modules are parsed if both xml_dir and features are None
+    :param module_cache: a ModuleCache shared by the contexts of a batch run, None to parse all yang files
+    :param context_cache: a ContextCache of the cache directory, None to parse the yang files every run
+    :param jobs: the number of processes parsing the yang files
+    :return: the GenerationContext with yang files loaded
     """
-    global YANG_HANDLER
+    if features is None and xml_dir is not None:
+        features = get_features_namespace(xml_dir)
+    return GenerationContext(yang_dir, features).load_yang(module_cache, context_cache, jobs)
 
-    features = get_features_namespace(xml_dir)
-    factory = YangParser(yang_dir, features)
-    YANG_HANDLER = factory.parse()
-    return YANG_HANDLER
+
+def get_yang_dependencies(context, xml_namespace):
+    """
+    get the yang files which the modules of xml_namespace resolved against
+    :param context: the GenerationContext
+    :param xml_namespace: the set of xmlns of a xml file
+    :return: the sorted list of yang file paths, the closure of imports, includes and the modules augmenting or
+             deviating them the same as the context loads, or the snapshot file if the context is read from a
+             schema snapshot
+    """
+    if isinstance(context.yang_handler, SchemaSnapshot):
+        return [os.path.abspath(context.yang_handler.path)]
+    return get_dependency_files(context.get_yang_headers(), xml_namespace)
 
 
-def get_xml_descption(xml_namespace):
+def get_xml_descption(context, xml_namespace):
     """
     get the xml_description from yang_file of the xml_file
+    :param context: the GenerationContext
     :param xml_file: xml_file
     :return: the xml_description
     """
-    parser = YANG_HANDLER
+    parser = context.yang_handler
     return get_module_description(parser, xml_namespace)
 
 
-def get_xml_options(full_xml_file_path, full_xml_ordered_dict, xmlns_info):
+def get_xml_options(context, full_xml_file_path, full_xml_ordered_dict, xmlns_info):
     """
     get the xml_params of the xml
+    :param context: the GenerationContext
     :param xml_file: xml_file
     :return:the xml_params of the xml
     """
-    return get_leaf_info_for_doc(full_xml_file_path, full_xml_ordered_dict, YANG_HANDLER, xmlns_info)
+    return get_leaf_info_for_doc(full_xml_file_path, full_xml_ordered_dict, context.yang_handler, xmlns_info)
 
 
-def get_xml_leafinfos(full_xml_ordered_dict, xmlns_info):
+def get_xml_leafinfos(context, full_xml_ordered_dict, xmlns_info):
     """
     get the xml_leafinfos of the xml
+    :param context: the GenerationContext
     :param xml_file: xml_file
     :return:the xml_leafinfos of the xml
     """
-    yang_handlers = YANG_HANDLER
+    yang_handlers = context.yang_handler
     xml_leafinfos = get_leafinfos_from_xml_dict(full_xml_ordered_dict, yang_handlers, xmlns_info)
     return xml_leafinfos
 
 
-def get_xml_key_leafs(full_xml_ordered_dict, xmlns_info):
+def get_xml_key_leafs(context, full_xml_ordered_dict, xmlns_info):
     """
     get the xml_leafinfos of the xml
+    :param context: the GenerationContext
     :param full_xml_ordered_dict:
     :return:the xml_leafinfos of the xml
     """
-    yang_handlers = YANG_HANDLER
+    yang_handlers = context.yang_handler
     xml_key_leafs = get_key_leafs(full_xml_ordered_dict, yang_handlers, xmlns_info)
     return xml_key_leafs
 
 
-def get_xml_list_leafs(full_xml_ordered_dict, xmlns_info):
+def get_xml_list_leafs(context, full_xml_ordered_dict, xmlns_info):
     """
     get the xml_leafinfos of the xml
+    :param context: the GenerationContext
     :param full_xml_ordered_dict:
     :return:the xml_leafinfos of the xml
     """
-    yang_handlers = YANG_HANDLER
+    yang_handlers = context.yang_handler
     xml_key_leafs = get_all_lists(full_xml_ordered_dict, yang_handlers, xmlns_info)
     return xml_key_leafs
 
 
-def gen_argument_spec(full_xml_ordered_dict, xmlns_info, key_list, list_list):
+def gen_argument_spec(context, full_xml_ordered_dict, xmlns_info, key_list, list_list):
     """
     get the argument_spec of the xml
+    :param context: the GenerationContext
     :param xml_leafinfos: xml_leafinfos
     :return:the argument_spec of the xml
     """
-    return make_argument_spec(full_xml_ordered_dict, YANG_HANDLER, xmlns_info, key_list, list_list)
+    return make_argument_spec(full_xml_ordered_dict, context.yang_handler, xmlns_info, key_list, list_list)
 
 
 def gen_options(data, options_str, level=0):
@@ -260,5 +262,5 @@ def get_options_str(xml_type):
     return options_str
 
 
-def check_xpaths_exists(xml_dict, xmlns_info):
-    return check_all_node_exists(xml_dict, YANG_HANDLER, xmlns_info)
\ No newline at end of file
+def check_xpaths_exists(context, xml_dict, xmlns_info):
+    return check_all_node_exists(xml_dict, context.yang_handler, xmlns_info)
\ No newline at end of file
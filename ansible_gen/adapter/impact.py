@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""impact.py docstrings.
+This module finds the modules of a work plan affected by changed files from the xml namespaces and the headers of
+yang files, without parsing the yang files by pyang.
+
+A module depends on the yang modules of its xmlns, the modules they import or include, and the modules augmenting
+or deviating any of them, which change their schema tree when they are loaded in the same context.
+"""
+
+import os
+
+from .utils.yang_parse.yang_header import YANG_FILE_PATTERN, get_namespace_roots, get_load_closure
+from .utils.yang_parse.namespace_index import INDEX_FILE, NamespaceIndex
+
+
+class ImpactGraph(object):
+    """
+    The yang modules each module of a work plan depends on.
+        headers: A dict. {module name: YangHeader} of the yang files under yang_dir, read by a NamespaceIndex the same
+                 as YangParser.get_yang_files().
+        previous_entries: A dict. {absolute path: index entry} of the namespace index saved into the cache directory
+                          by the last generation, see namespace_index.read_yang_entry().
+    """
+
+    def __init__(self, yang_dir, cache_dir=None):
+        self.yang_dir = yang_dir
+        self.previous_entries = dict()
+        if cache_dir:
+            self.previous_entries = NamespaceIndex(os.path.join(cache_dir, INDEX_FILE)).entries
+        # the index is not saved, so the entries of the last generation are kept for the next plan.
+        index = NamespaceIndex()
+        index.entries = dict(self.previous_entries)
+        self.headers, _ = index.scan(yang_dir, set())
+
+    def get_yang_modules(self, namespaces):
+        """Get the names of yang modules the xmlns depend on.
+        Args:
+            namespaces: The xmlns of a module.
+        Returns:
+            A set of module names, the imported or included ones without yang file are kept, so a module is
+            affected when the missing yang file is added.
+        """
+        return get_load_closure(self.headers, get_namespace_roots(self.headers, namespaces))
+
+    def get_changed_yang_modules(self, changed_files):
+        """Get the yang modules of the changed yang files, the removed files are named by the previous index entry or
+        by file name.
+        A changed yang file affects its module and the modules it augmented or deviated before the change, which are
+        read from the previous index entry, a yang file without one is added since. Without the previous index they
+        are not known, and the modules the yang file imports are affected.
+        Args:
+            changed_files: The absolute paths of changed files.
+        Returns:
+            A dict. {changed yang file: set of module names}.
+        """
+        path_headers = dict((os.path.abspath(header.path), header) for header in self.headers.values())
+        changed_modules = dict()
+        for changed_file in changed_files:
+            match_obj = YANG_FILE_PATTERN.match(os.path.basename(changed_file))
+            if not match_obj:
+                continue
+            header = path_headers.get(changed_file)
+            entry = self.previous_entries.get(changed_file)
+            names = set()
+            if header is not None:
+                names.add(header.name)
+            if entry is not None and entry[2] is not None:
+                names.add(entry[3])
+                names.update(entry[7])
+            elif header is not None and not self.previous_entries:
+                names.update(header.imports)
+            if not names:
+                names.add(match_obj.group(1))
+            changed_modules[changed_file] = names
+        return changed_modules
+
+
+def get_plan_inputs(plan, script_dir):
+    """Get the input files of a module except the yang files, the same as manifest.get_module_inputs().
+    Args:
+        plan: A ModulePlan.
+        script_dir: The directory of UserCheck scripts, from command line -p.
+    Returns:
+        A set of absolute paths.
+    """
+    inputs = set(os.path.abspath(path) for path in plan.example_xmls)
+    inputs.add(os.path.abspath(plan.full_xml))
+    if script_dir:
+        inputs.add(os.path.abspath(os.path.join(script_dir, plan.script_name + ".py")))
+    return inputs
+
+
+def get_affected_plans(work_plan, yang_dir, changed_files, script_dir=None, cache_dir=None):
+    """Get the modules whose generated script may change with the changed files.
+    Args:
+        work_plan: The WorkPlan of command line -r.
+        yang_dir: The directory of yang files.
+        changed_files: The paths of changed, added or removed files.
+        script_dir: The directory of UserCheck scripts, from command line -p.
+        cache_dir: The cache directory of the generation, the augment targets of the changed yang files before the
+                   change are read from its namespace index.
+    Returns:
+        affected: A list of ModulePlan in the order of work plan.
+        unmatched: A sorted list of the changed files which affect no module.
+    """
+    changed_files = set(os.path.abspath(changed_file) for changed_file in changed_files)
+    graph = ImpactGraph(yang_dir, cache_dir)
+    changed_modules = graph.get_changed_yang_modules(changed_files)
+    namespace_yang_modules = dict()
+    matched = set()
+    affected = []
+    for plan in work_plan:
+        inputs = get_plan_inputs(plan, script_dir)
+        module_dir = os.path.join(os.path.abspath(plan.module_dir), "")
+        if plan.namespaces not in namespace_yang_modules:
+            namespace_yang_modules[plan.namespaces] = graph.get_yang_modules(plan.namespaces)
+        yang_modules = namespace_yang_modules[plan.namespaces]
+        # a xml added to or removed from the module directory or its sub directories changes its examples.
+        changes = set(changed_file for changed_file in changed_files
+                      if changed_file in inputs or changed_file.startswith(module_dir))
+        changes.update(changed_file for changed_file, names in changed_modules.items() if names & yang_modules)
+        if changes:
+            affected.append(plan)
+            matched.update(changes)
+    return affected, sorted(changed_files - matched)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""partition.py docstrings.
+This module groups the modules of a work plan by the yang files they need, so each group is generated with a
+context parsing only its own yang files, which is freed before the next group is parsed.
+"""
+
+import sys
+from collections import namedtuple
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from .utils.yang_parse.yang_header import get_namespace_roots, get_load_closure
+from .utils.yang_parse.namespace_index import get_namespace_index
+
+
+class Partition(namedtuple("Partition", ["plans", "namespaces", "yang_modules", "size"])):
+    """
+    A group of modules generated with one context.
+        plans: A list of ModulePlan in the order of work plan.
+        namespaces: A set. The xmlns the context is parsed for.
+        yang_modules: A set. The names of yang modules the namespaces need, including the imported and augmenting ones.
+        size: The size of the yang files of yang_modules in bytes.
+    """
+    __slots__ = ()
+
+
+def get_components(plans, yang_namespaces):
+    """Join the modules sharing a namespace, the modules of different components need different yang modules.
+    Args:
+        plans: A list of ModulePlan.
+        yang_namespaces: The namespaces of yang modules, the others such as the netconf base namespace do not join
+                         the modules.
+    Returns:
+        A list of (plans, namespaces).
+    """
+    parents = dict()
+
+    def find(namespace):
+        while parents[namespace] != namespace:
+            parents[namespace] = parents[parents[namespace]]
+            namespace = parents[namespace]
+        return namespace
+
+    for plan in plans:
+        namespaces = sorted(plan.namespaces & yang_namespaces)
+        for namespace in namespaces:
+            parents.setdefault(namespace, namespace)
+        for namespace in namespaces[1:]:
+            parents[find(namespace)] = find(namespaces[0])
+
+    components = dict()
+    for plan in plans:
+        namespaces = plan.namespaces & yang_namespaces
+        root = find(next(iter(namespaces))) if namespaces else None
+        component = components.setdefault(root, ([], set()))
+        component[0].append(plan)
+        component[1].update(plan.namespaces)
+    return list(components.values())
+
+
+def get_partitions(plans, yang_dir, size_limit, cache_dir=None):
+    """Group the modules so that the yang files of a group are about size_limit bytes at most.
+    Args:
+        plans: A list of ModulePlan.
+        yang_dir: The directory of yang files.
+        size_limit: The size of yang files a group may need, a component needing more is a group alone.
+        cache_dir: The directory the namespace index is saved into, the same as the contexts of the groups load with.
+    Returns:
+        A list of Partition, the modules needing similar yang modules are put together.
+    """
+    headers, _ = get_namespace_index(cache_dir).scan(yang_dir, set())
+    yang_namespaces = set(header.namespace for header in headers.values() if header.namespace is not None)
+    candidates = []
+    for component_plans, namespaces in get_components(plans, yang_namespaces):
+        # the modules a context parsing the namespaces loads, see YangParser.get_yang_files().
+        yang_modules = set(name for name in get_load_closure(headers, get_namespace_roots(headers, namespaces))
+                           if name in headers)
+        candidates.append((sorted(yang_modules), component_plans, namespaces))
+    # the components importing the same modules are adjacent after sorted.
+    candidates.sort(key=lambda candidate: candidate[0])
+
+    partitions = []
+    group = None
+    for yang_modules, component_plans, namespaces in candidates:
+        if group is not None:
+            merged_modules = group[2] | set(yang_modules)
+            if sum(headers[name].size for name in merged_modules) <= size_limit:
+                group = (group[0] + component_plans, group[1] | namespaces, merged_modules)
+                continue
+            partitions.append(group)
+        group = (list(component_plans), set(namespaces), set(yang_modules))
+    if group is not None:
+        partitions.append(group)
+
+    order = dict((plan, index) for index, plan in enumerate(plans))
+    return [Partition(sorted(group_plans, key=order.get), namespaces, yang_modules,
+                      sum(headers[name].size for name in yang_modules))
+            for group_plans, namespaces, yang_modules in partitions]
+
+
+def reset_peak_rss():
+    """Reset the peak resident set size of current process, only supported by linux."""
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+        return True
+    except (IOError, OSError):
+        return False
+
+
+def get_peak_rss():
+    """Get the peak resident set size of current process in bytes, since the last reset_peak_rss() on linux.
+    Returns:
+        The size, None if it is unknown.
+    """
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (IOError, OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on mac, kilobytes on linux.
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
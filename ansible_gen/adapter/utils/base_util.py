@@ -1,9 +1,15 @@
 import os
 import sys
 import logging
+import threading
+import importlib
 import traceback
+from collections import OrderedDict
 if sys.version < '3':
     import Queue
+else:
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
 
 
 START_ERROR = "\n##########ANSIBLE_GEN_ERROR_START##########\n"
@@ -11,6 +17,213 @@ END_ERROR = "\n###########ANSIBLE_GEN_ERROR_END###########"
 START_OPERATION_WARNING = "\n##########USER_OPERATION_WARNING_START##########\n"
 END_OPERATION_WARNING = "\n###########USER_OPERATION_WARNING_END###########"
 OLD_PROCESS_MESSAGE_LEN = 0
+LOG_FORMAT = '%(asctime)s,%(levelname)s,%(filename)s,%(lineno)d:%(message)s'
+# the stack of active Diagnostics of each thread.
+DIAGNOSTICS_STATE = threading.local()
+# the QueueListener writing the log file in background, see start_logging().
+LOG_LISTENER = None
+
+
+class Diagnostics(object):
+    """
+    The errors and warnings written by error_write() and operation_warning_write() while it is active, they
+    are recorded into the innermost active Diagnostics of current thread:
+
+        with Diagnostics() as diagnostics:
+            ...
+        diagnostics.get_errors()
+
+    errors: The error messages not belonging to any module.
+    warnings: The user operation warning messages not belonging to any module.
+    suppressed: A dict. {message format: count} of the messages log_xpath_message() dropped by log level.
+    modules: An OrderedDict. {script path: Diagnostics of the module}.
+    """
+
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+        self.suppressed = dict()
+        self.modules = OrderedDict()
+
+    def __enter__(self):
+        if not hasattr(DIAGNOSTICS_STATE, "stack"):
+            DIAGNOSTICS_STATE.stack = []
+        DIAGNOSTICS_STATE.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        DIAGNOSTICS_STATE.stack.remove(self)
+        return False
+
+    def add_module(self, module, diagnostics):
+        """Record the Diagnostics of a module, which may come from a pool worker."""
+        self.modules[module] = diagnostics
+
+    def get_errors(self):
+        errors = list(self.errors)
+        for diagnostics in self.modules.values():
+            errors.extend(diagnostics.get_errors())
+        return errors
+
+    def get_warnings(self):
+        warnings = list(self.warnings)
+        for diagnostics in self.modules.values():
+            warnings.extend(diagnostics.get_warnings())
+        return warnings
+
+    def get_suppressed(self):
+        suppressed = dict(self.suppressed)
+        for diagnostics in self.modules.values():
+            for msg, count in diagnostics.get_suppressed().items():
+                suppressed[msg] = suppressed.get(msg, 0) + count
+        return suppressed
+
+    def to_dict(self):
+        return {"errors": self.errors,
+                "warnings": self.warnings,
+                "suppressed": self.suppressed,
+                "modules": OrderedDict((module, diagnostics.to_dict())
+                                       for module, diagnostics in self.modules.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        diagnostics = cls()
+        diagnostics.errors = list(data.get("errors", []))
+        diagnostics.warnings = list(data.get("warnings", []))
+        diagnostics.suppressed = dict(data.get("suppressed", dict()))
+        for module, module_data in data.get("modules", dict()).items():
+            diagnostics.modules[module] = cls.from_dict(module_data)
+        return diagnostics
+
+
+def get_diagnostics():
+    """Get the innermost active Diagnostics of current thread, None if there is not one."""
+    stack = getattr(DIAGNOSTICS_STATE, "stack", None)
+    return stack[-1] if stack else None
+
+
+def format_error(error_string):
+    """Get the error block the same as it is written into log file."""
+    return "%s%s%s" % (START_ERROR.lstrip("\n"), error_string, END_ERROR)
+
+
+def format_operation_warning(operation_warning_string):
+    """Get the warning block the same as it is written into log file."""
+    return "%s%s%s" % (START_OPERATION_WARNING.lstrip("\n"), operation_warning_string, END_OPERATION_WARNING)
+
+
+class LazyModule(object):
+    """
+    A module imported at the first access of its attributes, so the commands which do not parse yang files or
+    render scripts start without importing pyang, lxml, jinja2 and xmltodict.
+        name: The absolute name of module.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attr):
+        # only called for the attributes of module, name and module are found in __dict__.
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attr)
+
+
+if sys.version >= '3':
+    class LogQueueHandler(QueueHandler):
+        """
+        Put the record into the queue as it is, the message is formatted by the log thread instead of the caller.
+        """
+
+        def prepare(self, record):
+            return record
+
+
+def start_logging(log_file_name, log_level):
+    """Log into log_file_name by a background thread, the caller only puts the records into a queue.
+    Args:
+        log_file_name: The path of log file.
+        log_level: The level name or number of root logger.
+    """
+    global LOG_LISTENER
+    if sys.version < '3':
+        logging.basicConfig(filename=log_file_name, format=LOG_FORMAT, level=log_level)
+        return
+    file_handler = logging.FileHandler(log_file_name)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    LOG_LISTENER = QueueListener(queue.Queue(), file_handler)
+    root = logging.getLogger()
+    root.setLevel(log_level)
+    root.addHandler(LogQueueHandler(LOG_LISTENER.queue))
+    LOG_LISTENER.start()
+
+
+def restart_logging():
+    """Start the log thread again in a process forked after start_logging(), the thread is not inherited."""
+    global LOG_LISTENER
+    if LOG_LISTENER is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    LOG_LISTENER = QueueListener(queue.Queue(), *LOG_LISTENER.handlers)
+    root.addHandler(LogQueueHandler(LOG_LISTENER.queue))
+    LOG_LISTENER.start()
+
+
+def flush_logging():
+    """Wait until the log thread has written all records logged before."""
+    if LOG_LISTENER is not None:
+        LOG_LISTENER.queue.join()
+
+
+def stop_logging():
+    """Write the queued records and stop the log thread, the records logged later are written directly."""
+    global LOG_LISTENER
+    if LOG_LISTENER is None:
+        return
+    LOG_LISTENER.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    for handler in LOG_LISTENER.handlers:
+        root.addHandler(handler)
+    LOG_LISTENER = None
+
+
+def log_xpath_message(level, msg, *args):
+    """Log the message repeated for many xpaths, it is only counted into the active Diagnostics if the level is
+    disabled, see log_suppressed().
+    Args:
+        level: The log level, e.g. logging.DEBUG.
+        msg: The message format.
+        args: The arguments of message format, only formatted when the level is enabled.
+    """
+    if logging.root.isEnabledFor(level):
+        logging.log(level, msg, *args)
+        return
+    diagnostics = get_diagnostics()
+    if diagnostics is not None:
+        diagnostics.suppressed[msg] = diagnostics.suppressed.get(msg, 0) + 1
+
+
+def log_suppressed(diagnostics):
+    """Log how many per-xpath messages of the run were dropped by log level.
+    Args:
+        diagnostics: The Diagnostics of the run.
+    """
+    suppressed = diagnostics.get_suppressed()
+    if not suppressed:
+        return
+    # the summary itself is written whatever the level is.
+    level = max(logging.WARNING, logging.root.getEffectiveLevel())
+    logging.log(level, "%d per-xpath messages are suppressed by log level %s, set log_level in default.cfg to "
+                "see them:", sum(suppressed.values()), logging.getLevelName(logging.root.level))
+    for msg, count in sorted(suppressed.items(), key=lambda item: -item[1]):
+        logging.log(level, "  %d x \"%s\"", count, msg)
 
 
 def error_write(error_string):
@@ -27,6 +240,9 @@ def error_write(error_string):
     if exc_value and traceback.format_exc().strip() != 'None':
         logging.error(traceback.format_exc())
     logging.error("%s%s%s" % (START_ERROR, error_string, END_ERROR))
+    diagnostics = get_diagnostics()
+    if diagnostics is not None:
+        diagnostics.errors.append(str(error_string))
 
 
 def operation_warning_write(operation_warning_string):
@@ -35,6 +251,9 @@ def operation_warning_write(operation_warning_string):
         operation_warning_string: The warning message.
     """
     logging.error("%s%s%s" % (START_OPERATION_WARNING, operation_warning_string, END_OPERATION_WARNING))
+    diagnostics = get_diagnostics()
+    if diagnostics is not None:
+        diagnostics.warnings.append(str(operation_warning_string))
 
 
 def xml_structure_except(exception_object, file_path):
@@ -76,3 +295,22 @@ def print_progress_bar(completed_progress, process_message):
         sys.stdout.write(process_bar + process_message + str(space_len * ' '))
     sys.stdout.flush()
     OLD_PROCESS_MESSAGE_LEN = len(process_message)
+
+
+def get_dir_snapshot(directory):
+    """Get the modification state of all files under directory.
+    Args:
+        directory: The directory to watch.
+    Returns:
+        snapshot: A dict. {file_path: (mtime, size)}.
+    """
+    snapshot = dict()
+    for dir_path, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime, stat.st_size)
+    return snapshot
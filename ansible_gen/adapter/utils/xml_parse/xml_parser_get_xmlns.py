@@ -10,8 +10,6 @@ from collections import OrderedDict
 import xmltodict
 from ..base_util import error_write, xml_structure_except
 
-CONFIG_OR_FILTER_CONTENT = OrderedDict()
-XMLNS_INFO_LIST = []
 
 def process_xml_dict(xml_dict,pkg_type):
     rpc_xml_dict = xml_dict['rpc']
@@ -24,12 +22,13 @@ def process_xml_dict(xml_dict,pkg_type):
     else:
         return rpc_xml_dict
 
-def get_config_or_filter(xml_dic):
+def get_config_or_filter(xml_dic, config_or_filter_content=None):
     """Get filter/config's descendant node.(recursive function).
     Args:
         xml_dic: An OrderedDict. Mapping xml's structure.
+        config_or_filter_content: The content found before xml_dic.
     Returns:
-        CONFIG_OR_FILTER_CONTENT: global var.Used to save [config] or [filter] content.
+        config_or_filter_content: Used to save [config] or [filter] content, the last one found.
         for example:
             OrderedDict([('if:interfaces',
                 OrderedDict([('@xmlns:if', 'urn:ietf:params:xml:ns:yang:ietf-interfaces'),
@@ -40,23 +39,23 @@ def get_config_or_filter(xml_dic):
     """
     for item in xml_dic:
         if item == 'config' or item == 'filter':
-            global CONFIG_OR_FILTER_CONTENT
-            CONFIG_OR_FILTER_CONTENT = xml_dic[item]
+            config_or_filter_content = xml_dic[item]
         else:
             if item.find("@") < 0 and item.find("#") < 0:
                 # recursive when the value is instance of OrderedDict.
                 if isinstance(xml_dic[item], OrderedDict):
-                    get_config_or_filter(xml_dic[item])
+                    config_or_filter_content = get_config_or_filter(xml_dic[item], config_or_filter_content)
+    return config_or_filter_content
 
-def get_rpc_input(xml_dic):
+def get_rpc_input(xml_dic, config_or_filter_content):
     for item in xml_dic["rpc"]:
         if item.find("@") < 0 and item.find("#") < 0:
-            global CONFIG_OR_FILTER_CONTENT
             if(xml_dic["rpc"] is None):
                 print(xml_dic["rpc"])
-            if CONFIG_OR_FILTER_CONTENT is None:
-                print(CONFIG_OR_FILTER_CONTENT)
-            CONFIG_OR_FILTER_CONTENT[item] = xml_dic["rpc"][item]
+            if config_or_filter_content is None:
+                print(config_or_filter_content)
+            config_or_filter_content[item] = xml_dic["rpc"][item]
+    return config_or_filter_content
 # def generate_xmlns_info(parent_xpath,parent_xmlns,xmlns_list,current_node_content):
 #     if current_node_content is None or len(current_node_content) == 0:
 #         return
@@ -66,13 +65,14 @@ def get_rpc_input(xml_dic):
 #             continue
 #         xpath = parent_xpath + '/' + current_node_name
 
-def generate_xmlns_info_with_recursive(current_node_content, xpath):
+def generate_xmlns_info_with_recursive(current_node_content, xpath, xmlns_info_list):
     """Generate xmlns_info with recursive.(recursive function).
     Args:
         current_node_content: An OrderedDict. Used to record current node's content.
         xpath: Used to record the node's xpath.
+        xmlns_info_list: The list that nodes's xmlns information is appended to.
     Returns:
-        XMLNS_INFO_LIST: global list.Recording all nodes's xmlns information.
+        xmlns_info_list: Recording all nodes's xmlns information.
         structure like:
             [
              { '/node1/prefix2:node2':['node2-value','xmlns2'] },
@@ -87,7 +87,6 @@ def generate_xmlns_info_with_recursive(current_node_content, xpath):
             xpath = xpath + '/' + current_node_name
             xmlns_str = ''
             text_str = ''
-            global XMLNS_INFO_LIST
             # case: ( 'currentElementNodeName',OrderedDict([(...)]) ):
             if isinstance(current_node_content[current_node_name], OrderedDict):
                 for child_node_name in current_node_content[current_node_name]:
@@ -118,9 +117,10 @@ def generate_xmlns_info_with_recursive(current_node_content, xpath):
                                     child_text_str = current_node_content[current_node_name][child_node_name][grandson_node_name]
                                     continue
                             child_xpath_dict[child_xpath] = [child_text_str, child_xmlns_str]
-                            XMLNS_INFO_LIST.append(child_xpath_dict)
+                            xmlns_info_list.append(child_xpath_dict)
                             # recursive
-                            generate_xmlns_info_with_recursive(current_node_content[current_node_name][child_node_name], child_xpath)
+                            generate_xmlns_info_with_recursive(current_node_content[current_node_name][child_node_name], child_xpath,
+                                                               xmlns_info_list)
                         # case: ( 'childElementNodeName','childTextContent' )
                         elif isinstance(current_node_content[current_node_name][child_node_name], str):
                             child_text_str = current_node_content[current_node_name][child_node_name]
@@ -129,13 +129,13 @@ def generate_xmlns_info_with_recursive(current_node_content, xpath):
                                 child_xpath_dict[child_xpath] = [child_text_str, '']
                             else:
                                 child_xpath_dict[child_xpath] = ['', '']
-                            XMLNS_INFO_LIST.append(child_xpath_dict)
+                            xmlns_info_list.append(child_xpath_dict)
                         # case: ( 'childElementNodeName',None )
                         # current_node_content[current_node_name][child_node_name] is None:
                         else:
                             child_xpath_dict = dict()
                             child_xpath_dict[child_xpath] = ['', '']
-                            XMLNS_INFO_LIST.append(child_xpath_dict)
+                            xmlns_info_list.append(child_xpath_dict)
             # case: ( 'currentElementNodeName','currentTextContent' ):
             else:
                 text_str = current_node_content[current_node_name]
@@ -143,12 +143,12 @@ def generate_xmlns_info_with_recursive(current_node_content, xpath):
                 text_str = ''
             xpath_dict = dict()
             xpath_dict[xpath] = [text_str, xmlns_str]
-            XMLNS_INFO_LIST.append(xpath_dict)
+            xmlns_info_list.append(xpath_dict)
             xpath = xpath[:-(len(current_node_name)+1)]
+    return xmlns_info_list
 
 def generate_xmlns_info(file,pkg_type):
-    global XMLNS_INFO_LIST
-    XMLNS_INFO_LIST = []
+    xmlns_info_list = []
     try:
         with open(file, 'r') as read:
             xml_str = read.read()
@@ -157,13 +157,13 @@ def generate_xmlns_info(file,pkg_type):
             if xml_dic is None:
                 return None
             xpath = ''
-            generate_xmlns_info_with_recursive(xml_dic, xpath)
+            generate_xmlns_info_with_recursive(xml_dic, xpath, xmlns_info_list)
     except ExpatError as expat_exception:
         xml_structure_except(expat_exception, file)
     except Exception as error_str:
         error_write(error_str)
     finally:
-        return XMLNS_INFO_LIST
+        return xmlns_info_list
 
 
 # def generate_xmlns_info(file):
@@ -296,7 +296,7 @@ def get_xml_namespace(file_name,pkg_type):
                     0].childNodes
         else:
             child_nodes = root.childNodes
-            logging.info("This is rpc-xml:" + file_name)
+            logging.info("This is rpc-xml:%s", file_name)
 
         if child_nodes is not None:
             for child_node in child_nodes:
@@ -342,8 +342,7 @@ def get_node_xmlns(xpath, xmlns_info, pre_element_node_prefix=""):
             elif len(end_element_node_list) == 2:
                 element_node_prefix = end_element_node_list[0]
             else:
-                logging.info("the len of element_node_prefix not equal 1 or 2,please check xpath: " +
-                             str(xpath))
+                logging.info("the len of element_node_prefix not equal 1 or 2,please check xpath: %s", xpath)
 
             if pre_element_node_prefix != "" and pre_element_node_prefix != element_node_prefix:
                 element_node_prefix = pre_element_node_prefix
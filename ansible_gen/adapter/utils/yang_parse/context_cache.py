@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""context_cache.py docstrings.
+This module saves the parsed and validated YangParser into a cache directory, so that a later run parsing the same
+yang files loads it instead of parsing and validating them again.
+
+The key of an entry covers the version of ansible-gen, its cache format and pyang, the yang directory, the namespaces
+to parse and the content of every yang file the parse may read, see ContextCache.get_key().
+
+Loading an entry unpickles it, which may run any code, so the entries are only loaded when the cache directory and
+the entry are owned by the current user and not writable by group or others, see is_trusted().
+"""
+
+import os
+import sys
+import gc
+import time
+import stat
+import pickle
+import hashlib
+import logging
+import tempfile
+
+if sys.version_info[0] == 2:
+    import copy_reg as copyreg
+else:
+    import copyreg
+
+from .yang_header import get_namespace_roots, get_load_closure, get_file_digest
+from .namespace_index import get_namespace_index
+
+CACHE_FILE_SUFFIX = ".pickle"
+# the layout of the pickled YangParser, the entries of another layout are not loaded.
+CACHE_FORMAT = 7
+# the entries kept in the cache directory, the least recently used ones are removed.
+MAX_CACHE_ENTRIES = 8
+# the statement trees are pickled recursively through the parent and substatement references.
+PICKLE_RECURSION_LIMIT = 20000
+
+
+def reduce_xsd_pattern(pattern):
+    """Pickle the pattern of a pyang type by its arguments, the compiled lxml XMLSchema can not be pickled."""
+    return type(pattern), (pattern.spec, pattern.pos, pattern.invert_match)
+
+
+def is_trusted(path):
+    """Check whether path is owned by the current user and not writable by group or others, which is always true
+    where there is no owner of files."""
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        path_stat = os.stat(path)
+    except OSError:
+        return False
+    return path_stat.st_uid == os.getuid() and not path_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class ContextCache(object):
+    """
+    The cache directory of validated yang files.
+        cache_dir: The directory of cache entries.
+        version: The version of ansible-gen.
+        hits: The number of contexts loaded from the cache.
+        misses: The number of contexts parsed because there was no usable entry.
+        load_time: The seconds spent loading the entries.
+    """
+
+    def __init__(self, cache_dir, version):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.load_time = 0.0
+
+    def get_key(self, yang_dir, features):
+        """Get the key of the context parsing features from yang_dir.
+        Args:
+            yang_dir: The directory of yang files.
+            features: The xmlns which need to be parsed, None means all modules.
+        Returns:
+            The hex key.
+        """
+        from pyang import __version__ as pyang_version
+        # the headers and the modules loaded for features the same as YangParser.get_yang_files(), only the yang
+        # files loaded are read.
+        headers, _ = get_namespace_index(self.cache_dir).scan(yang_dir, set())
+        load_set = get_load_closure(headers, get_namespace_roots(headers, features))
+        digest = hashlib.sha1(("ansible-gen %s format %d\npyang %s\n%s\n" % (
+            self.version, CACHE_FORMAT, pyang_version, os.path.abspath(yang_dir))).encode("utf-8"))
+        digest.update(("features %s\n" % ("*" if features is None else " ".join(sorted(features)))).encode("utf-8"))
+        for name in sorted(load_set):
+            header = headers.get(name)
+            # a missing module is keyed too, so the entry is not used once its yang file is added.
+            if header is None:
+                digest.update(("%s missing\n" % name).encode("utf-8"))
+            else:
+                digest.update(("%s %s %s\n" % (name, os.path.abspath(header.path),
+                                                get_file_digest(header.path))).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
+
+    def load(self, key):
+        """Load the YangParser of key.
+        Args:
+            key: The key returned by get_key().
+        Returns:
+            The YangParser, None if there is no entry, it is not trusted, or it can not be loaded, which is removed
+            then.
+        """
+        path = self.get_path(key)
+        if not os.path.isfile(path):
+            self.misses += 1
+            logging.info("yang context cache miss: %s", key)
+            return None
+        if not is_trusted(self.cache_dir) or not is_trusted(path):
+            self.misses += 1
+            logging.warning("yang context cache %s is not owned by the current user or is writable by others, it is "
+                            "not loaded and the yang files are parsed again.", path)
+            return None
+        start_time = time.time()
+        gc_enabled = gc.isenabled()
+        recursion_limit = sys.getrecursionlimit()
+        # the unpickled statements are not garbage, collecting while loading them only takes time.
+        gc.disable()
+        sys.setrecursionlimit(max(recursion_limit, PICKLE_RECURSION_LIMIT))
+        try:
+            with open(path, "rb") as handle:
+                yang_handler = pickle.load(handle)
+            os.utime(path, None)
+        except Exception as error:
+            logging.warning("yang context cache %s is corrupt, parse the yang files again: %s", path, error)
+            self.misses += 1
+            self.remove(path)
+            return None
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+            if gc_enabled:
+                gc.enable()
+        load_time = time.time() - start_time
+        self.hits += 1
+        self.load_time += load_time
+        logging.info("yang context cache hit: %s, loaded in %.2fs", key, load_time)
+        return yang_handler
+
+    def store(self, key, yang_handler):
+        """Save the validated YangParser, the file is replaced at once so a concurrent run never reads half of it.
+        Args:
+            key: The key returned by get_key().
+            yang_handler: The validated YangParser.
+        """
+        from pyang import types
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, PICKLE_RECURSION_LIMIT))
+        temp_path = None
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir, 0o700)
+            handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+            with os.fdopen(handle, "wb") as temp_file:
+                pickler = pickle.Pickler(temp_file, pickle.HIGHEST_PROTOCOL)
+                pickler.dispatch_table = copyreg.dispatch_table.copy()
+                if hasattr(types, "XSDPattern"):
+                    pickler.dispatch_table[types.XSDPattern] = reduce_xsd_pattern
+                pickler.dump(yang_handler)
+            getattr(os, "replace", os.rename)(temp_path, self.get_path(key))
+            temp_path = None
+            logging.info("yang context cache saved: %s", key)
+        except Exception as error:
+            logging.warning("save yang context cache failed: %s", error)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+            if temp_path is not None:
+                self.remove(temp_path)
+        self.prune()
+
+    def prune(self):
+        """Remove the least recently used entries more than MAX_CACHE_ENTRIES."""
+        try:
+            entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                       if name.endswith(CACHE_FILE_SUFFIX)]
+            entries.sort(key=os.path.getmtime, reverse=True)
+        except OSError:
+            return
+        for path in entries[MAX_CACHE_ENTRIES:]:
+            self.remove(path)
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get_message(self):
+        """Get the report of this run."""
+        return "Yang context cache: {0} hits, {1} misses, loaded in {2:.2f}s.".format(
+            self.hits, self.misses, self.load_time)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""info_cache.py docstrings.
+This module keeps the information of the xpath-nodes got by interfaces.get_xpaths_infos() from a yang_handler, so
+that the type, restrictions, patterns and default of a xpath-node are got once for all the xml files and the several
+passes over each of them.
+
+An entry is never handed out, interfaces.get_xpaths_infos() returns a copy of it which the caller may change.
+"""
+
+
+def copy_list(value):
+    """Copy a list and the lists in it."""
+    return [copy_list(item) if isinstance(item, list) else item for item in value]
+
+
+def copy_infos(infos):
+    """Copy an information dict and the lists in it, which are the only values that may be changed, the others are
+    strings, numbers, booleans, None or tuples of them. This is much faster than copy.deepcopy().
+    """
+    result = dict(infos)
+    for key, value in infos.items():
+        if isinstance(value, list):
+            result[key] = copy_list(value)
+    return result
+
+
+class XpathInfoCache(object):
+    """
+    The information of xpath-nodes of a yang_handler.
+        entries: A dict. {(namespace of the module resolved, xpath without prefix): information dict, None for the
+                 xpath-node not found}.
+        hits: The number of xpath-nodes got from the entries.
+        misses: The number of xpath-nodes looked up in the yang_handler.
+    """
+
+    def __init__(self):
+        self.entries = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, get_infos):
+        """Get the information of a xpath-node.
+        Args:
+            key: (namespace of the module resolved, xpath without prefix).
+            get_infos: The function getting the information when key is not cached, which returns None if the
+                       xpath-node is not found.
+        Returns:
+            A new dict, empty if the xpath-node is not found.
+        """
+        if key in self.entries:
+            self.hits += 1
+            infos = self.entries[key]
+        else:
+            self.misses += 1
+            infos = self.entries[key] = get_infos()
+        return copy_infos(infos) if infos is not None else {}
+
+    def get_message(self):
+        """Get the report of this run."""
+        return "Xpath info cache: {0} hits, {1} misses.".format(self.hits, self.misses)
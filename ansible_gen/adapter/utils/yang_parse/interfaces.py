@@ -4,141 +4,74 @@
 
 import copy
 import logging
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
-from . import pyang_util
 from . import constant
-from . import utils
+from .interval_set import get_type_domain
+from .schema_snapshot import SchemaSnapshot, SchemaNode
 from ..xml_parse.xml_parser_get_xmlns import get_node_xmlns
-from ..base_util import operation_warning_write
+from ..base_util import operation_warning_write, log_xpath_message
 from .constant import BASE_INTEGER_TYPES
 
-LIST_KEY_SET = set()
 
-def get_feature_info(xpath, parsed_data, xmlns_info):
-    """Get the module from yang_handler.
+def get_feature_namespace(xpath, parsed_data, xmlns_info):
+    """Get the namespace of the module that xpath-node belong to.
     Args:
         xpath: The xpath-node which need to find module.(without prefix).
-        parsed_data: The yang_handler.
+        parsed_data: The yang_handler, or a SchemaSnapshot.
         xmlns_info: The xmlns_info.Saving all nodes's xmlns information.
     Returns:
-        feature_info: The module that xpath-node belong to.
-        augment_flag: Whether the xpath-node is augment.
+        The xmlns of xml, None if its module is not loaded.
+        The augmented node is found in the module of xml's xmlns, when the module of its own xmlns is loaded too.
     """
-    augment_flag = False
     # get xpath-node's xmlns.
     current_node_xmlns = get_node_xmlns(xpath, xmlns_info)
 
     feature_xpath = "/" + xpath.split("/")[1]
-    xml_namespace = get_node_xmlns(feature_xpath, xmlns_info)
+    if feature_xpath == xpath:
+        xml_namespace = current_node_xmlns
+    else:
+        xml_namespace = get_node_xmlns(feature_xpath, xmlns_info)
 
     # whether augment: xpath-node's xmlns not equal xml's xmlns.
-    if current_node_xmlns != xml_namespace:
-        augment_flag = True
-    # use xpath-node's xmlns to get the feature_info.
-    feature_info = None
-    augment_break_out_flag = False
-    for _, module in parsed_data.ctx.modules.items():
-        if module.keyword == 'module':
-            if augment_flag:
-                if augment_break_out_flag:
-                    break
-                else:
-                    val_namespace2 = module.search_one("namespace")
-                    if val_namespace2 and val_namespace2.arg == current_node_xmlns:
-                        for _augment, module_by_augment in module.i_ctx.modules.items():
-                            val_namespace2 = module_by_augment.search_one("namespace")
-                            if val_namespace2 and val_namespace2.arg == xml_namespace:
-                                feature_info = module_by_augment
-                                augment_break_out_flag = True
-                                break
-            else:
-                val_namespace = module.search_one("namespace")
-                if val_namespace and val_namespace.arg == xml_namespace:
-                    feature_info = module
-                    break
-    return [feature_info, augment_flag]
-
-def recursive_root(node_name, root):
-    """Recursive to get xpath-node's root.(recursive function).
-    Args:
-        node_name: The node name that split by xpath.
-        root: The module's root.
-    Returns:
-        root: The xpath-node's root.
-    """
-    if not hasattr(root, 'i_children'):
+    if current_node_xmlns != xml_namespace and current_node_xmlns not in parsed_data.namespace_modules:
         return None
-    for node in root.i_children:
-        if node.keyword in  ['input','output','choice','case']:
-            sub_root = recursive_root(node_name,node)
-            if(sub_root is not None):
-                return sub_root
-        else:
-            if (node.arg == node_name):
-                return node
-    return None
+    if xml_namespace not in parsed_data.namespace_modules:
+        return None
+    return xml_namespace
 
-def get_xpaths_node(xpath, root):
-    """Get the xpath-node from feature_info.
-    Args:
-        xpath: The xpath-node which need to find root.(without prefix).
-        root: The module's root that xpath-node belong to.
-    Returns:
-        root: The xpath-node's root.
-    """
-    for node_name in xpath.split("/")[1:]:
-        if root is None:
-            break
-        else:
-            root = recursive_root(node_name, root)
 
-    if root is None:
-        return None
-    else:
-        return root
+def has_yang_modules(parsed_data):
+    """Whether any module is loaded in the yang_handler or SchemaSnapshot."""
+    if isinstance(parsed_data, SchemaSnapshot):
+        return bool(parsed_data.modules)
+    return bool(parsed_data.ctx.modules)
 
-def recursive_root_of_augment(node_name, root):
-    """Recursive to get xpath-node's root when augment.(recursive function).
-    Args:
-        node_name: The node name that split by xpath.
-        root: The module's root.
-    Returns:
-        root: The xpath-node's root.
-    """
-    if not hasattr(root, 'i_children'):
-        return None
-    current_node_stmts = [node for node in root.i_children]
-    for current_node in current_node_stmts:
-        if current_node.keyword in ('input','output','choice','case'):
-            root = recursive_root_of_augment(node_name,current_node)
-            if root is not None:
-                return root
-            else:
-                continue
-        if node_name == current_node.arg:
-            root = current_node
-            return root
-    return None
 
-def get_xpaths_node_of_augment(xpath, root):
-    """Get the xpath-node from feature_info when augment.
+def find_xpath_node(xpath, parsed_data, xmlns_info):
+    """Find the xpath-node in the yang_handler or SchemaSnapshot.
     Args:
-        xpath: The xpath-node which need to find root.(without prefix).
-        root: The module's root that xpath-node belong to.
+        xpath: The xpath-node which need to find.(without prefix).
+        parsed_data: The yang_handler, or a SchemaSnapshot.
+        xmlns_info: The xmlns_info.Saving all nodes's xmlns information.
     Returns:
-        root: The xpath-node's root.
+        namespace: The namespace of the module that xpath-node belong to, None if it is not loaded.
+        node: The pyang statement, or the SchemaNode of a SchemaSnapshot. None if it is not found.
     """
-    for node_name in xpath.split("/")[1:]:
-        if root is None:
-            break
-        else:
-            root = recursive_root_of_augment(node_name, root)
-
-    if root is None:
-        return None
-    else:
-        return root
+    namespace = get_feature_namespace(xpath, parsed_data, xmlns_info)
+    if namespace is None:
+        return None, None
+    return namespace, parsed_data.find_node(namespace, xpath)
+
+
+def get_list_keys(node):
+    """Get the key leafs of a list node, a pyang statement or a SchemaNode."""
+    if isinstance(node, SchemaNode):
+        return node.keys
+    key_stmt = node.search_one("key")
+    if not key_stmt:
+        return []
+    return [name.strip() for name in key_stmt.arg.split() if name.strip()]
 
 
 def get_required(node):
@@ -193,105 +126,172 @@ def get_default(node):
     else:
         return None
 
-def get_type(node):
-    """Get xpath-node's type.(recursive function).
+class TypeDescriptor(namedtuple("TypeDescriptor", ["name", "restrict", "patterns", "target"])):
+    """
+    The resolved type of the leafs of a pyang type_spec, shared by all the leafs using the same typedef or type.
+        name: The name of built-in type, the one of leafref target for leafref.
+        restrict: The merged ranges or lengths, or the enum names, see get_restrict().
+        patterns: The patterns of the nearest restriction having patterns.
+        target: The target node of leafref, None for the other types.
+    The lists of a descriptor are shared by its leafs, they are copied before changed, see XpathInfoCache.
+    """
+    __slots__ = ()
+
+
+def get_type_spec(node):
+    """Get the type_spec of a leaf or leaf-list node.
     Args:
         node: The xpath-node's root.
     Returns:
-        return xpath-node's type.
+        type_spec: The i_type_spec of type statement, None if the node has no type statement. pyang copies the
+                   type_spec of typedef for each type statement using it, the one of typedef is returned when the
+                   type statement has no restrictions, so that the leafs of a typedef share it.
+        has_type: Whether the node is a leaf or leaf-list with a type statement.
     """
-    if node.keyword not in ['leaf','leaf-list']:
-        return None
+    if node.keyword not in ('leaf', 'leaf-list'):
+        return None, False
     type_stmt = node.search_one("type")
     if not type_stmt:
-        logging.info("leaf %s has no type defination", node.arg)
-        return None
+        log_xpath_message(logging.DEBUG, "leaf %s has no type defination", node.arg)
+        return None, False
     type_spec = type_stmt.i_type_spec
-    if not type_spec:
-        return None
+    typedef = getattr(type_stmt, "i_typedef", None)
+    # the target node of leafref is found from each leaf.
+    if type_spec and typedef is not None and not type_stmt.substmts and type_spec.name != "leafref":
+        typedef_type = typedef.search_one("type")
+        if typedef_type is not None and getattr(typedef_type, "i_type_spec", None) is not None:
+            return typedef_type.i_type_spec, True
+    return type_spec, True
+
+
+def resolve_type_spec(type_spec, type_cache=None):
+    """Resolve the type of the leafs of type_spec, a leafref is resolved by its target node.
+    Args:
+        type_spec: The i_type_spec of a type statement, a leafref one should have its target node.
+        type_cache: A dict. {type_spec: TypeDescriptor} shared by the leafs of a yang_handler, the type_spec is
+                    resolved every time if it is None.
+    Returns:
+        A TypeDescriptor.
+    """
+    if type_cache is not None:
+        descriptor = type_cache.get(type_spec)
+        if descriptor is not None:
+            return descriptor
     if type_spec.name == "leafref":
-        if hasattr(type_spec, "i_target_node"):
-            target_node = type_spec.i_target_node
-            return get_type(target_node)
-        else:
-            return None
+        target_node = type_spec.i_target_node
+        descriptor = TypeDescriptor(get_type(target_node, type_cache), get_restrict(target_node, type_cache),
+                                    get_pattern(target_node, type_cache), target_node)
     else:
-        return type_stmt.i_type_spec.name
+        patterns = []
+        if hasattr(type_spec, "res"):
+            patterns.extend([pattern_stmt.spec for pattern_stmt in type_spec.res])
+        descriptor = TypeDescriptor(type_spec.name, get_type_spec_restrict(type_spec), patterns, None)
+    if type_cache is not None:
+        type_cache[type_spec] = descriptor
+    return descriptor
+
 
-def get_pattern(node):
-    """Get xpath-node's pattern.(recursive function).
+def get_type(node, type_cache=None):
+    """Get xpath-node's type.
     Args:
         node: The xpath-node's root.
+        type_cache: The dict of resolve_type_spec().
     Returns:
-        return xpath-node's pattern.
+        return xpath-node's type.
     """
-    if node.keyword not in ['leaf','leaf-list']:
+    type_spec, _ = get_type_spec(node)
+    if not type_spec:
         return None
-    type_stmt = node.search_one("type")
-    if not type_stmt:
-        logging.info("leaf %s has no type defination", node.arg)
+    if type_spec.name == "leafref" and not hasattr(type_spec, "i_target_node"):
+        return None
+    return resolve_type_spec(type_spec, type_cache).name
+
+def get_pattern(node, type_cache=None):
+    """Get xpath-node's pattern.
+    Args:
+        node: The xpath-node's root.
+        type_cache: The dict of resolve_type_spec().
+    Returns:
+        return xpath-node's pattern.
+    """
+    type_spec, has_type = get_type_spec(node)
+    if not has_type:
         return None
-    type_spec = type_stmt.i_type_spec
     if not type_spec:
         return []
     patterns = []
-    if hasattr(type_stmt.i_type_spec, "res"):
-        patterns.extend([pattern_stmt.spec for pattern_stmt in type_stmt.i_type_spec.res])
+    if hasattr(type_spec, "res"):
+        patterns.extend([pattern_stmt.spec for pattern_stmt in type_spec.res])
     elif type_spec.name == "leafref":
-        patterns.extend(get_pattern(type_spec.i_target_node))
+        patterns.extend(resolve_type_spec(type_spec, type_cache).patterns)
     return patterns
 
-def get_restrict(node):
-    """Get xpath-node's restrict.(recursive function).
+def get_restrict(node, type_cache=None):
+    """Get xpath-node's restrict.
     Args:
         node: The xpath-node's root.
+        type_cache: The dict of resolve_type_spec().
     Returns:
         return xpath-node's restrict.
     """
-    if node.keyword not in {'leaf','leaf-list'}:
-        return None
-    type_stmt = node.search_one("type")
-    if not type_stmt:
-        logging.info("leaf %s has no type defination", node.arg)
+    type_spec, has_type = get_type_spec(node)
+    if not has_type:
         return None
-    type_spec = type_stmt.i_type_spec
     if not type_spec:
         return []
-    if type_spec.name == "leafref":
-        if not hasattr(type_spec,'i_target_node'):
-            logging.error("leaf %s type is %s but no target node", node.arg,type_spec.name)
-            return None
-        target_node = type_spec.i_target_node
-        return get_restrict(target_node)
+    if type_spec.name == "leafref" and not hasattr(type_spec, 'i_target_node'):
+        logging.error("leaf %s type is %s but no target node", node.arg, type_spec.name)
+        return None
+    return resolve_type_spec(type_spec, type_cache).restrict
+
+def get_type_spec_restrict(type_spec):
+    """Get the restrict of the leafs of a type_spec which is not leafref.
+    Args:
+        type_spec: The i_type_spec of a type statement.
+    Returns:
+        The IntervalSet of lengths of string, the names of enumeration, the IntervalSet of ranges of integer types,
+        else []. A string without length statement has [] as well, its lengths are not checked.
+    """
     if type_spec.name == "string":
-        rests = []
-        if hasattr(type_spec, "lengths"):
-            rests.extend(type_stmt.i_type_spec.lengths)
-        base_def = type_spec.base
-        while base_def:
-            if hasattr(base_def, "lengths"):
-                rests.extend(base_def.lengths)
-            base_def = base_def.base
-        return utils.Util.restrict_set_intersec(rests)
+        if not has_restrict_statement(type_spec, "lengths"):
+            return []
+        return get_restrict_set(type_spec, "lengths")
     elif type_spec.name == "enumeration":
         return [enum_t[0] for enum_t in type_spec.enums]
     elif type_spec.name in constant.BASE_INTEGER_TYPES:
-        rests = []
-        if hasattr(type_spec, "min") and hasattr(type_spec, "max"):
-            rests.extend([(type_spec.min, type_spec.max)])
-        elif hasattr(type_spec, "ranges"):
-            rests.extend(type_spec.ranges)
-        base_def = type_spec.base
-        while base_def:
-            if hasattr(type_spec, "min") and hasattr(type_spec, "max"):
-                rests.extend([(type_spec.min, type_spec.max)])
-            elif hasattr(base_def, "ranges"):
-                rests.extend(base_def.ranges)
-            base_def = base_def.base
-        return utils.Util.restrict_set_intersec(rests)
+        return get_restrict_set(type_spec, "ranges")
     else:
         return []
 
+def has_restrict_statement(type_spec, attr):
+    """Check whether a type_spec or one of its bases has a length or range statement, see get_restrict_set()."""
+    while type_spec:
+        if getattr(type_spec, attr, None):
+            return True
+        type_spec = type_spec.base
+    return False
+
+def get_restrict_set(type_spec, attr):
+    """Intersect the length or range statements of a type_spec and its bases.
+    Args:
+        type_spec: The i_type_spec of a string or integer type statement.
+        attr: "lengths" or "ranges", the attribute pyang parses the statements into.
+    Returns:
+        An IntervalSet, all values of the built-in type if there is no statement.
+        The statements are applied from the built-in type down, "min" and "max" of one are the lowest and highest
+        value its base allows.
+    """
+    type_specs = []
+    while type_spec:
+        type_specs.append(type_spec)
+        type_spec = type_spec.base
+    restrict = get_type_domain(type_specs[-1].name)
+    for spec in reversed(type_specs):
+        parts = getattr(spec, attr, None)
+        if parts:
+            restrict = restrict.restrict(parts)
+    return restrict
+
 def get_desc(node):
     """Get xpath-node's description.
     Args:
@@ -388,41 +388,48 @@ def get_xpaths_infos(xpath, parsed_data, xmlns_info):
     """
 
     # get_xpaths_infos() begin.
-    if not parsed_data.ctx.modules:
+    if not has_yang_modules(parsed_data):
         return {}
-    # get module's root and augment_flag.
-    feature_info_list = get_feature_info(xpath, parsed_data, xmlns_info)
-    feature_info = feature_info_list[0]
-    augment_flag = feature_info_list[1]
+    namespace = get_feature_namespace(xpath, parsed_data, xmlns_info)
 
     feature = xpath.split("/")[1]
-    if not feature_info:
+    if namespace is None:
         logging.error("module %s is not provided in yang directory", feature)
         return {}
 
-    if augment_flag:
-        # get xpath-node's root when augment.
-        leaf = get_xpaths_node_of_augment(xpath, feature_info)
-    else:
-        # get xpath-node's root.
-        leaf = get_xpaths_node(xpath, feature_info)
-
-    if leaf:
-        return {
-            'required': get_required(leaf),
-            'type': get_type(leaf),
-            'restrict': get_restrict(leaf),
-            "pattern": get_pattern(leaf),
-            'default': get_default(leaf),
-            'desc': get_desc(leaf),
-            'key': check_is_key(leaf),
-            'whether_config': check_config(leaf),
-            'when_must_check':when_must_check(leaf),
-            'mandatory_check':mandatory_check(leaf),
-            'suport_filter_check':suport_filter_check(leaf)
-        }
-    else:
-        return {}
+    def get_infos():
+        leaf = parsed_data.find_node(namespace, xpath)
+        if leaf is None:
+            return None
+        if isinstance(leaf, SchemaNode):
+            return leaf.info
+        return get_node_infos(leaf, parsed_data.type_cache)
+
+    return parsed_data.info_cache.get((namespace, xpath), get_infos)
+
+
+def get_node_infos(leaf, type_cache=None):
+    """Get the information of a xpath-node, see get_xpaths_infos().
+    Args:
+        leaf: The xpath-node's root.
+        type_cache: The dict of resolve_type_spec(), shared by the leafs of a yang_handler.
+    Returns:
+        A dict.Saving xpath-node's information.
+    """
+    return {
+        'required': get_required(leaf),
+        'type': get_type(leaf, type_cache),
+        'restrict': get_restrict(leaf, type_cache),
+        "pattern": get_pattern(leaf, type_cache),
+        'default': get_default(leaf),
+        'desc': get_desc(leaf),
+        'key': check_is_key(leaf),
+        'whether_config': check_config(leaf),
+        'when_must_check':when_must_check(leaf),
+        'mandatory_check':mandatory_check(leaf),
+        'suport_filter_check':suport_filter_check(leaf)
+    }
+
 
 def get_module_description(parser, xml_namespace):
     """Get module's description from yang_handler.
@@ -438,21 +445,25 @@ def get_module_description(parser, xml_namespace):
     if len(xml_namespace) == 0:
         return result
     # use the xml_namespace to find module.
-    for key, val in parser.ctx.modules.items():
-        if not val.keyword == 'module':
-            continue
-        module_ns = pyang_util.get_module_namespace(val)
-        if module_ns in xml_namespace:
-            feature_info_list.append(val)
+    if isinstance(parser, SchemaSnapshot):
+        feature_info_list = parser.get_module_descriptions(xml_namespace)
+    else:
+        from .pyang_util import get_module_namespace
+        for key, val in parser.ctx.modules.items():
+            if not val.keyword == 'module':
+                continue
+            module_ns = get_module_namespace(val)
+            if module_ns in xml_namespace:
+                desc_stmt = val.search_one("description")
+                feature_info_list.append((val.arg, desc_stmt.arg if desc_stmt else None))
     if not feature_info_list:
         logging.error("module %s is not provided in yang directory", xml_namespace)
         return result
 
-    feature_info_list.sort(key=lambda x: x.arg)
-    for feature_info in feature_info_list:
-        desc_stmt = feature_info.search_one("description")
-        if desc_stmt and desc_stmt.arg:
-            result = result + desc_stmt.arg + "\n"
+    feature_info_list.sort(key=lambda x: x[0])
+    for _, description in feature_info_list:
+        if description:
+            result = result + description + "\n"
     return result
 
 
@@ -490,53 +501,41 @@ def check_all_node_exists(xml_dict, yang_parser, xmlns_info):
     for xpath in xpaths:
         xpath_info = get_xpaths_infos(xpath,yang_parser,xmlns_info)
         if not xpath_info:
-            logging.warning("xpath %s not exist in yang files", xpath)
+            log_xpath_message(logging.WARNING, "xpath %s not exist in yang files", xpath)
             return False
     return True
 
-def is_key_leaf(xpath, yang_parser, xmlns_info):
+def is_key_leaf(xpath, yang_parser, xmlns_info, list_key_set):
     """Whether the leaf-node is primary-key
     Args:
         xpath: The leaf-node's xpath.(without prefix).
         yang_parser: The yang_handler.
         xmlns_info:  The xmlns_info.Saving all nodes's xmlns information.
+        list_key_set: A set. The key xpaths of the lists visited before xpath, the keys of xpath are added if it
+                      is a list.
     Returns:
         A bool.
     """
-    global LIST_KEY_SET
-    if xpath in LIST_KEY_SET:
+    if xpath in list_key_set:
         return True
 
     feature = xpath.split("/")[1]
-    if not yang_parser.ctx.modules:
+    if not has_yang_modules(yang_parser):
         return False
 
-    # get module's root and augment_flag.
-    feature_info_list = get_feature_info(xpath, yang_parser, xmlns_info)
-    feature_info = feature_info_list[0]
-    augment_flag = feature_info_list[1]
+    namespace, leaf = find_xpath_node(xpath, yang_parser, xmlns_info)
 
-    if not feature_info:
+    if namespace is None:
         logging.error("module %s is not provided in yang directory", feature)
         return False
 
-    if augment_flag:
-        # get xpath's root when augment.
-        leaf = get_xpaths_node_of_augment(xpath, feature_info)
-    else:
-        # get xpath's root.
-        leaf = get_xpaths_node(xpath, feature_info)
-
     if not leaf:
-        logging.warning("xpath %s has no correspond leaf find in yang files", xpath)
+        log_xpath_message(logging.WARNING, "xpath %s has no correspond leaf find in yang files", xpath)
         return False
 
     if leaf.keyword == "list":
-        key_stmt = leaf.search_one("key")
-        if key_stmt:
-            for name in key_stmt.arg.split():
-                if name.strip():
-                    LIST_KEY_SET.add(str(xpath) + "/" + str(name))
+        for name in get_list_keys(leaf):
+            list_key_set.add(str(xpath) + "/" + str(name))
 
     return False
 
@@ -550,27 +549,17 @@ def is_list_node(xpath, yang_parser, xmlns_info):
         A bool.
     """
     feature = xpath.split("/")[1]
-    if not yang_parser.ctx.modules:
+    if not has_yang_modules(yang_parser):
         return False
 
-    # get module's root and augment_flag.
-    feature_info_list = get_feature_info(xpath, yang_parser, xmlns_info)
-    feature_info = feature_info_list[0]
-    augment_flag = feature_info_list[1]
+    namespace, leaf = find_xpath_node(xpath, yang_parser, xmlns_info)
 
-    if not feature_info:
+    if namespace is None:
         logging.error("module %s is not provided in yang directory", feature)
         return False
 
-    if augment_flag:
-        # get xpath's root when augment.
-        leaf = get_xpaths_node_of_augment(xpath, feature_info)
-    else:
-        # get xpath's root.
-        leaf = get_xpaths_node(xpath, feature_info)
-
     if not leaf:
-        logging.warning("xpath %s has no correspond leaf find in yang files", xpath)
+        log_xpath_message(logging.WARNING, "xpath %s has no correspond leaf find in yang files", xpath)
         return False
 
     if leaf.keyword == "list":
@@ -605,7 +594,7 @@ def get_key_leafs(xml_dict, yang_parser, xmlns_info):
         for key, val in leaf_dict.items():
             container_leaf_xpath = leaf_path + "/" + key
             tmp_xpath = xpath + "/" + key
-            if is_key_leaf(tmp_xpath, yang_parser, xmlns_info):
+            if is_key_leaf(tmp_xpath, yang_parser, xmlns_info, list_key_set):
                 #logging.info("xpath %s is key leaf", tmp_xpath)
                 keys.append(leaf_path + "/" + key)
             if isinstance(val, OrderedDict):
@@ -617,8 +606,7 @@ def get_key_leafs(xml_dict, yang_parser, xmlns_info):
     tmp_dict = copy.deepcopy(list(xml_dict.values())[0])
     xpath = ""
     leaf_path = ""
-    global LIST_KEY_SET
-    LIST_KEY_SET = set()
+    list_key_set = set()
     key_leafs = get_keys(tmp_dict, xpath, yang_parser, leaf_path, xmlns_info)
 
     return key_leafs
@@ -749,8 +737,8 @@ def get_leafinfos_from_xml_dict(node_d, parser, xmlns_info):
                         form_leaf[key].update(_d1)
                         leaf_infos.update(form_leaf)
                     else:
-                        logging.info(
-                            "xpath %s not find in yang files", tmp_xpath)
+                        log_xpath_message(
+                            logging.DEBUG, "xpath %s not find in yang files", tmp_xpath)
         return leaf_infos
 
     xml_type = list(node_d.keys())[0]
@@ -765,10 +753,10 @@ def trans_to_smiple_type(yang_info):
     if 'type' not in yang_info:
         return {}
     if yang_info['type'] in constant.BASE_INTEGER_TYPES:
-        _d1 = {'range': yang_info["restrict"]}
+        _d1 = {'range': yang_info["restrict"].bounds if yang_info["restrict"] else []}
         yang_info['type'] = 'int'
     elif yang_info['type'] == "string":
-        _d1 = {'length': yang_info["restrict"]}
+        _d1 = {'length': yang_info["restrict"].bounds if yang_info["restrict"] else []}
     elif yang_info['type'] == "enumeration":
         _d1 = {'choices': yang_info['restrict']}
     elif yang_info['type'] == "identityref":
@@ -832,8 +820,8 @@ def get_leaf_info_for_doc(full_xml_file_path, leaf_dict, parser, xmlns_info):
                             leaf_info.get('pattern'),leaf_info.get('when_must_check'),
                             _c.get('type'))
                     else:
-                        logging.warning(
-                            "xpath %s not find in  yang files", tmp_xpath)
+                        log_xpath_message(
+                            logging.WARNING, "xpath %s not find in  yang files", tmp_xpath)
                         doc_infos[key] = tuple()
                     doc_infos[key] = list(doc_infos[key])
                     empty_orderdict = OrderedDict()
@@ -869,8 +857,8 @@ def get_leaf_info_for_doc(full_xml_file_path, leaf_dict, parser, xmlns_info):
                             leaf_info.get('mandatory_check'),leaf_info.get('when_must_check'),leaf_info.get('suport_filter_check'),
                             _c.get('type'))
                     else:
-                        logging.warning(
-                            "xpath %s not find in  yang files", tmp_xpath)
+                        log_xpath_message(
+                            logging.WARNING, "xpath %s not find in  yang files", tmp_xpath)
                         doc_infos[key] = tuple()
         return doc_infos
 
@@ -988,8 +976,8 @@ def make_argument_spec(xml_dict, yang_parser, xmlns_info, key_list, list_list):
                     single_arg = make_simple_type_argument(
                         leaf_infos[node_name])
                     if not single_arg:
-                        logging.warning(
-                            "node %s has no defination in yang files", node_name)
+                        log_xpath_message(
+                            logging.WARNING, "node %s has no defination in yang files", node_name)
                         continue
                     else:
                         argument_spec[node_name] = single_arg
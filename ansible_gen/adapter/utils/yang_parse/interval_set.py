@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""interval_set.py docstrings.
+This module keeps the ranges of the integer types and the lengths of the strings as IntervalSets. The restrictions of
+a type and its bases are intersected into one IntervalSet, which is written into the generated module as its bounds,
+e.g. "1..10 | 20..max" of an uint8 is written as (1, 10, 20, 255) and checked by a bisect of them.
+"""
+
+from bisect import bisect_right
+from collections import namedtuple
+
+from .constant import MIN_MAX_MAP
+
+
+class IntervalSet(namedtuple("IntervalSet", ["bounds"])):
+    """
+    An immutable set of integers made of closed intervals.
+        bounds: A tuple. (low1, high1, low2, high2, ...) of the intervals sorted by low, neither overlapping nor
+                adjacent, empty for the empty set. The bounds are python integers, exact to the limits of uint64.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """Get the union of intervals.
+        Args:
+            intervals: A list of (low, high), the ones of low greater than high are empty.
+        Returns:
+            An IntervalSet.
+        """
+        bounds = []
+        for low, high in sorted(interval for interval in intervals if interval[0] <= interval[1]):
+            if bounds and low <= bounds[-1] + 1:
+                bounds[-1] = max(bounds[-1], high)
+            else:
+                bounds.extend((low, high))
+        return cls(tuple(bounds))
+
+    def get_intervals(self):
+        """Get the list of (low, high) of this set."""
+        return list(zip(self.bounds[::2], self.bounds[1::2]))
+
+    def contains(self, value):
+        """Check whether value is in this set."""
+        return contains_value(self.bounds, value)
+
+    def intersection(self, other):
+        """Get the intersection of this set and other, walking the intervals of both once."""
+        bounds = []
+        left, right = self.bounds, other.bounds
+        left_idx = right_idx = 0
+        while left_idx < len(left) and right_idx < len(right):
+            low = max(left[left_idx], right[right_idx])
+            high = min(left[left_idx + 1], right[right_idx + 1])
+            if low <= high:
+                bounds.extend((low, high))
+            if left[left_idx + 1] < right[right_idx + 1]:
+                left_idx += 2
+            else:
+                right_idx += 2
+        return IntervalSet(tuple(bounds))
+
+    def union(self, other):
+        """Get the union of this set and other."""
+        return IntervalSet.from_intervals(self.get_intervals() + other.get_intervals())
+
+    def restrict(self, parts):
+        """Get the subset of a range or length statement restricting this set.
+        Args:
+            parts: A list of (low, high) parsed by pyang, "min" and "max" are the lowest and highest value of this
+                   set, high is None for a single value.
+        Returns:
+            An IntervalSet.
+        """
+        if not self.bounds:
+            return self
+
+        def resolve(value):
+            if value == "min":
+                return self.bounds[0]
+            if value == "max":
+                return self.bounds[-1]
+            return int(value)
+
+        intervals = []
+        for low, high in parts:
+            low = resolve(low)
+            intervals.append((low, low if high is None else resolve(high)))
+        return self.intersection(IntervalSet.from_intervals(intervals))
+
+    def __str__(self):
+        return str(self.get_intervals())
+
+
+def contains_value(bounds, value):
+    """Check whether value is in the intervals of bounds, see IntervalSet.bounds."""
+    idx = bisect_right(bounds, value)
+    # odd: low <= value < high of an interval, even: value is after an interval, on its high or in the gap.
+    return idx % 2 == 1 or (idx > 0 and bounds[idx - 1] == value)
+
+
+def get_type_domain(type_name):
+    """Get the IntervalSet of all values of an integer type, or all lengths of "string"."""
+    low, high = MIN_MAX_MAP[type_name]
+    return IntervalSet((int(low), int(high)))
+
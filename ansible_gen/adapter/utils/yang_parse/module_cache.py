@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""module_cache.py docstrings.
+This module keeps the parsed and validated yang modules of a run, so that the next context parsing a yang file of
+the same content, e.g. the next project of a batch run, reuses the module instead of parsing it again.
+
+A validated module refers to the modules it imports and is changed by the modules augmenting or deviating it, so
+it is only reused when all of them have the same content too, see ModuleCache.get_keys().
+"""
+
+import hashlib
+import logging
+
+from .yang_header import get_load_closure, get_file_digest
+
+
+class ModuleCache(object):
+    """
+    The validated yang modules of previous contexts.
+        modules: A dict. {key: module statement}.
+        reused: The number of modules reused by the last restore().
+    """
+
+    def __init__(self):
+        self.modules = dict()
+        self.reused = 0
+
+    def get_keys(self, headers, names):
+        """Get the key of each module a context parsing names loads.
+        The key of a module covers the content of the modules in its load closure, the modules it imports or
+        includes directly or indirectly and the modules augmenting or deviating them, see
+        yang_header.get_load_closure().
+        Args:
+            headers: A dict. {module name: YangHeader}, the headers YangParser.get_yang_files() loads the modules of.
+            names: The names of modules the context parses, the imported modules are loaded by pyang.
+        Returns:
+            A dict. {module name: key}, the modules whose closure has a module without yang file are left out.
+        """
+        digests = dict()
+        keys = dict()
+        for name in get_load_closure(headers, names):
+            # the modules of the same closure, e.g. a module and the one augmenting it, have keys of their own.
+            digest = hashlib.sha1(("%s\n" % name).encode("utf-8"))
+            for dependency in sorted(get_load_closure(headers, [name])):
+                header = headers.get(dependency)
+                if header is None:
+                    break
+                if header.path not in digests:
+                    digests[header.path] = get_file_digest(header.path)
+                if digests[header.path] is None:
+                    break
+                digest.update(("%s %s\n" % (dependency, digests[header.path])).encode("utf-8"))
+            else:
+                keys[name] = digest.hexdigest()
+        return keys
+
+    def restore(self, ctx, keys):
+        """Add the cached modules of keys into a new pyang context, they are not parsed or validated again.
+        Args:
+            ctx: The pyang Context.
+            keys: The dict returned by get_keys().
+        Returns:
+            A set. The names of restored modules.
+        """
+        from pyang import util
+        restored = set()
+        for name, key in keys.items():
+            module = self.modules.get(key)
+            if module is None:
+                continue
+            # the lookups of pyang from the module go to the context it belongs to.
+            module.i_ctx = ctx
+            ctx.add_parsed_module(module)
+            ctx.revs[name] = [(util.get_latest_revision(module), ("parsed", module, module.pos.ref, None))]
+            restored.add(name)
+        self.reused = len(restored)
+        logging.info("%d yang modules are reused from previous contexts", len(restored))
+        return restored
+
+    def store(self, ctx, keys):
+        """Keep the validated modules of ctx for the next contexts.
+        Args:
+            ctx: The validated pyang Context.
+            keys: The dict returned by get_keys() for ctx.
+        """
+        for module in ctx.modules.values():
+            if module is None or module.arg not in keys:
+                continue
+            if getattr(module, "i_is_validated", False) is True:
+                self.modules.setdefault(keys[module.arg], module)
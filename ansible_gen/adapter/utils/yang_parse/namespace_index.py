@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""namespace_index.py docstrings.
+This module reads the namespace, imports, includes and augment targets of yang files from their module header and
+linkage statements, and keeps them by (path, mtime, size) so that a yang file is read again only when it changed.
+
+The index lives as long as the process, e.g. for every context of watch, serve or batch, and is saved into the cache
+directory of --cache-dir to be used by the later runs.
+"""
+
+import io
+import os
+import re
+import json
+import logging
+import tempfile
+from collections import OrderedDict
+
+from .yang_header import YANG_FILE_PATTERN, COMMENT_PATTERN, AUGMENT_PATTERN, YangHeader, get_augment_targets, \
+    add_header
+
+INDEX_FILE = "namespace-index.json"
+INDEX_VERSION = 2
+READ_SIZE = 16 * 1024
+# whitespace, comments, quoted strings, the separators and unquoted strings, which can not contain the comment
+# sequences. A token reaching the end of the text read so far may be incomplete.
+TOKEN_PATTERN = re.compile(r'\s+|//[^\n]*|/\*.*?(?:\*/|\Z)|"(?:[^"\\]|\\.)*(?:"|\Z)|\'[^\']*(?:\'|\Z)|[{};]|'
+                           r'(?:[^\s{};"\'/]|/(?![/*]))+', re.S)
+# the statements before the body of a module: header, linkage, meta and revision statements.
+PREAMBLE_KEYWORDS = ("yang-version", "namespace", "prefix", "belongs-to", "import", "include", "organization",
+                     "contact", "description", "reference", "revision")
+
+# {cache directory: NamespaceIndex} of this process, None for the index not saved.
+INDEXES = dict()
+
+
+class HeaderTokenizer(object):
+    """
+    The tokens of a yang file read in blocks, so that reading stops with the module header.
+        handle: The file opened in text mode.
+        text: The text read so far.
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.text = ""
+        self.position = 0
+        self.eof = False
+
+    def next_token(self):
+        """Get the next token, the whitespace and comments are skipped.
+        Returns:
+            The token, None at the end of file.
+        """
+        while True:
+            match_obj = TOKEN_PATTERN.match(self.text, self.position)
+            if match_obj is None or (match_obj.end() == len(self.text) and not self.eof):
+                if self.eof:
+                    return None
+                block = self.handle.read(READ_SIZE)
+                self.eof = not block
+                self.text += block
+                continue
+            self.position = match_obj.end()
+            token = match_obj.group(0)
+            if token[0].isspace() or token.startswith("//") or token.startswith("/*"):
+                continue
+            return token
+
+    def read_argument(self):
+        """Read the argument of a statement, the quoted strings joined by "+" are concatenated.
+        Returns:
+            argument: The argument, None if the statement has not one.
+            end: ";" or "{" which ends the statement, None at the end of file.
+        """
+        parts = []
+        while True:
+            token = self.next_token()
+            if token is None or token in (";", "{", "}"):
+                return ("".join(parts) if parts else None), token
+            if token == "+" and parts:
+                continue
+            if token[0] in "\"'":
+                parts.append(token[1:-1] if len(token) > 1 and token[-1] == token[0] else token[1:])
+            else:
+                parts.append(token)
+
+    def skip_block(self):
+        """Skip the substatements of a statement ending with "{"."""
+        depth = 1
+        while depth:
+            token = self.next_token()
+            if token is None:
+                return
+            if token == "{":
+                depth += 1
+            elif token == "}":
+                depth -= 1
+
+    def read_rest(self):
+        """Read the rest of file, the whole text is in self.text then."""
+        if not self.eof:
+            self.text += self.handle.read()
+            self.eof = True
+        return self.text
+
+
+def read_block_prefix(tokenizer):
+    """Read the substatements of import or belongs-to.
+    Args:
+        tokenizer: The HeaderTokenizer positioned after the "{" of the statement.
+    Returns:
+        The argument of prefix substatement, None if there is not one.
+    """
+    prefix = None
+    while True:
+        statement = tokenizer.next_token()
+        if statement is None or statement == "}":
+            return prefix
+        argument, end = tokenizer.read_argument()
+        if statement == "prefix":
+            prefix = argument
+        if end == "{":
+            tokenizer.skip_block()
+        elif end != ";":
+            return prefix
+
+
+def read_module_header(tokenizer):
+    """Read the module header and the linkage statements of a yang file, reading stops at the first body statement.
+    Args:
+        tokenizer: The HeaderTokenizer of the yang file.
+    Returns:
+        A dict with keyword("module" or "submodule", None if the file is neither), name, namespace(None if it is not
+        found or for submodule), prefix, belongs_to, imports({prefix: module name}) and includes(a list).
+    """
+    header = dict(keyword=None, name=None, namespace=None, prefix=None, belongs_to=None, imports=OrderedDict(),
+                  includes=[])
+    keyword = tokenizer.next_token()
+    if keyword not in ("module", "submodule"):
+        return header
+    name, end = tokenizer.read_argument()
+    if end != "{":
+        return header
+    header.update(keyword=keyword, name=name)
+    while True:
+        statement = tokenizer.next_token()
+        # the extension statements, e.g. "ext:label", may be put anywhere.
+        if statement is None or (statement not in PREAMBLE_KEYWORDS and ":" not in statement):
+            return header
+        argument, end = tokenizer.read_argument()
+        if statement == "namespace" and keyword == "module":
+            header["namespace"] = argument
+        elif statement == "prefix":
+            header["prefix"] = argument
+        elif statement == "belongs-to":
+            header["belongs_to"] = argument
+        elif statement == "include":
+            header["includes"].append(argument)
+        if statement in ("import", "belongs-to"):
+            prefix = read_block_prefix(tokenizer) if end == "{" else None
+            if statement == "import":
+                header["imports"][prefix] = argument
+            else:
+                header["prefix"] = prefix
+        elif end == "{":
+            tokenizer.skip_block()
+        elif end != ";":
+            return header
+
+
+def read_yang_entry(handle, mtime, size):
+    """Read the index entry of a yang file.
+    Args:
+        handle: The yang file opened in text mode.
+        mtime: The modification time of yang file.
+        size: The size of yang file.
+    Returns:
+        entry: A list. [mtime, size, keyword, name, namespace, imports, includes, augments, belongs_to].
+        text: The whole text of yang file.
+    """
+    tokenizer = HeaderTokenizer(handle)
+    header = read_module_header(tokenizer)
+    text = tokenizer.read_rest()
+    augments = []
+    # most yang files augment nothing, the remarks are only removed for the ones which may.
+    if header["keyword"] is not None and AUGMENT_PATTERN.search(text):
+        augments = list(get_augment_targets(COMMENT_PATTERN.sub("", text), header["imports"], header["prefix"]))
+    entry = [mtime, size, header["keyword"], header["name"], header["namespace"], list(header["imports"].values()),
+             header["includes"], augments, header["belongs_to"]]
+    return entry, text
+
+
+class NamespaceIndex(object):
+    """
+    The headers of yang files.
+        index_file: The path the index is saved into, None if it is not saved.
+        entries: A dict. {absolute path: the list returned by read_yang_entry()}.
+        changed: Whether entries changed since it was loaded.
+    """
+
+    def __init__(self, index_file=None):
+        self.index_file = index_file
+        self.entries = dict()
+        self.changed = False
+        if index_file is not None:
+            self.load()
+
+    def load(self):
+        try:
+            with io.open(self.index_file, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("entries", dict())
+        except (IOError, OSError, ValueError, AttributeError) as error:
+            if os.path.exists(self.index_file):
+                logging.warning("namespace index %s can not be loaded, the yang files are read again: %s",
+                                self.index_file, error)
+
+    def save(self):
+        """Save the index if it changed, the file is replaced at once."""
+        if self.index_file is None or not self.changed:
+            return
+        index_dir = os.path.dirname(self.index_file)
+        try:
+            if not os.path.isdir(index_dir):
+                # the cache directory is shared with the pickled contexts, which are only loaded from a private one.
+                os.makedirs(index_dir, 0o700)
+            handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=index_dir)
+            with os.fdopen(handle, "w") as temp_file:
+                json.dump({"version": INDEX_VERSION, "entries": self.entries}, temp_file)
+            getattr(os, "replace", os.rename)(temp_path, self.index_file)
+            self.changed = False
+        except (IOError, OSError) as error:
+            logging.warning("save namespace index %s failed: %s", self.index_file, error)
+
+    def scan(self, yang_dir, features=None):
+        """Get the headers of the yang files under yang_dir and its subdirectories, only the new or changed files are
+        read.
+        Args:
+            yang_dir: The directory of yang files.
+            features: The namespaces whose texts are kept, None means all modules.
+        Returns:
+            headers: A dict. {module name: YangHeader}, the latest revision is kept if a module has several files,
+                     see yang_header.add_header().
+            texts: A dict. {path of yang file: text} of the files of features read completely by this scan, so the
+                   parse needs not read them again.
+        """
+        headers = dict()
+        texts = dict()
+        scanned = set()
+        for dir_path, dir_names, file_names in os.walk(yang_dir):
+            dir_names.sort()
+            for yang_file in sorted(file_names):
+                if not YANG_FILE_PATTERN.match(yang_file):
+                    continue
+                yang_file_path = os.path.join(dir_path, yang_file)
+                path = os.path.abspath(yang_file_path)
+                scanned.add(path)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if not os.path.isfile(path):
+                    continue
+                mtime = getattr(stat, "st_mtime_ns", stat.st_mtime)
+                entry = self.entries.get(path)
+                if entry is None or entry[0] != mtime or entry[1] != stat.st_size:
+                    try:
+                        with io.open(path, "r", encoding="utf-8") as handle:
+                            entry, text = read_yang_entry(handle, mtime, stat.st_size)
+                    except (IOError, OSError, UnicodeDecodeError) as error:
+                        logging.error("parse yang file %s failed: %s", yang_file_path, error)
+                        continue
+                    if entry[4] is not None and (features is None or entry[4] in features):
+                        texts[yang_file_path] = text
+                    self.entries[path] = entry
+                    self.changed = True
+                _, size, keyword, name, namespace, imports, includes, augments, belongs_to = entry
+                if keyword is not None:
+                    add_header(headers, YangHeader(name, yang_file_path, keyword, namespace, tuple(imports),
+                                                   tuple(includes), size, tuple(augments), belongs_to))
+        # the removed yang files.
+        abs_yang_dir = os.path.join(os.path.abspath(yang_dir), "")
+        for path in [path for path in self.entries if path.startswith(abs_yang_dir) and path not in scanned]:
+            del self.entries[path]
+            self.changed = True
+        self.save()
+        return headers, texts
+
+
+def get_namespace_index(cache_dir=None):
+    """Get the namespace index of this process.
+    Args:
+        cache_dir: The cache directory the index is saved into, None if it is not saved.
+    Returns:
+        A NamespaceIndex.
+    """
+    if cache_dir not in INDEXES:
+        INDEXES[cache_dir] = NamespaceIndex(os.path.join(cache_dir, INDEX_FILE) if cache_dir else None)
+    return INDEXES[cache_dir]
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""node_index.py docstrings.
+This module indexes the schema nodes of a validated module by their xpath without prefix, so that a xpath-node is
+found by one lookup instead of searching the children of each level of the xpath.
+
+The input, output, choice and case nodes are not in the xpath, their children are searched as the children of their
+parent. A name is given to the first node found with it in the document order.
+"""
+
+from collections import OrderedDict
+
+# the nodes searched through for their children.
+TRANSPARENT_KEYWORDS = ('input', 'output', 'choice', 'case')
+
+
+def get_children(root):
+    """Get the children of a node by name, searched through the input, output, choice and case nodes.
+    Args:
+        root: A pyang statement.
+    Returns:
+        An OrderedDict. {name: statement}, the first one found in the document order for a name.
+    """
+    children = OrderedDict()
+    for node in getattr(root, 'i_children', []):
+        if node.keyword in TRANSPARENT_KEYWORDS:
+            for name, child in get_children(node).items():
+                children.setdefault(name, child)
+        else:
+            children.setdefault(node.arg, node)
+    return children
+
+
+def iter_schema_nodes(root, xpath=""):
+    """Iterate the schema nodes under root in the document order.
+    Args:
+        root: A pyang statement, e.g. the module statement.
+        xpath: The xpath of root.
+    Returns:
+        An iterator of (xpath, statement).
+    """
+    for name, node in get_children(root).items():
+        yield xpath + "/" + name, node
+        for item in iter_schema_nodes(node, xpath + "/" + name):
+            yield item
+
+
+def build_node_index(module):
+    """Index the schema nodes of a validated module, including the nodes other modules augment into it.
+    Args:
+        module: The module statement.
+    Returns:
+        A dict. {xpath without prefix: statement}, e.g. {"/ifm/interfaces": the container statement}.
+    """
+    return dict(iter_schema_nodes(module))
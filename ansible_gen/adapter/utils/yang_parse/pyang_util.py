@@ -3,9 +3,12 @@ import os
 import traceback
 import re
 import sys
+import time
 from pyang.context import Context
 from pyang.repository import FileRepository
+from pyang import yang_parser, util, syntax, error
 import pyang
+from .context_cache import PICKLE_RECURSION_LIMIT
 if sys.version_info[0] == 2:
     import io
 def init_ctx(path='./yang'):
@@ -14,15 +17,18 @@ def init_ctx(path='./yang'):
     return ctx
 
 
-def parse_yang_module(yang_file_path, ctx):
+def parse_yang_module(yang_file_path, ctx, text=None):
     r = re.compile(r"^(.*?)(\@(\d{4}-\d{2}-\d{2}))?\.(yang|yin)$")
     r1 = re.compile(r"^(.*?)\.(yang|yin)$")
+    fd = None
     try:
-        if sys.version_info[0] == 2:
-            fd = io.open(yang_file_path, "r", encoding="UTF-8")
-        else:
-            fd = open(yang_file_path, "r", encoding="UTF-8")
-        text = fd.read()
+        # the text is passed when the caller has read the file already.
+        if text is None:
+            if sys.version_info[0] == 2:
+                fd = io.open(yang_file_path, "r", encoding="UTF-8")
+            else:
+                fd = open(yang_file_path, "r", encoding="UTF-8")
+            text = fd.read()
         m1 = r1.search(yang_file_path)
         if m1 is None:
             return ctx
@@ -43,6 +49,76 @@ def parse_yang_module(yang_file_path, ctx):
     return ctx
 
 
+# the Context a pool worker parses yang files with, see init_parse_worker().
+WORKER_CTX = None
+
+
+def init_parse_worker(ctx):
+    """Initialize a pool worker forked for parse_yang_task(), the ctx is inherited without pickling."""
+    global WORKER_CTX
+    WORKER_CTX = ctx
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), PICKLE_RECURSION_LIMIT))
+
+
+def parse_yang_task(task):
+    """Parse a yang file into a statement tree in a pool worker, it is added to the context by add_parsed_yang_module().
+    Args:
+        task: A tuple. (path of yang file, its text or None to read it).
+    Returns:
+        A tuple. (the module statement or None, the errors found while parsing, the seconds taken).
+    """
+    yang_file_path, text = task
+    ctx = WORKER_CTX
+    start = len(ctx.errors)
+    start_time = time.time()
+    module = None
+    try:
+        if text is None:
+            if sys.version_info[0] == 2:
+                fd = io.open(yang_file_path, "r", encoding="UTF-8")
+            else:
+                fd = open(yang_file_path, "r", encoding="UTF-8")
+            with fd:
+                text = fd.read()
+        module = yang_parser.YangParser().parse(ctx, yang_file_path, text)
+    except Exception:
+        yang_error_write("can not open the file %s" % yang_file_path)
+    errors = ctx.errors[start:]
+    del ctx.errors[start:]
+    return module, errors, time.time() - start_time
+
+
+def add_parsed_yang_module(yang_file_path, ctx, module, errors):
+    """Add a module parsed by parse_yang_task() to the context, checked against its file name as Context.add_module().
+    Args:
+        yang_file_path: The path of yang file.
+        ctx: The pyang Context.
+        module: The module statement, None if the parse failed.
+        errors: The errors found while parsing.
+    Returns:
+        The module added, None on error.
+    """
+    ctx.errors.extend(errors)
+    if module is None:
+        return None
+    module.i_is_primary_module = False
+    m = re.search(r"^(.*?)(\@(\d{4}-\d{2}-\d{2}))?\.yang$", yang_file_path)
+    name, rev = os.path.basename(m.group(1)), m.group(3)
+    if not re.match(syntax.re_identifier, name):
+        error.err_add(ctx.errors, module.pos, 'FILENAME_BAD_MODULE_NAME', (yang_file_path, name, syntax.identifier))
+    elif name != module.arg:
+        error.err_add(ctx.errors, module.pos, 'BAD_MODULE_NAME', (module.arg, yang_file_path, name))
+        return None
+    latest_rev = util.get_latest_revision(module)
+    if rev is not None and rev != latest_rev:
+        error.err_add(ctx.errors, module.pos, 'BAD_REVISION', (latest_rev, yang_file_path, rev))
+        return None
+    if module.arg not in ctx.revs:
+        ctx.revs[module.arg] = [(latest_rev, None)]
+    logging.info('parse yang module %s success!', yang_file_path)
+    return ctx.add_parsed_module(module)
+
+
 def parse_yang_modules(yang_directory, ctx):
     if os.path.isfile(yang_directory):
         parse_yang_module(yang_directory, ctx)
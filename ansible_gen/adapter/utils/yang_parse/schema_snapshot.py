@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""schema_snapshot.py docstrings.
+This module writes the schema nodes of a validated context into a snapshot file of JSON lines, and reads it back as
+a SchemaSnapshot which the interfaces look up instead of the pyang statements, so the scripts can be generated on a
+host without the yang files and pyang.
+
+The first line is the header with the modules, each of the other lines is a schema node:
+    {"format": "ansible-gen-schema", "version": 3, "modules": [[name, namespace, description], ...]}
+    {"module": name, "xpath": "/ifm/interfaces", "namespace": namespace, "keyword": "container", "keys": [],
+     "info": {the dict of interfaces.get_xpaths_infos()}}
+The xpath has no prefix, and the input, output, choice and case nodes are left out the same as the xpaths of
+node_index.build_node_index(). The tuples of info are written as {"tuple": [...]} to be read back as tuples, and the
+IntervalSets as {"intervals": [bounds]}.
+"""
+
+import io
+import os
+import json
+import logging
+import tempfile
+from collections import namedtuple
+
+from .node_index import iter_schema_nodes
+from .info_cache import XpathInfoCache
+from .interval_set import IntervalSet
+
+SNAPSHOT_FORMAT = "ansible-gen-schema"
+SNAPSHOT_VERSION = 3
+
+
+class SchemaNode(namedtuple("SchemaNode", ["xpath", "namespace", "keyword", "keys", "info"])):
+    """
+    A schema node of a SchemaSnapshot.
+        xpath: The xpath without prefix.
+        namespace: The namespace of the module defining the node.
+        keyword: The keyword of node, e.g. "leaf" or "list".
+        keys: A list. The key leafs of a list, empty for the others.
+        info: A dict. The information returned by interfaces.get_xpaths_infos(), None if it can not be got.
+    """
+    __slots__ = ()
+
+
+def encode_value(value):
+    """Convert the tuples and IntervalSets in value for JSON, which writes them as lists."""
+    if isinstance(value, IntervalSet):
+        return {"intervals": list(value.bounds)}
+    if isinstance(value, tuple):
+        return {"tuple": [encode_value(item) for item in value]}
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, encode_value(item)) for key, item in value.items())
+    return value
+
+
+def decode_object(obj):
+    """The object_hook of json, converting back the tuples and IntervalSets converted by encode_value()."""
+    if len(obj) == 1 and "tuple" in obj and isinstance(obj["tuple"], list):
+        return tuple(obj["tuple"])
+    if len(obj) == 1 and "intervals" in obj and isinstance(obj["intervals"], list):
+        return IntervalSet(tuple(obj["intervals"]))
+    return obj
+
+
+def dump_schema(yang_handler, snapshot_file):
+    """Write the schema nodes of the parsed yang files into a snapshot file, which is replaced at once.
+    Args:
+        yang_handler: The validated YangParser.
+        snapshot_file: The path of snapshot file.
+    Returns:
+        The number of schema nodes written.
+    """
+    # the interfaces import pyang, a snapshot is read without them.
+    from . import interfaces
+    from .pyang_util import get_module_namespace
+    modules = [module for module in yang_handler.ctx.modules.values() if module.keyword == 'module']
+    header = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "modules": []}
+    for module in modules:
+        desc_stmt = module.search_one("description")
+        header["modules"].append([module.arg, get_module_namespace(module), desc_stmt.arg if desc_stmt else None])
+    snapshot_dir = os.path.dirname(os.path.abspath(snapshot_file))
+    handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=snapshot_dir)
+    count = 0
+    try:
+        with io.open(handle, "w", encoding="utf-8") as temp_file:
+            temp_file.write(json.dumps(header, sort_keys=True, separators=(",", ":")) + "\n")
+            for module in modules:
+                for xpath, node in iter_schema_nodes(module):
+                    keys = interfaces.get_list_keys(node) if node.keyword == "list" else []
+                    try:
+                        info = encode_value(interfaces.get_node_infos(node, yang_handler.type_cache))
+                    except Exception as error:
+                        logging.error("get the information of %s in module %s failed: %s", xpath, module.arg, error)
+                        info = None
+                    record = {"module": module.arg, "xpath": xpath, "keyword": node.keyword, "keys": keys,
+                              "namespace": get_module_namespace(node.main_module()), "info": info}
+                    temp_file.write(json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n")
+                    count += 1
+        # mkstemp creates the file readable only by the owner, the snapshot is an output like the scripts.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        getattr(os, "replace", os.rename)(temp_path, snapshot_file)
+        temp_path = None
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+    return count
+
+
+class SchemaSnapshot(object):
+    """
+    The schema nodes read from a snapshot file, used as the yang_handler of a GenerationContext.
+        path: The path of snapshot file.
+        modules: A list of (name, namespace, description) in the order of the context dumped.
+        nodes: A dict. {(module name, xpath): SchemaNode}.
+        namespace_modules: A dict. {namespace: module name}, the first module of a namespace.
+        info_cache: The XpathInfoCache of interfaces.get_xpaths_infos().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.modules = []
+        self.nodes = dict()
+        self.namespace_modules = dict()
+        self.info_cache = XpathInfoCache()
+
+    def load(self):
+        """Read the snapshot file.
+        Returns:
+            self
+        Raises:
+            ValueError: The file is not a snapshot of this version.
+        """
+        with io.open(self.path, "r", encoding="utf-8") as handle:
+            header = json.loads(handle.readline() or "{}")
+            if header.get("format") != SNAPSHOT_FORMAT or header.get("version") != SNAPSHOT_VERSION:
+                raise ValueError("%s is not a schema snapshot of version %s" % (self.path, SNAPSHOT_VERSION))
+            self.modules = [tuple(module) for module in header["modules"]]
+            for line in handle:
+                record = json.loads(line, object_hook=decode_object)
+                self.nodes[(record["module"], record["xpath"])] = SchemaNode(
+                    record["xpath"], record["namespace"], record["keyword"], record["keys"], record["info"])
+        for name, namespace, _ in self.modules:
+            self.namespace_modules.setdefault(namespace, name)
+        logging.info("schema snapshot %s: %d modules, %d schema nodes", self.path, len(self.modules),
+                     len(self.nodes))
+        return self
+
+    def find_node(self, namespace, xpath):
+        """Find the xpath-node, the same one YangParser.find_node() finds in the context dumped.
+        Args:
+            namespace: The namespace of the module that xpath-node belong to.
+            xpath: The xpath-node.(without prefix).
+        Returns:
+            The SchemaNode, None if it is not found.
+        """
+        module_name = self.namespace_modules.get(namespace)
+        if module_name is None:
+            return None
+        return self.nodes.get((module_name, xpath))
+
+    def get_module_descriptions(self, xml_namespace):
+        """Get the (name, description) of the modules of xml_namespace."""
+        return [(name, description) for name, namespace, description in self.modules if namespace in xml_namespace]
+
+
+def load_schema_snapshot(path):
+    """Read a snapshot file written by dump_schema().
+    Args:
+        path: The path of snapshot file.
+    Returns:
+        A SchemaSnapshot.
+    """
+    return SchemaSnapshot(path).load()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""yang_header.py docstrings.
+This module keeps the name, namespace, imports, includes and augment targets of yang files, read by
+namespace_index.NamespaceIndex, so the yang modules a xml file needs can be found without parsing the yang files by
+pyang.
+"""
+
+import os
+import re
+import hashlib
+from collections import namedtuple
+
+YANG_FILE_PATTERN = re.compile(r"^(.*?)(\@(\d{4}-\d{2}-\d{2}))?\.yang$")
+# the remarks and descriptions, the same as YangParser.get_yang_files().
+COMMENT_PATTERN = re.compile(r'\s+//[\s\S]*?\n|/\*{1,2}[\s\S]*?\*/|\s+description\s*"[^"]*?";')
+AUGMENT_PATTERN = re.compile(r'\s(augment|deviation)\s')
+# the absolute schema node identifier of augment or deviation, whose first prefix names the target module.
+AUGMENT_TARGET_PATTERN = re.compile(r'\s(?:augment|deviation)\s+["\']?\s*/\s*([\w.-]+):')
+
+
+class YangHeader(namedtuple("YangHeader", ["name", "path", "keyword", "namespace", "imports", "includes",
+                                           "size", "augments", "belongs_to"])):
+    """
+    The header of a yang file.
+        name: The name of module or submodule.
+        path: The path of yang file.
+        keyword: "module" or "submodule".
+        namespace: The namespace of module, None for submodule.
+        imports: A tuple. The names of imported modules.
+        includes: A tuple. The names of included submodules.
+        size: The size of yang file in bytes.
+        augments: A tuple. The names of the modules the yang file augments or deviates, whose schema tree changes
+                  when it is loaded in the same context.
+        belongs_to: The name of the module a submodule belongs to, None for module.
+    """
+    __slots__ = ()
+
+
+def get_augment_targets(content, prefixes, own_prefix=None):
+    """Get the modules augmented or deviated by yang text whose remarks are removed.
+    Args:
+        content: The yang text.
+        prefixes: A dict. {prefix: name of the imported module}.
+        own_prefix: The prefix of the module itself, whose own nodes are left out.
+    Returns:
+        A tuple of module names in the order found.
+    """
+    targets = []
+    for prefix in AUGMENT_TARGET_PATTERN.findall(content):
+        if prefix != own_prefix and prefix in prefixes and prefixes[prefix] not in targets:
+            targets.append(prefixes[prefix])
+    return tuple(targets)
+
+
+def get_revision(header):
+    """Get the revision in the file name of a yang file, "" if it has not one."""
+    match_obj = YANG_FILE_PATTERN.match(os.path.basename(header.path))
+    return (match_obj.group(3) or "") if match_obj else ""
+
+
+def add_header(headers, header):
+    """Add the header of a yang file unless the module has a file of the same or later revision already, the
+    directories are walked top-down so the file nearest to the yang directory is kept for the same revision.
+    Args:
+        headers: A dict. {module name: YangHeader}.
+        header: A YangHeader.
+    """
+    current = headers.get(header.name)
+    if current is None or get_revision(header) > get_revision(current):
+        headers[header.name] = header
+
+
+def get_namespace_roots(headers, features):
+    """Get the modules of the xml namespaces.
+    Args:
+        headers: A dict. {module name: YangHeader}.
+        features: The namespaces, None means all modules.
+    Returns:
+        A sorted list of module names.
+    """
+    return sorted(header.name for header in headers.values()
+                  if header.namespace is not None and (features is None or header.namespace in features))
+
+
+def get_load_closure(headers, names):
+    """Get the modules a context needs to load for the modules of names, following the import and include edges
+    and the reverse augment edges, since a module augmenting or deviating a loaded module changes its schema tree.
+    Args:
+        headers: A dict. {module name: YangHeader}.
+        names: The names of modules.
+    Returns:
+        A set of module names, the imported or included ones not found in headers are kept.
+    """
+    augmenting = dict()
+    for header in headers.values():
+        # the augments of a submodule are loaded with the module it belongs to.
+        for target in header.augments:
+            augmenting.setdefault(target, set()).add(header.belongs_to or header.name)
+    closure = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in closure:
+            continue
+        closure.add(name)
+        header = headers.get(name)
+        if header is not None:
+            pending.extend(header.imports)
+            pending.extend(header.includes)
+        pending.extend(augmenting.get(name, ()))
+    return closure
+
+
+def get_dependency_files(headers, namespaces):
+    """Get the yang files a context loads for the modules of namespaces, see get_load_closure().
+    Args:
+        headers: A dict. {module name: YangHeader}.
+        namespaces: The xmlns of a xml file.
+    Returns:
+        A sorted list of absolute paths, the modules without yang file are left out.
+    """
+    closure = get_load_closure(headers, get_namespace_roots(headers, namespaces))
+    return sorted(os.path.abspath(headers[name].path) for name in closure if name in headers)
+
+
+def get_file_digest(path):
+    """Get the sha1 of the content of a file, None if it can not be read."""
+    try:
+        with open(path, "rb") as handle:
+            return hashlib.sha1(handle.read()).hexdigest()
+    except (IOError, OSError):
+        return None
+
+
+def get_headers_digest(headers):
+    """Get the digest of the linkage of headers, which changes when a yang file is added, removed or renamed, or
+    changes its namespace, imports, includes or augment targets, so the closures may change.
+    Args:
+        headers: A dict. {module name: YangHeader}.
+    Returns:
+        The hex digest.
+    """
+    digest = hashlib.sha1()
+    for name in sorted(headers):
+        header = headers[name]
+        digest.update(repr((name, os.path.abspath(header.path), header.keyword, header.namespace, header.imports,
+                            header.includes, header.augments, header.belongs_to)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_load_order(headers, names):
+    """Sort the modules so that each one comes after the modules it imports or includes, a cycle is broken at the
+    module first reached.
+    Args:
+        headers: A dict. {module name: YangHeader}.
+        names: The names of modules, the ones not found in headers are left out.
+    Returns:
+        A list of module names.
+    """
+    order = []
+    visited = set()
+
+    def visit(name):
+        if name in visited or name not in names or name not in headers:
+            return
+        visited.add(name)
+        for dependency in headers[name].imports + headers[name].includes:
+            visit(dependency)
+        order.append(name)
+
+    for name in sorted(names):
+        visit(name)
+    return order
@@ -5,11 +5,15 @@
 import os
 import sys
 import math
+import time
 import logging
-import codecs
-import re
+from collections import OrderedDict
 
 from . import pyang_util
+from .yang_header import get_namespace_roots, get_load_closure, get_load_order
+from .namespace_index import get_namespace_index
+from .node_index import build_node_index
+from .info_cache import XpathInfoCache
 from .. import base_util
 
 
@@ -20,63 +24,138 @@ class YangParser():
     """
     parsed_datas = {}
 
-    def __init__(self, yang_dir, features):
+    def __init__(self, yang_dir, features, cache_dir=None):
         self.yang_dir = yang_dir
         self.features = features
+        self.cache_dir = cache_dir
+        # {module name: YangHeader} of the yang files found by get_yang_files().
+        self.headers = dict()
+        # {path of yang file: text} of the files read by get_yang_files() completely.
+        self.texts = dict()
+        # {module statement: {xpath without prefix: statement}}, see get_node_index().
+        self.node_indexes = dict()
+        # {namespace: module statement}, the first module of a namespace in self.ctx.modules.
+        self.namespace_modules = dict()
+        # the information of xpath-nodes got by interfaces.get_xpaths_infos().
+        self.info_cache = XpathInfoCache()
+        # {type_spec: TypeDescriptor} shared by the leafs of the same typedef or type, see
+        # interfaces.resolve_type_spec().
+        self.type_cache = dict()
         self.ctx = pyang_util.init_ctx(yang_dir)
 
     # get yang files need to be parsed by self.features
     def get_yang_files(self):
         """Get the yang files that need to be parsed.
         Args:
-            self.yang_dir: The path of yang file.
-            self.features: A set(). Saving the namespace of module that need to be parsed.
+            self.yang_dir: The path of yang file, its subdirectories are searched too.
+            self.features: A set(). Saving the namespace of module that need to be parsed, None means all modules.
+            self.cache_dir: The directory the namespace index is saved into, None if it is only kept in process.
         Returns:
-            selected_files: The yang files that need to be parsed.
-            Traversing yang files under the yang path,if the namespace in self.features,saving this yang file's name to
-            selected_files.
+            selected_files: A OrderedDict. {module name: path of yang file} in the order to load, each module comes
+            after the modules it imports.
+            The headers of the yang files are read from a NamespaceIndex, only the new or changed files are read.
+            The modules whose namespace in self.features are loaded with the closure of their import, include and
+            reverse augment edges, see yang_header.get_load_closure(). The submodules are loaded by their module.
         """
-        selected_files = dict()
-        for yang_file in os.listdir(self.yang_dir):
-            try:
-                if not os.path.isfile(os.path.join(self.yang_dir, yang_file)) or not yang_file.endswith(".yang"):
-                    continue
-                if sys.version < '3':
-                    handle = codecs.open(os.path.join(self.yang_dir, yang_file), encoding="utf-8")
-                else:
-                    handle = open(os.path.join(self.yang_dir, yang_file), encoding="UTF-8")
-                content = handle.read()
-                # remove the remarks from the yang file.(The single line comment follow with code that can not remove)
-                remove_comment_content = re.sub(r'\s+//[\s\S]*?\n|/\*{1,2}[\s\S]*?\*/|\s+description\s*"[^"]*?";',
-                                                "", content)
-                # get the yang module which need to be parsed.
-                searchObj = re.search( r'\s+namespace\s+(.*?);', remove_comment_content, re.S)
-                if searchObj:
-                    xmlns = ""
-                    # special scence: namespace "urn:ietf:params:xml:ns:"\n + "yang:ietf-isis-srv6";
-                    split_result = searchObj.group(1).strip('"').split('"')
-                    for item in split_result[::2]:
-                        xmlns += item
-                    if xmlns in self.features:
-                        selected_files[os.path.splitext(yang_file)[0]] = xmlns
-
-                handle.close()
-
-            except (IOError, UnicodeDecodeError) as e:
-                logging.error("parse yang file %s failed: %s", yang_file, e)
-
+        headers, self.texts = get_namespace_index(self.cache_dir).scan(self.yang_dir, self.features)
+        self.headers = headers
+        roots = get_namespace_roots(headers, self.features)
+        load_set = get_load_closure(headers, roots)
+        missing = sorted(name for name in load_set if name not in headers)
+        selected_files = OrderedDict((name, headers[name].path) for name in get_load_order(headers, load_set)
+                                     if headers[name].keyword == "module")
+        logging.info("load %d yang modules for the namespace modules %s: %s", len(selected_files),
+                     ", ".join(roots), ", ".join(selected_files))
+        if missing:
+            logging.info("yang modules not found under %s: %s", self.yang_dir, ", ".join(missing))
         return selected_files
 
-    def parse(self):
+    def parse(self, module_cache=None, jobs=1):
+        """Parse and validate the yang files.
+        Args:
+            module_cache: A ModuleCache, the cached modules of the same content are reused instead of parsed, and the
+                          modules of this context are added into it. None to parse all yang files.
+            jobs: The number of processes parsing the yang files, the modules are validated in this process.
+        Returns:
+            self
+        """
         yang_files = self.get_yang_files()
-        parser = self.parse_yang_files(yang_files)
-        parser.ctx.validate()
+        keys = None
+        if module_cache is not None:
+            keys = module_cache.get_keys(self.headers, list(yang_files))
+            restored = module_cache.restore(self.ctx, keys)
+            yang_files = OrderedDict((name, path) for name, path in yang_files.items() if name not in restored)
+        parser = self.parse_yang_files(yang_files, jobs)
+        parser.validate_yang_modules(yang_files)
+        if module_cache is not None:
+            module_cache.store(parser.ctx, keys)
         return parser
 
-    def parse_yang_files(self, files):
+    def validate_yang_modules(self, files):
+        """Validate the parsed modules in the load order and then the whole context, which validates the modules
+        pyang added by import and checks the duplicate namespaces.
+        Args:
+            files: The dict returned by get_yang_files().
+        """
+        from pyang import statements
+        for name in files:
+            module = self.ctx.get_module(name)
+            if module is None:
+                continue
+            start_time = time.time()
+            statements.validate_module(self.ctx, module)
+            logging.info("validate yang module %s in %.3fs", name, time.time() - start_time)
+        self.ctx.validate()
+        self.build_indexes()
+
+    def build_indexes(self):
+        """Index the validated modules by namespace, and the schema nodes of every module by xpath, the augmented
+        nodes are indexed with the module they are augmented into."""
+        start_time = time.time()
+        self.node_indexes = dict()
+        self.namespace_modules = dict()
+        count = 0
+        for module in self.ctx.modules.values():
+            if module.keyword == 'module':
+                namespace = pyang_util.get_module_namespace(module)
+                if namespace is not None:
+                    self.namespace_modules.setdefault(namespace, module)
+                self.node_indexes[module] = build_node_index(module)
+                count += len(self.node_indexes[module])
+        logging.info("index %d schema nodes of %d yang modules in %.3fs", count, len(self.node_indexes),
+                     time.time() - start_time)
+
+    def find_node(self, namespace, xpath):
+        """Find the xpath-node in the module of namespace.
+        Args:
+            namespace: The namespace of the module that xpath-node belong to.
+            xpath: The xpath-node.(without prefix).
+        Returns:
+            The pyang statement, None if it is not found.
+        """
+        module = self.namespace_modules.get(namespace)
+        if module is None:
+            return None
+        return self.get_node_index(module).get(xpath)
+
+    def get_node_index(self, module):
+        """Get the node index of a module.
+        Args:
+            module: The module statement of self.ctx.
+        Returns:
+            A dict. {xpath without prefix: statement}, see node_index.build_node_index().
+        """
+        node_index = self.node_indexes.get(module)
+        if node_index is None:
+            node_index = self.node_indexes[module] = build_node_index(module)
+        return node_index
+
+    def parse_yang_files(self, files, jobs=1):
         """
         We create only one instance to store parsed result. And we avoid of duplicate parse by record the
         yang file we have parsed and skip it in after parse.
+        When jobs is greater than 1, the yang files are parsed into statement trees by a pool of forked processes,
+        and added to the single context in the load order, see get_parse_pool().
         """
         average_progress = 0
         if files:
@@ -84,17 +163,40 @@ class YangParser():
             average_progress = int(math.floor((49 - completed_progress) / len(files)))
             if average_progress == 0:
                 average_progress = 1
-        for yang_file, _ in files.items():
-            yang_file += ".yang"
-            logging.info("parse yang file %s", yang_file)
-            path = os.path.join(self.yang_dir, yang_file)
-            pyang_util.parse_yang_module(path, self.ctx)
-            # progress_bar
-            completed_progress += average_progress
-            if completed_progress > 49:
-                completed_progress = 49
-            process_message = " {0} parse Completed.".format(yang_file)
-            base_util.print_progress_bar(completed_progress, process_message)
+        pool = self.get_parse_pool(min(jobs, len(files))) if jobs > 1 and len(files) > 1 else None
+        recursion_limit = sys.getrecursionlimit()
+        try:
+            if pool is not None:
+                # the statement trees returned by the workers are unpickled recursively in this process.
+                sys.setrecursionlimit(max(recursion_limit, pyang_util.PICKLE_RECURSION_LIMIT))
+                tasks = [(path, self.texts.pop(path, None)) for path in files.values()]
+                results = pool.imap(pyang_util.parse_yang_task, tasks)
+            else:
+                results = (None for _ in files)
+            for (_, path), result in zip(files.items(), results):
+                yang_file = os.path.basename(path)
+                logging.info("parse yang file %s", path)
+                start_time = time.time()
+                if result is None:
+                    pyang_util.parse_yang_module(path, self.ctx, self.texts.pop(path, None))
+                    parse_time = time.time() - start_time
+                else:
+                    module, errors, parse_time = result
+                    pyang_util.add_parsed_yang_module(path, self.ctx, module, errors)
+                logging.info("parse yang file %s in %.3fs", yang_file, parse_time)
+                # progress_bar
+                completed_progress += average_progress
+                if completed_progress > 49:
+                    completed_progress = 49
+                process_message = " {0} parse Completed.".format(yang_file)
+                base_util.print_progress_bar(completed_progress, process_message)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+            if pool is not None:
+                pool.close()
+                pool.join()
+        # the texts of the modules restored from a ModuleCache are not needed.
+        self.texts.clear()
 
         # modules = {}
         # main_yangs = [os.path.splitext(base_name)[0]
@@ -110,3 +212,16 @@ class YangParser():
         # self.ctx.modules = modules
 
         return self
+
+    def get_parse_pool(self, jobs):
+        """Get a process pool forked from current process for pyang_util.parse_yang_task().
+        Args:
+            jobs: The number of worker processes.
+        Returns:
+            pool: The multiprocessing pool, None if fork is not supported by the platform.
+        """
+        import multiprocessing
+        if "fork" not in multiprocessing.get_all_start_methods():
+            logging.warning("fork is not supported on this platform, parse yang files serially")
+            return None
+        return multiprocessing.get_context("fork").Pool(jobs, pyang_util.init_parse_worker, (self.ctx,))
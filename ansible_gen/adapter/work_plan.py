@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""work_plan.py docstrings.
+This module scans the resource directory once and records everything the later stages need.
+"""
+
+import os
+import re
+import logging
+import hashlib
+from collections import namedtuple
+
+RPC_DIR_NAME = "rpcs"
+
+
+class ModulePlan(namedtuple("ModulePlan", ["module_dir", "full_xml", "example_xmls", "namespaces", "sub_dir"])):
+    """
+    One "xxx_full.xml" of the resource directory.
+        module_dir: The directory of full-xml, its name is the script name.
+        full_xml: The path of full-xml.
+        example_xmls: A sorted tuple. The paths of instance-xml used to generate EXAMPLE.
+        namespaces: A frozenset. The xmlns declared in full-xml.
+        sub_dir: The direct sub directory of resource directory that full-xml belongs to, None if full-xml
+                 is directly under resource directory.
+    """
+    __slots__ = ()
+
+    @property
+    def script_name(self):
+        return os.path.basename(self.module_dir)
+
+
+class ScriptTask(namedtuple("ScriptTask", ["plan", "output_dir", "script_dir"])):
+    """
+    A ModulePlan together with the directory its script is generated to and the user-check script directory.
+    """
+    __slots__ = ()
+
+    @property
+    def script_path(self):
+        return os.path.join(self.output_dir, self.plan.script_name + ".py")
+
+
+def get_xml_str_namespace(xml_str, file_name):
+    """Get the xmlns declared in xml string.
+    Args:
+        xml_str: The content of xml file.
+        file_name: The name of xml file, used for log.
+    Returns:
+        A set of xmlns.
+    """
+    xml_namespace = set()
+    if xml_str.strip() == '':
+        logging.error("%s is empty", file_name)
+        return xml_namespace
+    for item in re.findall(r'xmlns.*?="(.*?)"', xml_str):
+        xml_namespace.add(item)
+    for item in re.findall(r"xmlns.*?='(.*?)'", xml_str):
+        xml_namespace.add(item)
+    if not xml_namespace:
+        logging.error("%s has no xmlns", file_name)
+    return xml_namespace
+
+
+def get_shard_index(module_dir, xml_dir, shard_count):
+    """Get the shard a module directory belongs to, it only depends on the path relative to resource directory,
+    so every machine partitions the same resource tree the same way.
+    Args:
+        module_dir: The directory of full-xml.
+        xml_dir: The resource directory.
+        shard_count: The number of shards.
+    Returns:
+        The shard index, from 1 to shard_count.
+    """
+    relative_dir = os.path.relpath(module_dir, xml_dir).replace(os.sep, "/")
+    return int(hashlib.sha1(relative_dir.encode("utf-8")).hexdigest(), 16) % shard_count + 1
+
+
+class WorkPlan(object):
+    """
+    The result of scanning the resource directory.
+        xml_dir: The resource directory.
+        sub_dirs: The names of direct sub directories of resource directory.
+        modules: A list of ModulePlan, sorted by path.
+    """
+
+    def __init__(self, xml_dir):
+        self.xml_dir = xml_dir
+        self.sub_dirs = []
+        self.modules = []
+
+    def __len__(self):
+        return len(self.modules)
+
+    def __iter__(self):
+        return iter(self.modules)
+
+    def get_namespaces(self, modules=None):
+        """Get the set of all xmlns which need to be parsed.
+        Args:
+            modules: The ModulePlan subset, all modules by default.
+        """
+        namespaces = set()
+        for module in self.modules if modules is None else modules:
+            namespaces = namespaces | module.namespaces
+        return namespaces
+
+    def in_shard(self, full_xml, shard):
+        """Whether a full-xml belongs to the shard.
+        Args:
+            full_xml: The path of full-xml.
+            shard: A tuple (index, count), None means all modules.
+        """
+        if shard is None:
+            return True
+        return get_shard_index(os.path.dirname(full_xml), self.xml_dir, shard[1]) == shard[0]
+
+    def select_shard(self, shard):
+        """Keep only the modules of the shard.
+        Args:
+            shard: A tuple (index, count), None means all modules.
+        Returns:
+            self
+        """
+        self.modules = [module for module in self.modules if self.in_shard(module.full_xml, shard)]
+        return self
+
+    def scan(self):
+        """Walk the resource directory with one os.scandir() per directory.
+        Returns:
+            self
+        """
+        entries = sorted(os.scandir(self.xml_dir), key=lambda entry: entry.name)
+        self.sub_dirs = [entry.name for entry in entries if entry.is_dir()]
+        self._scan_dir(self.xml_dir, entries, None)
+        self.modules.sort(key=lambda module: module.full_xml)
+        return self
+
+    def _scan_dir(self, xml_dir, entries, sub_dir):
+        """Scan one directory(recursive function).
+        Args:
+            xml_dir: The directory.
+            entries: The sorted os.DirEntry list of the directory.
+            sub_dir: The direct sub directory of resource directory that xml_dir belongs to.
+        Returns:
+            example_xmls: The instance-xml under xml_dir and its sub directories, the same as
+                          gen_examples.get_module_file().
+        """
+        example_xmls = []
+        full_xmls = []
+        for entry in entries:
+            if entry.is_dir():
+                sub_entries = sorted(os.scandir(entry.path), key=lambda sub_entry: sub_entry.name)
+                example_xmls.extend(self._scan_dir(entry.path, sub_entries, sub_dir or entry.name))
+            elif entry.is_file():
+                if entry.name.endswith("_example.xml"):
+                    example_xmls.append(entry.path)
+                else:
+                    if len(entries) == 1:
+                        example_xmls.append(entry.path)
+                    if entry.name.endswith(".xml"):
+                        full_xmls.append(entry.path)
+        example_xmls.sort()
+        for full_xml in full_xmls:
+            with open(full_xml, 'r') as xml_file:
+                xml_str = xml_file.read()
+            self.modules.append(ModulePlan(
+                xml_dir, full_xml, tuple(example_xmls),
+                frozenset(get_xml_str_namespace(xml_str, os.path.basename(full_xml))), sub_dir))
+        return example_xmls
+
+
+def build_work_plan(xml_dir):
+    """Scan the resource directory once.
+    Args:
+        xml_dir: Parser form command line -r.
+    Returns:
+        A WorkPlan instance.
+    """
+    return WorkPlan(xml_dir).scan()
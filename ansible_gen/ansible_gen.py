@@ -1,24 +1,48 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import gc
 import os
+import re
 import sys
-import codecs
+import time
 import traceback
 import logging
-import shutil
 import math
-from optparse import OptionParser
+import json
+from optparse import OptionParser, Values
+from collections import OrderedDict
 if sys.version_info[0] == 2:
-    from adapter import get_argument_spec_documentation as get_parser
-    from generator import var, ansible_auto_scripts as script_gen
-    from generator.move_file import *
     from adapter.utils import base_util
+    from generator import manifest, output_stage
+    from generator.move_file import get_ansible_path
+    from adapter.work_plan import build_work_plan, ScriptTask
+    from adapter.context import GenerationContext
+    from adapter import partition, impact
+    from adapter.utils.yang_parse.module_cache import ModuleCache
+    from adapter.utils.yang_parse.context_cache import ContextCache
+    # parsing yang and xml files and rendering scripts import pyang, lxml, jinja2 and xmltodict.
+    get_parser = base_util.LazyModule("adapter.get_argument_spec_documentation")
+    var = base_util.LazyModule("generator.var")
+    script_gen = base_util.LazyModule("generator.ansible_auto_scripts")
+    serve = base_util.LazyModule("serve")
+    budget = base_util.LazyModule("generator.budget")
+    schema_snapshot = base_util.LazyModule("adapter.utils.yang_parse.schema_snapshot")
 else:
-    from ansible_gen.adapter import get_argument_spec_documentation as get_parser
-    from ansible_gen.generator import var, ansible_auto_scripts as script_gen
-    from ansible_gen.generator.move_file import *
     from ansible_gen.adapter.utils import base_util
-
+    from ansible_gen.generator import manifest, output_stage
+    from ansible_gen.generator.move_file import get_ansible_path
+    from ansible_gen.adapter.work_plan import build_work_plan, ScriptTask
+    from ansible_gen.adapter.context import GenerationContext
+    from ansible_gen.adapter import partition, impact
+    from ansible_gen.adapter.utils.yang_parse.module_cache import ModuleCache
+    from ansible_gen.adapter.utils.yang_parse.context_cache import ContextCache
+    # parsing yang and xml files and rendering scripts import pyang, lxml, jinja2 and xmltodict.
+    get_parser = base_util.LazyModule("ansible_gen.adapter.get_argument_spec_documentation")
+    var = base_util.LazyModule("ansible_gen.generator.var")
+    script_gen = base_util.LazyModule("ansible_gen.generator.ansible_auto_scripts")
+    serve = base_util.LazyModule("ansible_gen.serve")
+    budget = base_util.LazyModule("ansible_gen.generator.budget")
+    schema_snapshot = base_util.LazyModule("ansible_gen.adapter.utils.yang_parse.schema_snapshot")
 
 if not sys.version > '3':
     import ConfigParser as configparser
@@ -33,43 +57,137 @@ USAGE = "Dynamically generate Ansible modules from yang and xml files, then depl
 __version__ = "1.0.0"
 
 SCRIPT_GEN_LOG_FILE = "ansible_gen.log"
-BASE_ERROR = r"##########ANSIBLE_GEN_ERROR_START##########"
-END_ERROR = r"###########ANSIBLE_GEN_ERROR_END###########"
-START_WARNING = r"##########USER_OPERATION_WARNING_START##########"
-END_WARNING = r"###########USER_OPERATION_WARNING_END###########"
-GENERATE_SCRIPT_MESSAGE = ""
-SCRIPT_DIR_GLOBAL = ""
-
-def parse_error_and_exit(filename):
-    """Extract the error information from "ansible_gen.log".
+SCRIPT_GEN_SUMMARY_FILE = "ansible_gen_summary.json"
+DEFAULT_CFG_FILE = "/etc/ansible-gen/default.cfg"
+# the log level when log_level is not configured in default.cfg.
+DEFAULT_LOG_LEVEL = "INFO"
+# the GenerationContext of a pool worker, inherited from the parent process by fork().
+WORKER_CONTEXT = None
+
+
+def report_error(diagnostics):
+    """Print the result of execution.
     Args:
-        filename: The path of "ansible_gen.log".
+        diagnostics: The Diagnostics collected in this run.
+    Returns:
+        ret_val: 1 if there is error, else 0.
     """
     ret_val = 0
-    handle = None
-    try:
-        handle = codecs.open(filename, encoding="utf-8")
-        log_context = handle.read()
-        findre = re.compile(r"%s.*?%s" % (BASE_ERROR, END_ERROR), re.DOTALL)
-        error_list = findre.findall(log_context)
-        warning_obj = re.compile(r"%s.*?%s" % (START_WARNING, END_WARNING), re.DOTALL)
-        warning_list = warning_obj.findall(log_context)
-        if error_list:
-            print("Ansible-gen Execute Failed.")
-            ret_val = 1
-            for error_str in set(error_list):
-                print(error_str)
-        else:
-            print("Ansible-gen Execute Success.")
-        if warning_list:
-            for operation_warning_str in set(warning_list):
-                print(operation_warning_str)
-    except Exception:
+    error_list = list(OrderedDict.fromkeys(diagnostics.get_errors()))
+    warning_list = list(OrderedDict.fromkeys(diagnostics.get_warnings()))
+    if error_list:
+        print("Ansible-gen Execute Failed.")
         ret_val = 1
-    finally:
-        if handle is not None:
-            handle.close()
-        sys.exit(ret_val)
+        for error_str in error_list:
+            print(base_util.format_error(error_str))
+    else:
+        print("Ansible-gen Execute Success.")
+    if warning_list:
+        for operation_warning_str in warning_list:
+            print(base_util.format_operation_warning(operation_warning_str))
+    return ret_val
+
+
+def write_report(report_file, diagnostics):
+    """Write the errors and warnings of each module into a json file.
+    Args:
+        report_file: The path of report, from command line --report.
+        diagnostics: The Diagnostics collected in this run.
+    """
+    report = OrderedDict([("version", __version__),
+                          ("result", "failed" if diagnostics.get_errors() else "success")])
+    report.update(diagnostics.to_dict())
+    try:
+        with open(report_file, 'w') as handle:
+            json.dump(report, handle, indent=1)
+    except IOError as error:
+        logging.error("write report %s failed: %s", report_file, error)
+
+
+def write_summary(options, diagnostics, context=None):
+    """Write the summary of this run into the log directory, the merge command combines the summaries of shards.
+    Args:
+        options: The instance record user input.
+        diagnostics: The Diagnostics collected in this run.
+        context: The GenerationContext of this run, None if no script is generated.
+    """
+    summary = {"version": __version__,
+               "shard": list(options.shard) if options.shard else None,
+               "message": context.get_message() if context is not None else "",
+               "diagnostics": diagnostics.to_dict()}
+    try:
+        with open(os.path.join(options.log_dir, SCRIPT_GEN_SUMMARY_FILE), 'w') as handle:
+            json.dump(summary, handle, indent=1)
+    except IOError as error:
+        logging.error("write summary failed: %s", error)
+
+
+def merge_shards(argv):
+    """Main function of merge command, report the result of all shards as one run.
+    Args:
+        argv: The arguments after "merge".
+    """
+    parser = OptionParser(usage="%prog merge [options] SHARD_LOG_DIR ...",
+                          description="Combine the log directories of the runs with --shard K/N into one report.")
+    parser.add_option("-l", "--log", dest="log_dir", default=None,
+                      help="the directory to write the merged %s, not written if not designated."
+                           % SCRIPT_GEN_LOG_FILE)
+    parser.add_option("--report", dest="report", default=None,
+                      help="write the errors and warnings of each module of all shards into this json file.")
+    (options, shard_dirs) = parser.parse_args(argv)
+    if not shard_dirs:
+        parser.error("no shard log directory designated")
+
+    diagnostics = base_util.Diagnostics()
+    messages = []
+    shard_counts = set()
+    shard_dir_map = dict()
+    merged_log = []
+    for shard_dir in shard_dirs:
+        summary_file = os.path.join(shard_dir, SCRIPT_GEN_SUMMARY_FILE)
+        log_file = os.path.join(shard_dir, SCRIPT_GEN_LOG_FILE)
+        try:
+            with open(summary_file, 'r') as handle:
+                summary = json.load(handle)
+            if options.log_dir is not None:
+                with open(log_file, "rb") as handle:
+                    merged_log.append(handle.read().decode("utf-8", "replace"))
+        except (IOError, ValueError) as error:
+            diagnostics.errors.append("%s did not finish: %s" % (shard_dir, error))
+            continue
+        shard_diagnostics = base_util.Diagnostics.from_dict(summary.get("diagnostics", dict()))
+        diagnostics.errors.extend(shard_diagnostics.errors)
+        diagnostics.warnings.extend(shard_diagnostics.warnings)
+        diagnostics.modules.update(shard_diagnostics.modules)
+        shard = tuple(summary.get("shard") or (1, 1))
+        shard_counts.add(shard[1])
+        shard_dir_map.setdefault(shard, []).append(shard_dir)
+        messages.append((shard, summary.get("message", "")))
+
+    if len(shard_counts) > 1:
+        diagnostics.errors.append("the shard directories come from runs with different N: %s" % (
+            ", ".join(str(count) for count in sorted(shard_counts))))
+    for shard_count in shard_counts:
+        for index in range(1, shard_count + 1):
+            shard_dir_list = shard_dir_map.get((index, shard_count), [])
+            if not shard_dir_list:
+                diagnostics.errors.append("shard %d/%d is missing" % (index, shard_count))
+            elif len(shard_dir_list) > 1:
+                diagnostics.errors.append("shard %d/%d is designated more than once: %s" % (
+                    index, shard_count, ", ".join(shard_dir_list)))
+
+    if options.log_dir is not None:
+        if not os.path.exists(options.log_dir):
+            os.makedirs(options.log_dir)
+        with open(os.path.join(options.log_dir, SCRIPT_GEN_LOG_FILE), "w") as handle:
+            handle.write("".join(merged_log))
+    if options.report:
+        write_report(options.report, diagnostics)
+    for _, message in sorted(messages, key=lambda item: item[0]):
+        sys.stdout.write(message)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+    sys.exit(report_error(diagnostics))
 
 
 def fill_args_from_cfg_file(args, options):
@@ -79,8 +197,9 @@ def fill_args_from_cfg_file(args, options):
         options: The instance record user input.
     """
     user_cfg_file = args[0] if args else ""
-    default_cfg_file = os.path.join("/etc/ansible-gen/default.cfg")
-    if options.default is not None:
+    default_cfg_file = DEFAULT_CFG_FILE
+    # --default is a store_true flag defaulting to "", so the cfg file of the command line is read unless it is given.
+    if options.default:
         cfg_file = default_cfg_file
     else:
         cfg_file = user_cfg_file if user_cfg_file else default_cfg_file
@@ -89,14 +208,21 @@ def fill_args_from_cfg_file(args, options):
     cfg_info = configparser.ConfigParser()
     cfg_info.read(cfg_file)
 
-    for name in ["yang_dir", "xml_dir", "log_dir", "script_dir"]:
+    for name in ["yang_dir", "xml_dir", "log_dir", "script_dir", "cache_dir"]:
         if not getattr(options, name):
             if cfg_info.has_option("defaults", name):
                 setattr(options, name, cfg_info.get("defaults", name))
+    for name, value_type in [("timeout", float), ("memory_limit", int)]:
+        if getattr(options, name) is None and cfg_info.has_option("defaults", name):
+            try:
+                setattr(options, name, value_type(cfg_info.get("defaults", name)))
+            except ValueError:
+                sys.stderr.write("[0x000001] : %s in %s should be a number" % (name, cfg_file))
+                sys.exit(1)
     if cfg_info.has_option("defaults", "log_level"):
         setattr(options, "log_level", cfg_info.get("defaults", "log_level"))
     else:
-        options.log_level = "DEBUG"
+        options.log_level = DEFAULT_LOG_LEVEL
 
 
 def prepare_parser():
@@ -136,6 +262,41 @@ def parse_args():
                       help="the output dir for generated ansible modules")
     parser.add_option("--default", dest="default", default='', action='store_true',
                       help="get parameters from default config file /etc/ansible-gen/default.cfg")
+    parser.add_option("-j", "--jobs", dest="jobs", default=1, type="int",
+                      help="the number of processes used to parse yang files and generate ansible modules, "
+                           "default is 1.")
+    parser.add_option("--incremental", dest="incremental", default=False, action='store_true',
+                      help="only generate the ansible modules whose inputs changed since last run, which are "
+                           "recorded in %s of the output dir." % manifest.MANIFEST_FILE)
+    parser.add_option("--watch", dest="watch", default=False, action='store_true',
+                      help="keep running with the yang files loaded, and regenerate the ansible modules whose "
+                           "inputs changed in the directory of -y, -r or -p.")
+    parser.add_option("--watch-interval", dest="watch_interval", default=1.0, type="float",
+                      help="the seconds between two polls of the watched directories, default is 1.")
+    parser.add_option("--shard", dest="shard", default=None,
+                      help="only generate the K-th of N disjoint slices of the module directories, written as "
+                           "K/N. Combine the log directories of all shards by the merge command.")
+    parser.add_option("--report", dest="report", default=None,
+                      help="write the errors and warnings of each module into this json file.")
+    parser.add_option("--timeout", dest="timeout", default=None, type="float",
+                      help="the seconds each ansible module may take, the worker generating it is killed when "
+                           "it takes longer. Unlimited by default.")
+    parser.add_option("--memory-limit", dest="memory_limit", default=None, type="int",
+                      help="the megabytes each worker process may allocate besides the parsed yang files, for all "
+                           "the ansible modules it generates, the memory kept by its earlier modules counts against "
+                           "the later ones. Unlimited by default.")
+    parser.add_option("--partition", dest="partition", default=None, type="float",
+                      help="generate the ansible modules in groups needing about this many megabytes of yang files, "
+                           "each group parses its own yang files which are freed before the next group. The peak "
+                           "RSS of each group is reported.")
+    parser.add_option("--cache-dir", dest="cache_dir", default=None,
+                      help="save the parsed yang files into this directory, a later run parsing the same yang files "
+                           "loads them instead of parsing them again. The entries are pickles, which are only loaded "
+                           "when the directory and the entry are owned by the current user and not writable by "
+                           "others.")
+    parser.add_option("--schema-snapshot", dest="schema_snapshot", default=None,
+                      help="generate the ansible modules from this snapshot written by the schema-dump command "
+                           "instead of the yang files, -y is not needed then.")
 
     (options, args) = parser.parse_args()
 
@@ -155,13 +316,11 @@ def parse_args():
     if os.path.isfile(log_file_name):
         os.remove(log_file_name)
     if hasattr(options, "log_level"):
-        log_level = options.log_level
+        log_level = options.log_level.upper()
     else:
-        log_level = "DEBUG"
+        log_level = DEFAULT_LOG_LEVEL
 
-    logging.basicConfig(filename=log_file_name,
-                        format='%(asctime)s,%(levelname)s,%(filename)s,%(lineno)d:%(message)s',
-                        level=log_level)
+    base_util.start_logging(log_file_name, log_level)
 
     return options, args
 
@@ -173,11 +332,45 @@ def env_parse():
     """
     (options, args) = parse_args()
 
-    for name in ["yang_dir", "xml_dir"]:
+    # the yang files are not read when the scripts are generated from a schema snapshot.
+    for name in ["xml_dir"] if options.schema_snapshot else ["yang_dir", "xml_dir"]:
         if not os.path.isdir(getattr(options, name)):
             sys.stderr.write("[0x000001] : %s %s doesn't exists or not designated" % (
                 name, getattr(options, name)))
             sys.exit(1)
+    if options.schema_snapshot:
+        if not os.path.isfile(options.schema_snapshot):
+            sys.stderr.write("[0x000001] : schema snapshot %s doesn't exists" % options.schema_snapshot)
+            sys.exit(1)
+        if options.watch or options.partition is not None:
+            sys.stderr.write("[0x000001] : --schema-snapshot can not be used with --watch or --partition, which "
+                             "parse the yang files")
+            sys.exit(1)
+
+    if options.jobs < 1:
+        sys.stderr.write("[0x000001] : the number of jobs %s should be greater than 0" % options.jobs)
+        sys.exit(1)
+
+    if options.shard is not None:
+        shard_match = re.match(r"^(\d+)/(\d+)$", options.shard)
+        if not shard_match or not 1 <= int(shard_match.group(1)) <= int(shard_match.group(2)):
+            sys.stderr.write("[0x000001] : shard %s should be K/N, 1 <= K <= N" % options.shard)
+            sys.exit(1)
+        options.shard = (int(shard_match.group(1)), int(shard_match.group(2)))
+        if options.watch:
+            sys.stderr.write("[0x000001] : --shard can not be used with --watch")
+            sys.exit(1)
+    if options.partition is not None and options.watch:
+        sys.stderr.write("[0x000001] : --partition can not be used with --watch, which keeps the yang files loaded")
+        sys.exit(1)
+
+    for name in ["timeout", "memory_limit", "partition"]:
+        if getattr(options, name) is not None and getattr(options, name) <= 0:
+            sys.stderr.write("[0x000001] : %s should be greater than 0" % name)
+            sys.exit(1)
+    if (options.timeout is not None or options.memory_limit is not None) and not budget.is_supported():
+        logging.warning("fork is not supported on this platform, the scripts are generated without budget")
+        options.timeout = options.memory_limit = None
 
     if options.script_dir and not os.path.isdir(options.script_dir):
         sys.stderr.write(
@@ -195,89 +388,624 @@ def env_parse():
     return options
 
 
-def get_number_of_para_xml(xml_dir):
-    """Get the number of "xxx_full.xml" under xml_dir path(recursive function).
+def get_script_tasks(work_plan, output_dir, script_dir):
+    """Map the modules of work plan to their output path and prepare the output directories.
     Args:
-        xml_dir: Parser form command line -r.
+        work_plan: The WorkPlan of command line -r.
+        output_dir: Script output path.
+        script_dir: Parser form command line -p.
     Returns:
-        full_number: The number of "xxx_full.xml" under xml_dir path.
+        tasks: A list of ScriptTask in the order of work plan.
     """
-    full_number = 0
-    xml_files = os.listdir(xml_dir)
-    for xml_file in xml_files:
-        path = os.path.join(xml_dir, xml_file)
-        if os.path.isdir(path):
-            full_number += get_number_of_para_xml(path)
+    for sub_dir in work_plan.sub_dirs:
+        sub_output_dir = os.path.join(output_dir, sub_dir)
+        if not os.path.exists(sub_output_dir):
+            os.makedirs(sub_output_dir)
+        if script_dir and not os.path.isdir(os.path.join(script_dir, sub_dir)):
+            logging.warning(
+                "no corresponding direcotory %s ", os.path.join(script_dir, sub_dir))
+
+    tasks = []
+    for module_plan in work_plan:
+        if module_plan.sub_dir is None:
+            tasks.append(ScriptTask(module_plan, output_dir, script_dir))
         else:
-            if os.path.isfile(path) and not xml_file.endswith("_example.xml"):
-                full_number = full_number + 1
-    return full_number
+            tasks.append(ScriptTask(module_plan, os.path.join(output_dir, module_plan.sub_dir),
+                                    os.path.join(script_dir, module_plan.sub_dir) if script_dir else script_dir))
+    return tasks
 
 
-def generate_netconf_script(xml_dir, output_dir, script_dir, direct_sub, completed_progress,
-                            average_remaining_progress):
-    """Generate netconf script(recursive function).
+def generate_script(task, context):
+    """Generate one netconf script, it runs in a pool worker when --jobs is greater than 1.
     Args:
-        xml_dir: Parser form command line -r.
-        output_dir: Script output path.
-        script_dir: Parser form command line -p.
-        direct_sub: Indicates whether it is a direct sub directory.
+        task: A ScriptTask of the work plan.
+        context: The GenerationContext with yang files loaded.
+    Returns:
+        script_name: The name of the script.
+        script_path: The path the script should be saved to.
+        diagnostics: The Diagnostics of the script, returned to the parent process with the result.
+    """
+    module_plan = task.plan
+    info_cache = getattr(context.yang_handler, "info_cache", None)
+    with base_util.Diagnostics() as diagnostics:
+        try:
+            logging.info("parse para file %s ", os.path.basename(module_plan.full_xml))
+            hits, misses = (info_cache.hits, info_cache.misses) if info_cache is not None else (0, 0)
+            kwargs = var.get_params(
+                context, module_plan.full_xml, module_plan.script_name, task.output_dir, task.script_dir,
+                module_plan.example_xmls)
+            if info_cache is not None:
+                logging.info("xpath infos of %s: %d cache hits, %d misses", module_plan.script_name,
+                             info_cache.hits - hits, info_cache.misses - misses)
+            if kwargs:
+                script_gen.Operation(**kwargs).run()
+        except MemoryError:
+            base_util.error_write("%s: generating it ran out of memory, see --memory-limit." % module_plan.full_xml)
+        except Exception:
+            logging.error("generate_netconf_script failed: %s",
+                          traceback.format_exc())
+    return module_plan.script_name, task.script_path, diagnostics
+
+
+def init_worker(context):
+    global WORKER_CONTEXT
+    WORKER_CONTEXT = context
+    base_util.restart_logging()
+
+
+def generate_script_in_worker(task):
+    try:
+        return generate_script(task, WORKER_CONTEXT)
+    finally:
+        # the worker may be terminated once the result is returned.
+        base_util.flush_logging()
+
+
+def generate_scripts_in_budget(context, tasks, jobs, script_budget):
+    """Generate each script in a worker process killed when it goes over the budget.
+    Args:
+        context: The GenerationContext with yang files loaded.
+        tasks: The tasks to generate.
+        jobs: The number of worker processes.
+        script_budget: The budget.Budget of each script.
+    Returns:
+        A generator of the results of generate_script() in the order of tasks.
+    """
+    for task, (result, error) in zip(tasks, budget.run_in_budget(generate_script, context, tasks, jobs,
+                                                                 script_budget)):
+        if result is None:
+            # the killed worker may leave a partly written script.
+            if os.path.isfile(task.script_path):
+                os.remove(task.script_path)
+            with base_util.Diagnostics() as diagnostics:
+                base_util.error_write(error)
+            result = (task.plan.script_name, task.script_path, diagnostics)
+        yield result
+
+
+def get_process_pool(jobs, context):
+    """Get a process pool forked from current process, so the parsed yang files are shared copy-on-write.
+    Args:
+        jobs: The number of worker processes.
+        context: The GenerationContext the workers generate scripts with, it is inherited without pickling.
+    Returns:
+        pool: The multiprocessing pool, None if fork is not supported by the platform.
+    """
+    import multiprocessing
+    if "fork" not in multiprocessing.get_all_start_methods():
+        logging.warning("fork is not supported on this platform, generate scripts serially")
+        return None
+    return multiprocessing.get_context("fork").Pool(jobs, init_worker, (context,))
+
+
+def get_outdated_tasks(tasks, build_manifest):
+    """Get the tasks whose inputs changed since the manifest was recorded.
+    Args:
+        tasks: The tasks returned by get_script_tasks().
+        build_manifest: The Manifest instance, None if incremental build is disabled.
+    Returns:
+        outdated_tasks: A list, the tasks need to be generated.
+    """
+    if build_manifest is None:
+        return list(tasks)
+    return [task for task in tasks if not build_manifest.is_up_to_date(task)]
+
+
+def generate_netconf_script(context, tasks, completed_progress, average_remaining_progress, jobs=1,
+                            build_manifest=None, stage=None, script_budget=None):
+    """Generate netconf script.
+    Args:
+        context: The GenerationContext with yang files loaded, the message of each script is added to it.
+        tasks: The tasks returned by get_script_tasks().
         completed_progress: Record the completed progress.
         average_remaining_progress: Add progress.
+        jobs: The number of worker processes, scripts are generated serially when it is 1.
+        build_manifest: The Manifest instance, the up to date scripts are skipped and the generated ones are
+                        recorded into it. None if incremental build is disabled.
+        stage: The OutputStage the scripts are generated into, None to write them into the output directory.
+        script_budget: The budget.Budget of each script, every script is generated in its own worker process
+                       if designated.
     Returns:
         completed_progress: Record the completed progress.
+        The scripts are reported in the order of a serial run whatever the value of jobs is.
     Raises:
         Exception: Capture execution exception.
     """
-    global GENERATE_SCRIPT_MESSAGE
+    outdated_tasks = get_outdated_tasks(tasks, build_manifest)
+
+    pool = None
+    if script_budget is None and jobs > 1 and len(outdated_tasks) > 1:
+        pool = get_process_pool(min(jobs, len(outdated_tasks)), context)
+    generated_tasks = outdated_tasks
+    if stage is not None:
+        generated_tasks = [stage.stage_task(task) for task in outdated_tasks]
     try:
-        xml_files = os.listdir(xml_dir)
-        for xml_file in xml_files:
-            path = os.path.join(xml_dir, xml_file)
-            if os.path.isdir(path):
-                sub_xml_dir = os.path.join(xml_dir, xml_file)
-                if direct_sub:
-                    sub_output_dir = os.path.join(output_dir, xml_file)
-                    if os.path.exists(sub_output_dir):
-                        shutil.rmtree(sub_output_dir)
-                        logging.warning(
-                            "sub directory %s removed", sub_output_dir)
-                    os.makedirs(sub_output_dir)
-                    if script_dir:
-                        script_dir = os.path.join(SCRIPT_DIR_GLOBAL, xml_file)
-                    if script_dir and not os.path.isdir(script_dir):
-                        logging.warning(
-                            "no corresponding direcotory %s ", script_dir)
+        if script_budget is not None:
+            results = generate_scripts_in_budget(context, generated_tasks, jobs, script_budget)
+        elif pool is not None:
+            results = pool.imap(generate_script_in_worker, generated_tasks)
+        else:
+            results = (generate_script(task, context) for task in generated_tasks)
+        outdated_set = set(outdated_tasks)
+        for task in tasks:
+            # progress_bar
+            completed_progress += average_remaining_progress
+            if completed_progress > 99:
+                completed_progress = 99
+            if task not in outdated_set:
+                process_message = " {0} up to date.".format(task.plan.script_name)
+                base_util.print_progress_bar(completed_progress, process_message)
+                context.add_message("The script is up to date in the path:{0}".format(task.script_path))
+                continue
+            script_name, generated_path, module_diagnostics = next(results)
+            script_path = task.script_path
+            if base_util.get_diagnostics() is not None:
+                base_util.get_diagnostics().add_module(script_path, module_diagnostics)
+            process_message = " {0} generated.".format(script_name)
+            base_util.print_progress_bar(completed_progress, process_message)
+            # a failure of one script does not stop the others.
+            try:
+                if os.path.exists(generated_path):
+                    context.add_message("The generated script has been saved to the path:{0}".format(script_path))
+                    if build_manifest is not None:
+                        build_manifest.record(task, get_parser.get_yang_dependencies(context, task.plan.namespaces))
                 else:
-                    sub_output_dir = output_dir
-                completed_progress = generate_netconf_script(sub_xml_dir, sub_output_dir, script_dir, False,
-                                                                 completed_progress, average_remaining_progress)
-            else:
-                script_name = os.path.basename(xml_dir)
-                if os.path.isfile(path) and xml_file.endswith(".xml") and not xml_file.endswith('_example.xml'):
-                    logging.info("parse para file %s ", xml_file)
-                    kwargs = var.get_params(
-                        path, script_name, output_dir, script_dir)
-                    if kwargs:
-                        script_gen.Operation(**kwargs).run()
-                    # progress_bar
-                    completed_progress += average_remaining_progress
-                    if completed_progress > 99:
-                        completed_progress = 99
-                    process_message = " {0} generated.".format(script_name)
-                    base_util.print_progress_bar(completed_progress, process_message)
-                    script_path = os.path.join(output_dir, script_name+'.py')
-                    if os.path.exists(script_path):
-                        GENERATE_SCRIPT_MESSAGE += "\nThe generated script has been saved to the path:{0}"\
-                            .format(script_path)
-                    else:
-                        msg = "\n" + script_path + ". Cannot be generated."
+                    msg = "\n" + script_path + ". Cannot be generated."
+                    with module_diagnostics:
                         base_util.error_write(msg)
+                    if build_manifest is not None:
+                        build_manifest.discard(task)
+            except Exception:
+                with module_diagnostics:
+                    base_util.error_write("\n" + script_path + ". Cannot be recorded: " + traceback.format_exc())
     except Exception as error:
         logging.error("generate_netconf_script failed: %s",
                       traceback.format_exc())
     finally:
-        return completed_progress
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return completed_progress
+
+
+def get_output_dir(options):
+    """Get the output dir, the ansible module path is used if -o is not designated.
+    Args:
+        options: The instance record user input.
+    Returns:
+        output_dir: Script output path.
+    """
+    output_dir = options.output_dir
+    if output_dir is None:
+        output_dir = get_ansible_path()[0]
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    return output_dir
+
+
+def format_size(size):
+    return "unknown" if size is None else "{0:.1f}MB".format(size / 1024.0 / 1024.0)
+
+
+def generate_partitions(options, context, tasks, partitions, completed_progress, average_remaining_progress,
+                        build_manifest=None, stage=None, script_budget=None, module_cache=None, context_cache=None):
+    """Generate the scripts group by group, each group with a context parsing only the yang files it needs.
+    Args:
+        options: The instance record user input.
+        context: The GenerationContext of the run, the messages of groups are added to it.
+        tasks: The tasks returned by get_script_tasks().
+        partitions: The list of partition.Partition of the outdated tasks.
+        completed_progress: Record the completed progress.
+        average_remaining_progress: Add progress.
+        build_manifest: The Manifest instance, None if incremental build is disabled.
+        stage: The OutputStage the scripts are generated into.
+        script_budget: The budget.Budget of each script, None if unlimited.
+        module_cache: The ModuleCache of a batch run, None if the yang files are not shared with other projects.
+        context_cache: The ContextCache of --cache-dir, None if the yang files are not cached.
+    Returns:
+        completed_progress: Record the completed progress.
+    """
+    plan_tasks = dict((task.plan, task) for task in tasks)
+    grouped_plans = set()
+    for index, group in enumerate(partitions):
+        partition.reset_peak_rss()
+        group_context = get_parser.get_generation_context(options.yang_dir, None, group.namespaces,
+                                                          module_cache, context_cache, options.jobs)
+        group_tasks = [plan_tasks[plan] for plan in group.plans]
+        completed_progress = generate_netconf_script(group_context, group_tasks, completed_progress,
+                                                     average_remaining_progress, options.jobs, build_manifest,
+                                                     stage, script_budget)
+        context.messages.extend(group_context.messages)
+        group_context = None
+        gc.collect()
+        message = "Partition {0}/{1}: {2} modules, {3} yang modules of {4}, peak RSS {5}.".format(
+            index + 1, len(partitions), len(group.plans), len(group.yang_modules), format_size(group.size),
+            format_size(partition.get_peak_rss()))
+        logging.info(message)
+        context.add_message(message)
+        grouped_plans.update(group.plans)
+    # the up to date scripts are only reported.
+    return generate_netconf_script(context, [task for task in tasks if task.plan not in grouped_plans],
+                                   completed_progress, average_remaining_progress, options.jobs, build_manifest,
+                                   stage, script_budget)
+
+
+def run_generation(options, work_plan, output_dir, build_manifest=None, context=None, module_cache=None):
+    """Generate the scripts of work plan.
+    Args:
+        options: The instance record user input.
+        work_plan: The WorkPlan of command line -r.
+        output_dir: Script output path.
+        build_manifest: The Manifest instance, None if incremental build is disabled.
+        context: A GenerationContext with yang files loaded, which is reused instead of parsing the yang files.
+        module_cache: The ModuleCache of a batch run, the yang modules parsed by previous projects with the same
+                      content are reused.
+    Returns:
+        context: The GenerationContext of this run, recording the messages.
+    """
+    xml_num = len(work_plan)
+    tasks = get_script_tasks(work_plan, output_dir, options.script_dir)
+    # shards may share the output directory, so it is only cleaned by a full run.
+    clean_dirs = work_plan.sub_dirs if build_manifest is None and options.shard is None else []
+    if build_manifest is not None:
+        build_manifest.remove_stale(tasks, lambda full_xml: work_plan.in_shard(full_xml, options.shard))
+    # only the yang modules used by outdated scripts need to be parsed.
+    outdated_tasks = get_outdated_tasks(tasks, build_manifest)
+    features = work_plan.get_namespaces([task.plan for task in outdated_tasks])
+    context_cache = ContextCache(options.cache_dir, __version__) if options.cache_dir else None
+    partitions = None
+    if context is not None:
+        context = context.fork()
+    elif features and options.schema_snapshot:
+        context = GenerationContext(options.yang_dir, features,
+                                    schema_snapshot.load_schema_snapshot(options.schema_snapshot))
+    elif features and options.partition is not None:
+        partitions = partition.get_partitions([task.plan for task in outdated_tasks], options.yang_dir,
+                                              int(options.partition * 1024 * 1024), options.cache_dir)
+        context = GenerationContext(options.yang_dir, features)
+    elif features:
+        context = get_parser.get_generation_context(options.yang_dir, options.xml_dir, features, module_cache,
+                                                    context_cache, options.jobs)
+    else:
+        context = GenerationContext(options.yang_dir, features)
+    # progress_bar
+    completed_progress = 50
+    process_message = " Yang Parser Completed."
+    base_util.print_progress_bar(completed_progress, process_message)
+    average_remaining_progress = int(math.floor((99 - completed_progress) / xml_num))
+    if average_remaining_progress == 0:
+        average_remaining_progress = 1
+    stage = output_stage.OutputStage(output_dir)
+    try:
+        script_budget = None
+        if options.timeout is not None or options.memory_limit is not None:
+            script_budget = budget.Budget(options.timeout, options.memory_limit)
+        if partitions is not None:
+            generate_partitions(options, context, tasks, partitions, completed_progress, average_remaining_progress,
+                                build_manifest, stage, script_budget, module_cache, context_cache)
+        else:
+            generate_netconf_script(context, tasks, completed_progress, average_remaining_progress, options.jobs,
+                                    build_manifest, stage, script_budget)
+        report = stage.commit(tasks, clean_dirs, set(tasks) - set(outdated_tasks))
+    finally:
+        stage.discard()
+    for line in report.get_message():
+        context.add_message(line)
+    if context_cache is not None and context_cache.hits + context_cache.misses:
+        logging.info(context_cache.get_message())
+        context.add_message(context_cache.get_message())
+    # the scripts generated by the pool workers are counted in their own processes, see generate_script().
+    info_cache = getattr(context.yang_handler, "info_cache", None)
+    if info_cache is not None and info_cache.hits + info_cache.misses:
+        logging.info(info_cache.get_message())
+        context.add_message(info_cache.get_message())
+    if build_manifest is not None:
+        build_manifest.save()
+    logging.info(
+        "==============================FINISH SCRIPT GENERATION==============================")
+    process_message = " Finish Script Generation."
+    base_util.print_progress_bar(100, process_message)
+    sys.stdout.write(context.get_message()+'\n')
+    sys.stdout.flush()
+    return context
+
+
+def watch_and_generate(options):
+    """Keep the yang files loaded, poll -y, -r and -p, and regenerate the scripts whose inputs changed.
+    The yang files are parsed again only when they changed or a xml needs a namespace not loaded yet.
+    Args:
+        options: The instance record user input.
+    Raises:
+        KeyboardInterrupt: Stop watching by keyboard:[ Ctrl + c ].
+    """
+    output_dir = get_output_dir(options)
+    watch_dirs = [options.yang_dir, options.xml_dir]
+    if options.script_dir:
+        watch_dirs.append(options.script_dir)
+    snapshots = None
+    yang_snapshot = None
+    loaded_namespaces = set()
+    context = None
+    context_cache = ContextCache(options.cache_dir, __version__) if options.cache_dir else None
+    while True:
+        current_snapshots = [base_util.get_dir_snapshot(directory) for directory in watch_dirs]
+        if current_snapshots != snapshots:
+            snapshots = current_snapshots
+            with base_util.Diagnostics() as diagnostics:
+                try:
+                    work_plan = build_work_plan(options.xml_dir)
+                    namespaces = work_plan.get_namespaces()
+                    if namespaces and (snapshots[0] != yang_snapshot or not namespaces <= loaded_namespaces):
+                        yang_snapshot = None
+                        context = get_parser.get_generation_context(options.yang_dir, options.xml_dir,
+                                                                    namespaces, context_cache=context_cache,
+                                                                    jobs=options.jobs)
+                        yang_snapshot = snapshots[0]
+                        loaded_namespaces = namespaces
+                    if len(work_plan):
+                        run_generation(options, work_plan, output_dir,
+                                       manifest.Manifest(output_dir, __version__, options.yang_dir),
+                                       context)
+                except Exception:
+                    logging.error("ANSIBLE GEN ERROR !")
+                    sys.stderr.write("[0x000000]Ansible Gen ERROR \n!")
+                    traceback.print_exc()
+                    logging.error(traceback.format_exc())
+            base_util.log_suppressed(diagnostics)
+            report_error(diagnostics)
+            sys.stdout.write("Watching %s for changes, press Ctrl+C to stop.\n" % ", ".join(watch_dirs))
+            sys.stdout.flush()
+        time.sleep(options.watch_interval)
+
+
+def read_batch_projects(cfg_file):
+    """Read the projects of [batch] section, each line is "name = yang_dir xml_dir output_dir [script_dir]".
+    Args:
+        cfg_file: The path of config file.
+    Returns:
+        cfg_info: The ConfigParser of cfg_file.
+        projects: A list of (name, yang_dir, xml_dir, output_dir, script_dir) in the order of config file.
+        errors: A list of the invalid lines.
+    """
+    cfg_info = configparser.ConfigParser()
+    cfg_info.read(cfg_file)
+    projects = []
+    errors = []
+    if not cfg_info.has_section("batch"):
+        errors.append("%s has no [batch] section" % cfg_file)
+        return cfg_info, projects, errors
+    for name, value in cfg_info.items("batch"):
+        dirs = value.split()
+        if len(dirs) not in (3, 4):
+            errors.append("%s in [batch] should be: yang_dir xml_dir output_dir [script_dir]" % name)
+            continue
+        yang_dir, xml_dir, output_dir = dirs[:3]
+        script_dir = dirs[3] if len(dirs) == 4 else ''
+        for dir_name, directory in [("yang_dir", yang_dir), ("xml_dir", xml_dir), ("script_dir", script_dir)]:
+            if directory and not os.path.isdir(directory):
+                errors.append("%s in [batch]: %s %s doesn't exists" % (name, dir_name, directory))
+                break
+        else:
+            projects.append((name, yang_dir, xml_dir, output_dir, script_dir))
+    return cfg_info, projects, errors
+
+
+def generate_batch(argv):
+    """Main function of batch command, generate the projects of [batch] section in one process.
+    A yang module is parsed once for all projects whose yang file of it and the files it depends on have the same
+    content, only the differing yang modules are parsed again.
+    Args:
+        argv: The arguments after "batch".
+    """
+    parser = OptionParser(usage="%prog batch [options] [CFG_FILE]",
+                          description="Generate the projects listed in the [batch] section of CFG_FILE, default "
+                                      "is %s, sharing the parsed yang modules of the same content."
+                                      % DEFAULT_CFG_FILE)
+    parser.add_option("-l", "--log", dest="log_dir", default=None,
+                      help="the log directory, name of log is %s" % SCRIPT_GEN_LOG_FILE)
+    parser.add_option("-j", "--jobs", dest="jobs", default=1, type="int",
+                      help="the number of processes used to parse yang files and generate ansible modules of each "
+                           "project, default is 1.")
+    parser.add_option("--incremental", dest="incremental", default=False, action='store_true',
+                      help="only generate the ansible modules whose inputs changed since last run of each project.")
+    parser.add_option("--report", dest="report", default=None,
+                      help="write the errors and warnings of each module of all projects into this json file.")
+    parser.add_option("--cache-dir", dest="cache_dir", default=None,
+                      help="save the parsed yang files of each project into this directory, a later run parsing the "
+                           "same yang files loads them instead of parsing them again. The entries are pickles, which "
+                           "are only loaded when the directory and the entry are owned by the current user and not "
+                           "writable by others.")
+    (options, args) = parser.parse_args(argv)
+    cfg_file = args[0] if args else DEFAULT_CFG_FILE
+    if not os.path.isfile(cfg_file):
+        parser.error("config file %s doesn't exists" % cfg_file)
+    if options.jobs < 1:
+        parser.error("the number of jobs %s should be greater than 0" % options.jobs)
+    cfg_info, projects, errors = read_batch_projects(cfg_file)
+
+    if options.log_dir is None:
+        options.log_dir = os.path.join(os.getcwd(), 'logs')
+    if not os.path.exists(options.log_dir):
+        os.makedirs(options.log_dir)
+    log_file_name = os.path.join(options.log_dir, SCRIPT_GEN_LOG_FILE)
+    if os.path.isfile(log_file_name):
+        os.remove(log_file_name)
+    log_level = DEFAULT_LOG_LEVEL
+    if cfg_info.has_option("defaults", "log_level"):
+        log_level = cfg_info.get("defaults", "log_level")
+    base_util.start_logging(log_file_name, log_level.upper())
+
+    module_cache = ModuleCache()
+    diagnostics = base_util.Diagnostics()
+    diagnostics.errors.extend(errors)
+    try:
+        for name, yang_dir, xml_dir, output_dir, script_dir in projects:
+            logging.info("==============================START PROJECT %s==============================", name)
+            sys.stdout.write("Project %s:\n" % name)
+            sys.stdout.flush()
+            project_options = Values({"yang_dir": yang_dir, "xml_dir": xml_dir, "script_dir": script_dir,
+                                      "output_dir": output_dir, "log_dir": options.log_dir,
+                                      "jobs": options.jobs, "incremental": options.incremental, "watch": False,
+                                      "shard": None, "partition": None, "timeout": None, "memory_limit": None,
+                                      "cache_dir": options.cache_dir, "schema_snapshot": None})
+            with diagnostics:
+                try:
+                    work_plan = build_work_plan(xml_dir)
+                    if not len(work_plan):
+                        continue
+                    output_dir = get_output_dir(project_options)
+                    build_manifest = None
+                    if options.incremental:
+                        build_manifest = manifest.Manifest(output_dir, __version__, project_options.yang_dir)
+                    module_cache.reused = 0
+                    run_generation(project_options, work_plan, output_dir, build_manifest,
+                                   module_cache=module_cache)
+                    sys.stdout.write("Project %s: %d yang modules are reused from previous projects.\n"
+                                     % (name, module_cache.reused))
+                except Exception:
+                    # the other projects go on, error_write logs the traceback.
+                    traceback.print_exc()
+                    base_util.error_write("project %s failed: %s" % (name, sys.exc_info()[1]))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        base_util.log_suppressed(diagnostics)
+        base_util.stop_logging()
+        if options.report:
+            write_report(options.report, diagnostics)
+        sys.exit(report_error(diagnostics))
+
+
+def plan_changes(argv):
+    """Main function of plan command, print the module directories to regenerate for the changed files.
+    Only the xml namespaces and the headers of yang files are read, the yang files are not parsed.
+    Args:
+        argv: The arguments after "plan".
+    """
+    parser = OptionParser(usage="%prog plan -y YANG_DIR -r XML_DIR [-p SCRIPT_DIR] [--cache-dir DIR] "
+                                "--changed FILE ... [FILE ...]",
+                          description="Print the module directories whose ansible modules may change with the "
+                                      "changed files, one per line. \"-\" reads the changed files from stdin, "
+                                      "e.g. the output of git diff --name-only.")
+    parser.add_option("-y", "--yang_dir", dest="yang_dir", default='',
+                      help="the directory of yang_files.")
+    parser.add_option("-r", "--resource", dest="xml_dir", default='',
+                      help="the directory of ansible api description xml files.")
+    parser.add_option("-p", "--script", dest="script_dir", default='',
+                      help="the directory of previous generated ansible module which may has user define"
+                           " check implementation.")
+    parser.add_option("--changed", dest="changed", default=[], action="append",
+                      help="a changed, added or removed file, may be designated several times.")
+    parser.add_option("--cache-dir", dest="cache_dir", default=None,
+                      help="the --cache-dir of the generation, the modules the changed yang files augmented or "
+                           "deviated when the ansible modules were generated are read from it, otherwise the "
+                           "modules they import are affected.")
+    (options, args) = parser.parse_args(argv)
+    for name in ["yang_dir", "xml_dir"]:
+        if not os.path.isdir(getattr(options, name)):
+            parser.error("%s %s doesn't exists or not designated" % (name, getattr(options, name)))
+    changed_files = []
+    for changed_file in options.changed + args:
+        if changed_file == "-":
+            changed_files.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            changed_files.append(changed_file)
+
+    work_plan = build_work_plan(options.xml_dir)
+    if os.path.abspath(manifest.TEMPLATE_FILE) in set(os.path.abspath(path) for path in changed_files):
+        affected, unmatched = list(work_plan), []
+    else:
+        affected, unmatched = impact.get_affected_plans(work_plan, options.yang_dir, changed_files,
+                                                        options.script_dir, options.cache_dir)
+    for changed_file in unmatched:
+        sys.stderr.write("%s affects no module\n" % changed_file)
+    for module_dir in OrderedDict.fromkeys(plan.module_dir for plan in affected):
+        sys.stdout.write(module_dir + "\n")
+    sys.stdout.flush()
+
+
+def dump_schema(argv):
+    """Main function of schema-dump command, write the schema nodes of the validated yang files into a snapshot,
+    which the scripts are generated from by --schema-snapshot without the yang files and pyang.
+    Args:
+        argv: The arguments after "schema-dump".
+    """
+    parser = OptionParser(usage="%prog schema-dump -y YANG_DIR [-r XML_DIR] -o SNAPSHOT_FILE",
+                          description="Parse and validate the yang files, and write every schema node with the "
+                                      "information the ansible modules are generated from into SNAPSHOT_FILE, "
+                                      "one json object per line.")
+    parser.add_option("-y", "--yang_dir", dest="yang_dir", default='',
+                      help="the directory of yang_files.")
+    parser.add_option("-r", "--resource", dest="xml_dir", default=None,
+                      help="only dump the yang modules of the namespaces used by the xml files of this directory, "
+                           "all yang modules by default.")
+    parser.add_option("-o", "--output", dest="snapshot_file", default=None,
+                      help="the snapshot file written.")
+    parser.add_option("-l", "--log", dest="log_dir", default=None,
+                      help="the log directory, name of log is %s" % SCRIPT_GEN_LOG_FILE)
+    parser.add_option("-j", "--jobs", dest="jobs", default=1, type="int",
+                      help="the number of processes used to parse yang files, default is 1.")
+    parser.add_option("--cache-dir", dest="cache_dir", default=None,
+                      help="load the parsed yang files from this directory if they did not change and it is "
+                           "trusted, see the --cache-dir of generation.")
+    (options, args) = parser.parse_args(argv)
+    if not os.path.isdir(options.yang_dir):
+        parser.error("yang_dir %s doesn't exists or not designated" % options.yang_dir)
+    if options.xml_dir is not None and not os.path.isdir(options.xml_dir):
+        parser.error("xml_dir %s doesn't exists" % options.xml_dir)
+    if not options.snapshot_file:
+        parser.error("the snapshot file is not designated")
+    if options.jobs < 1:
+        parser.error("the number of jobs %s should be greater than 0" % options.jobs)
+
+    if options.log_dir is None:
+        options.log_dir = os.path.join(os.getcwd(), 'logs')
+    if not os.path.exists(options.log_dir):
+        os.makedirs(options.log_dir)
+    base_util.start_logging(os.path.join(options.log_dir, SCRIPT_GEN_LOG_FILE), DEFAULT_LOG_LEVEL)
+    try:
+        context_cache = ContextCache(options.cache_dir, __version__) if options.cache_dir else None
+        context = get_parser.get_generation_context(options.yang_dir, options.xml_dir,
+                                                    context_cache=context_cache, jobs=options.jobs)
+        count = schema_snapshot.dump_schema(context.yang_handler, options.snapshot_file)
+        sys.stdout.write("\n%d schema nodes of %d yang modules are written into %s\n" % (
+            count, len(context.ctx.modules), options.snapshot_file))
+        sys.stdout.flush()
+    finally:
+        base_util.stop_logging()
+
+
+def serve_generation(argv):
+    """Main function of serve command, the server is imported only by this command.
+    Args:
+        argv: The arguments after "serve".
+    """
+    serve.main(argv)
+
+
+# sub commands dispatched by the first argument, e.g. "ansible-gen serve -y yang_dir".
+SUB_COMMANDS = {"serve": serve_generation, "merge": merge_shards, "batch": generate_batch, "plan": plan_changes,
+                "schema-dump": dump_schema}
 
 
 def main():
@@ -285,39 +1013,29 @@ def main():
     Raises:
         KeyboardInterrupt: Exit progress by keyboard:[ Ctrl + c ].
     """
+    if sys.argv[1:2] and sys.argv[1] in SUB_COMMANDS:
+        SUB_COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
     options = None
+    context = None
+    diagnostics = base_util.Diagnostics()
     try:
         options = env_parse()
 
         # Automatically deploy
         # if get_ansible_path():
         #     deploy(get_ansible_path()[1])
-        xml_num = get_number_of_para_xml(options.xml_dir)
-        if xml_num:
-            get_parser.get_yang_handlers(options.yang_dir, options.xml_dir)
-            # progress_bar
-            completed_progress = 50
-            process_message = " Yang Parser Completed."
-            base_util.print_progress_bar(completed_progress, process_message)
-            average_remaining_progress = int(math.floor((99 - completed_progress) / xml_num))
-            if average_remaining_progress == 0:
-                average_remaining_progress = 1
-            output_dir = options.output_dir
-            if output_dir is None:
-                output_dir = get_ansible_path()[0]
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            if options.script_dir:
-                global SCRIPT_DIR_GLOBAL
-                SCRIPT_DIR_GLOBAL = options.script_dir
-            generate_netconf_script(options.xml_dir, output_dir, options.script_dir, True, completed_progress,
-                                    average_remaining_progress)
-            logging.info(
-                "==============================FINISH SCRIPT GENERATION==============================")
-            process_message = " Finish Script Generation."
-            base_util.print_progress_bar(100, process_message)
-            sys.stdout.write(GENERATE_SCRIPT_MESSAGE+'\n')
-            sys.stdout.flush()
+        if options.watch:
+            watch_and_generate(options)
+        with diagnostics:
+            work_plan = build_work_plan(options.xml_dir).select_shard(options.shard)
+            if len(work_plan):
+                output_dir = get_output_dir(options)
+                build_manifest = None
+                if options.incremental:
+                    build_manifest = manifest.Manifest(
+                        output_dir, __version__, None if options.schema_snapshot else options.yang_dir)
+                context = run_generation(options, work_plan, output_dir, build_manifest)
 
     except KeyboardInterrupt:
         pass
@@ -328,9 +1046,14 @@ def main():
         logging.error(traceback.format_exc())
         sys.exit(1)
     finally:
-        if options is not None:
-            parse_error_and_exit(os.path.join(
-                options.log_dir, SCRIPT_GEN_LOG_FILE))
+        # every change has been reported while watching.
+        if options is not None and not options.watch:
+            base_util.log_suppressed(diagnostics)
+            base_util.stop_logging()
+            write_summary(options, diagnostics, context)
+            if options.report:
+                write_report(options.report, diagnostics)
+            sys.exit(report_error(diagnostics))
 
 
 if __name__ == "__main__":
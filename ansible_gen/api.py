@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""api.py docstrings.
+This module generates ansible modules in process and returns them in memory, for example:
+
+    import ansible_gen
+    context = ansible_gen.load_context("yang", "resource")
+    for result in ansible_gen.generate("yang", "resource", context=context):
+        print(result.script_name, result.content is not None)
+
+The generations share nothing but the loaded context, so they can run concurrently in threads of one process.
+"""
+
+import os
+import logging
+import traceback
+from collections import namedtuple
+from .adapter import get_argument_spec_documentation as get_parser
+from .adapter.work_plan import build_work_plan, ScriptTask
+from .generator import var, ansible_auto_scripts as script_gen
+from .generator.output_stage import OutputStage
+
+
+class GenerationResult(namedtuple("GenerationResult", ["script_name", "full_xml", "script_path", "content"])):
+    """
+    The result of one "xxx_full.xml".
+        script_name: The name of script.
+        full_xml: The path of full-xml.
+        script_path: The path the script is written to, None if output_dir is not designated.
+        content: The content of script, None if it can not be generated, see the log for the reason.
+    """
+    __slots__ = ()
+
+
+def load_context(yang_dir, xml_dir=None, features=None):
+    """Parse the yang files once, the context can be passed to generate() many times.
+    Args:
+        yang_dir: The directory of yang files.
+        xml_dir: Only the yang modules used by the xml files under it are parsed if designated.
+        features: The xmlns which need to be parsed, all modules are parsed if both xml_dir and features are None.
+    Returns:
+        A GenerationContext.
+    """
+    return get_parser.get_generation_context(yang_dir, xml_dir, features)
+
+
+def get_tasks(work_plan, output_dir, script_dir):
+    """Map the modules of work plan to their output directory, the same layout as the command line.
+    Args:
+        work_plan: The WorkPlan of xml_dir.
+        output_dir: Script output path, may be None.
+        script_dir: The directory of previous generated scripts, may be None.
+    Returns:
+        A list of ScriptTask.
+    """
+    tasks = []
+    for module_plan in work_plan:
+        task_output_dir = output_dir
+        task_script_dir = script_dir
+        if module_plan.sub_dir is not None:
+            if output_dir is not None:
+                task_output_dir = os.path.join(output_dir, module_plan.sub_dir)
+            if script_dir:
+                task_script_dir = os.path.join(script_dir, module_plan.sub_dir)
+        tasks.append(ScriptTask(module_plan, task_output_dir, task_script_dir))
+    return tasks
+
+
+def generate(yang_dir, xml_dir, output_dir=None, script_dir=None, context=None):
+    """Generate the ansible modules of xml_dir.
+    Args:
+        yang_dir: The directory of yang files.
+        xml_dir: The directory of ansible api description xml files.
+        output_dir: The scripts are also written into it if designated, a script is only replaced when its content
+                    changed.
+        script_dir: The directory of previous generated scripts which may have user define check implementation.
+        context: A GenerationContext returned by load_context(), the yang files are parsed for this call if None.
+    Returns:
+        A list of GenerationResult, in the order of path of full-xml.
+    """
+    work_plan = build_work_plan(xml_dir)
+    if context is None:
+        context = get_parser.get_generation_context(yang_dir, xml_dir, work_plan.get_namespaces())
+    else:
+        context = context.fork()
+
+    results = []
+    tasks = get_tasks(work_plan, output_dir, script_dir)
+    stage = None
+    if output_dir is not None:
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+        stage = OutputStage(output_dir)
+    try:
+        for task in tasks:
+            module_plan = task.plan
+            content = None
+            try:
+                kwargs = var.get_params(context, module_plan.full_xml, module_plan.script_name, task.output_dir,
+                                        task.script_dir, module_plan.example_xmls)
+                if kwargs:
+                    operation = script_gen.Operation(**kwargs)
+                    data = operation.render()
+                    content = data + '\n'
+                    if stage is not None:
+                        operation.output_file_path = stage.stage_task(task).output_dir
+                        operation.gen_script(data)
+            except Exception:
+                logging.error("generate %s failed: %s", module_plan.full_xml, traceback.format_exc())
+            results.append(GenerationResult(module_plan.script_name, module_plan.full_xml,
+                                            task.script_path if stage is not None else None, content))
+        if stage is not None:
+            stage.commit(tasks)
+    finally:
+        if stage is not None:
+            stage.discard()
+    return results
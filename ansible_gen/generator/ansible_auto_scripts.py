@@ -29,9 +29,11 @@ class Operation():
         self.module = kwargs.get("module", None)
         self.user_check_stmts = kwargs.get("user_check_stmts", None)
 
-    def gen_script(self):
-        file_name = str(self.filename) + '.py'
-        result = os.path.join(self.output_file_path, file_name)
+    def render(self):
+        """Render the script from template.
+        Returns:
+            The content of script.
+        """
         env = Environment(loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), 'templates'), 'utf-8'),
                           auto_reload=True)
         template = env.get_template('module.html')
@@ -51,7 +53,13 @@ class Operation():
                      xml_tail=self.xml_tail,
                      filename=self.filename,
                      )
-        data = template.render(**kwarg)
+        return template.render(**kwarg)
+
+    def gen_script(self, data=None):
+        file_name = str(self.filename) + '.py'
+        result = os.path.join(self.output_file_path, file_name)
+        if data is None:
+            data = self.render()
 
         # Automatically generate ansible script file
         try:
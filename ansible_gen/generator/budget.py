@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""budget.py docstrings.
+This module generates each script in its own forked process under a time and memory budget, so a pathological
+xml file is killed without stopping the other scripts of the run.
+"""
+
+import gc
+import os
+import time
+import logging
+import multiprocessing
+from collections import namedtuple, deque
+from multiprocessing.connection import wait
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from ..adapter.utils import base_util
+
+# the seconds a terminated worker is given to exit before it is killed.
+KILL_GRACE_TIME = 1.0
+
+
+class Budget(namedtuple("Budget", ["timeout", "memory_limit"])):
+    """
+    The resources one script may use.
+        timeout: The seconds a worker may run, None if unlimited.
+        memory_limit: The megabytes a worker may allocate besides what it inherits from the parent process, for
+                      all the scripts it generates, None if unlimited.
+    """
+    __slots__ = ()
+
+
+def get_address_space_size():
+    """Get the virtual memory size of current process in bytes, 0 if it is unknown."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError):
+        return 0
+
+
+def limit_memory(memory_limit):
+    """Limit the address space of current process to the memory_limit megabytes more than it is now, which is called
+    once when the worker starts. The limit is of the worker, not of each task: the memory an earlier task of a reused
+    worker kept counts against the later ones."""
+    if memory_limit is None or resource is None:
+        return
+    limit = get_address_space_size() + memory_limit * 1024 * 1024
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+    if hard_limit != resource.RLIM_INFINITY:
+        limit = min(limit, hard_limit)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard_limit))
+
+
+def run_worker(function, context, memory_limit, connection):
+    """The entry of worker process, send the result of function(task, context) of each received task back."""
+    base_util.restart_logging()
+    # the baseline is what the worker inherits from the parent process, not what the previous tasks left.
+    limit_memory(memory_limit)
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        result = function(task, context)
+        base_util.flush_logging()
+        connection.send(result)
+    connection.close()
+
+
+def is_supported():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+class BudgetWorker(object):
+    """
+    A worker process generating the tasks sent to it one by one, it is replaced once it is killed.
+    """
+
+    def __init__(self, mp_context, function, context, memory_limit):
+        self.connection, worker_connection = mp_context.Pipe()
+        self.process = mp_context.Process(target=run_worker,
+                                          args=(function, context, memory_limit, worker_connection))
+        self.process.start()
+        worker_connection.close()
+        self.index = None
+        self.task = None
+        self.start_time = None
+
+    def send(self, index, task):
+        self.index = index
+        self.task = task
+        self.start_time = time.time()
+        self.connection.send(task)
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except (IOError, OSError):
+            pass
+        self.connection.close()
+        self.process.join(KILL_GRACE_TIME)
+        if self.process.is_alive():
+            stop_process(self.process)
+
+    def kill(self):
+        self.connection.close()
+        stop_process(self.process)
+
+
+def run_in_budget(function, context, tasks, jobs, budget):
+    """Run function(task, context) for each task in forked worker processes, a worker going over the budget is
+    killed and replaced, the other workers go on.
+    Args:
+        function: The function generating one script, its result is sent back to the parent process.
+        context: The GenerationContext inherited by the workers without pickling.
+        tasks: The list of tasks.
+        jobs: The number of worker processes.
+        budget: The Budget of each task.
+    Returns:
+        A generator of (result, error) in the order of tasks, result is None if the worker was killed or died,
+        and error tells why.
+    """
+    if hasattr(gc, "freeze"):
+        # keep the garbage collector of workers off the inherited objects, which copies their pages.
+        gc.freeze()
+    mp_context = multiprocessing.get_context("fork")
+    pending = deque(enumerate(tasks))
+    idle_workers = []
+    busy_workers = dict()
+    results = dict()
+    next_index = 0
+    try:
+        while next_index < len(tasks):
+            while pending and len(busy_workers) < max(jobs, 1):
+                worker = idle_workers.pop() if idle_workers else BudgetWorker(mp_context, function, context,
+                                                                               budget.memory_limit)
+                worker.send(*pending.popleft())
+                busy_workers[worker.connection] = worker
+
+            wait_time = None
+            if budget.timeout is not None:
+                deadline = min(worker.start_time for worker in busy_workers.values()) + budget.timeout
+                wait_time = max(deadline - time.time(), 0)
+            for connection in wait(list(busy_workers), wait_time):
+                worker = busy_workers.pop(connection)
+                try:
+                    results[worker.index] = (connection.recv(), None)
+                    idle_workers.append(worker)
+                except EOFError:
+                    worker.kill()
+                    results[worker.index] = (None, "%s: the worker generating it exited with code %s." % (
+                        worker.task.plan.full_xml, worker.process.exitcode))
+
+            now = time.time()
+            for connection, worker in list(busy_workers.items()):
+                if budget.timeout is not None and now - worker.start_time >= budget.timeout:
+                    del busy_workers[connection]
+                    worker.kill()
+                    results[worker.index] = (None, "%s: generating it took more than %s seconds, the worker was "
+                                                   "killed." % (worker.task.plan.full_xml, budget.timeout))
+
+            while next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+    finally:
+        for worker in idle_workers:
+            worker.stop()
+        for worker in busy_workers.values():
+            worker.kill()
+        if hasattr(gc, "unfreeze"):
+            gc.unfreeze()
+
+
+def stop_process(process):
+    process.terminate()
+    process.join(KILL_GRACE_TIME)
+    if process.is_alive():
+        logging.warning("worker %s did not exit after terminated, kill it", process.pid)
+        process.kill()
+        process.join()
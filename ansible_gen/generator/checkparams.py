@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 import re
 import logging
+from bisect import bisect_right
 
 
 def check_params(leaf_info, params, module):
@@ -11,10 +12,26 @@ def check_params(leaf_info, params, module):
     return
 
 
+def in_bounds(bounds, value):
+    """
+    Check whether value is in the intervals of bounds
+    :param bounds: (low1, high1, low2, high2, ...) of the range or length, sorted and not overlapping
+    :param value:
+    :return: bool
+    """
+    idx = bisect_right(bounds, value)
+    return idx % 2 == 1 or (idx > 0 and bounds[idx - 1] == value)
+
+
+def format_bounds(bounds):
+    """Format bounds as the range or length statement of yang, e.g. 1..10 | 20..30"""
+    return ' | '.join('%s..%s' % (bounds[idx], bounds[idx + 1]) for idx in range(0, len(bounds), 2))
+
+
 def check_int(v_range, params, module):
     '''
     Check int type
-    :param range:
+    :param v_range: the bounds of range
     :param params:
     :param module:
     :return:
@@ -23,16 +40,15 @@ def check_int(v_range, params, module):
         params = params["value"]
     if not params:
         return
-    for long in v_range:
-        if int(params) < int(long[0]) or int(params) > int(long[1]):
-            logging.error('Error: %s not in the range from %s to %s.' % (params, long[0], long[1]))
-            module.fail_json(msg='Error: %s not in the range from %s to %s.' % (params, long[0], long[1]))
+    if not in_bounds(v_range, int(params)):
+        logging.error('Error: %s not in the range %s.' % (params, format_bounds(v_range)))
+        module.fail_json(msg='Error: %s not in the range %s.' % (params, format_bounds(v_range)))
 
 
 def check_string(length, pattern, params, module):
     '''
     Check string type
-    :param length:
+    :param length: the bounds of length
     :param pattern:
     :param params:
     :param module:
@@ -42,11 +58,9 @@ def check_string(length, pattern, params, module):
         params = params["value"]
     if not params:
         return
-    for long_str in length:
-        if len(params) > long_str[1] or len(params.replace(' ', '')) < long_str[0]:
-            logging.error('Error:%s is not in the range from %d to %d.' % (params, long_str[0], long_str[1]))
-            module.fail_json(
-                msg='Error:%s is not in the range from %d to %d.' % (params, long_str[0], long_str[1]))
+    if not in_bounds(length, len(params)):
+        logging.error('Error:%s is not in the length %s.' % (params, format_bounds(length)))
+        module.fail_json(msg='Error:%s is not in the length %s.' % (params, format_bounds(length)))
     if pattern:
         for sub_re in pattern:
             if not re.match(sub_re, params):
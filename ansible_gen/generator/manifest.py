@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""manifest.py docstrings.
+This module records the inputs of every generated ansible module, so that unchanged modules are not regenerated.
+
+The yang files of a module are the closure the context loads for its xmlns, see yang_header.get_load_closure(). The
+digest of the yang headers is recorded with them, when it changes the closure is computed again, so a yang file
+added into the closure, e.g. one deviating a node of the module, makes the module outdated.
+"""
+
+import os
+import json
+import logging
+import hashlib
+
+from ..adapter.utils.yang_parse.yang_header import get_dependency_files, get_headers_digest
+from ..adapter.utils.yang_parse.namespace_index import get_namespace_index
+
+MANIFEST_FILE = ".ansible-gen-manifest.json"
+TEMPLATE_FILE = os.path.join(os.path.dirname(__file__), "templates", "module.html")
+
+
+def get_file_hash(file_path):
+    """Get the sha256 of file content.
+    Args:
+        file_path: The path of file.
+    Returns:
+        The hex digest, None if the file does not exist.
+    """
+    if not file_path or not os.path.isfile(file_path):
+        return None
+    sha256_obj = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            sha256_obj.update(block)
+    return sha256_obj.hexdigest()
+
+
+def get_module_inputs(task):
+    """Get the input files of a module except the yang files.
+    Args:
+        task: A ScriptTask of the work plan.
+    Returns:
+        A sorted list of paths: the full xml, the example xmls and the UserCheck script.
+    """
+    inputs = set(os.path.abspath(path) for path in task.plan.example_xmls)
+    inputs.add(os.path.abspath(task.plan.full_xml))
+    if task.script_dir:
+        inputs.add(os.path.abspath(os.path.join(task.script_dir, task.plan.script_name + ".py")))
+    return sorted(inputs)
+
+
+class Manifest(object):
+    """
+    The build manifest saved in the output directory.
+    structure like:
+        {"version": "1.0.0",
+         "template": "<sha256 of module.html>",
+         "modules": {"/abs/path/xxx_full.xml": {"output": "/abs/path/xxx.py",
+                                                "inputs": {"/abs/path/xxx_full.xml": "<sha256>", ...},
+                                                "yang": {"/abs/path/xxx.yang": "<sha256>", ...},
+                                                "headers": "<digest of the yang headers>"}}}
+    The yang_dir is None if the modules are generated from a schema snapshot, whose file is the only yang input.
+    """
+
+    def __init__(self, output_dir, version, yang_dir=None):
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.version = version
+        self.yang_dir = yang_dir
+        self.template_hash = get_file_hash(TEMPLATE_FILE)
+        self.modules = dict()
+        self.hash_cache = dict()
+        # the headers of yang_dir and their digest, read when first needed.
+        self.headers = None
+        self.headers_digest = None
+        # {xmlns of a module: its yang files} computed from self.headers.
+        self.dependency_cache = dict()
+        self.load()
+
+    def load(self):
+        """Load the manifest of previous run, all modules are outdated if the tool or template changed."""
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, 'r') as handle:
+                data = json.load(handle)
+        except (IOError, ValueError) as error:
+            logging.warning("manifest %s can not be loaded, regenerate all modules: %s", self.path, error)
+            return
+        if data.get("version") != self.version or data.get("template") != self.template_hash:
+            logging.info("ansible-gen version or template changed, regenerate all modules")
+            return
+        self.modules = data.get("modules", dict())
+
+    def save(self):
+        """Write the manifest into the output directory."""
+        data = {"version": self.version,
+                "template": self.template_hash,
+                "modules": self.modules}
+        try:
+            with open(self.path, 'w') as handle:
+                json.dump(data, handle, indent=1, sort_keys=True)
+        except IOError as error:
+            logging.error("write manifest %s failed: %s", self.path, error)
+
+    def get_hash(self, file_path):
+        """Get file hash once per run, yang files are shared by many modules."""
+        if file_path not in self.hash_cache:
+            self.hash_cache[file_path] = get_file_hash(file_path)
+        return self.hash_cache[file_path]
+
+    def get_headers_digest(self):
+        """Get the digest of the headers of yang_dir, None if there is no yang_dir."""
+        if self.yang_dir is None:
+            return None
+        if self.headers is None:
+            self.headers, _ = get_namespace_index().scan(self.yang_dir, set())
+            self.headers_digest = get_headers_digest(self.headers)
+        return self.headers_digest
+
+    def get_dependency_files(self, namespaces):
+        """Get the yang files the context loads for namespaces now, see yang_header.get_dependency_files()."""
+        self.get_headers_digest()
+        if namespaces not in self.dependency_cache:
+            self.dependency_cache[namespaces] = get_dependency_files(self.headers, namespaces)
+        return self.dependency_cache[namespaces]
+
+    def get_input_hashes(self, task):
+        return dict((path, self.get_hash(path)) for path in get_module_inputs(task))
+
+    def is_up_to_date(self, task):
+        """Whether the module of task was generated from the same inputs.
+        Args:
+            task: A ScriptTask of the work plan.
+        Returns:
+            A bool.
+        """
+        entry = self.modules.get(os.path.abspath(task.plan.full_xml))
+        if not entry:
+            return False
+        output_path = os.path.abspath(task.script_path)
+        if entry.get("output") != output_path or not os.path.isfile(output_path):
+            return False
+        if entry.get("inputs") != self.get_input_hashes(task):
+            return False
+        for yang_file, yang_hash in entry.get("yang", dict()).items():
+            if self.get_hash(yang_file) != yang_hash:
+                return False
+        # the closure is the same while the headers are.
+        headers_digest = self.get_headers_digest()
+        if headers_digest is not None and entry.get("headers") != headers_digest:
+            if sorted(entry.get("yang", dict())) != self.get_dependency_files(task.plan.namespaces):
+                return False
+        return True
+
+    def record(self, task, yang_files):
+        """Record the inputs of a generated module.
+        Args:
+            task: A ScriptTask of the work plan.
+            yang_files: The yang files the module resolved against.
+        """
+        self.modules[os.path.abspath(task.plan.full_xml)] = {
+            "output": os.path.abspath(task.script_path),
+            "inputs": self.get_input_hashes(task),
+            "yang": dict((yang_file, self.get_hash(yang_file)) for yang_file in yang_files),
+            "headers": self.get_headers_digest()}
+
+    def discard(self, task):
+        """Forget the module of task, it will be generated in next run."""
+        self.modules.pop(os.path.abspath(task.plan.full_xml), None)
+
+    def remove_stale(self, tasks, owned=None):
+        """Remove the modules whose full xml no longer exists.
+        Args:
+            tasks: All tasks of current run.
+            owned: A function tells whether a full xml path belongs to current run, the modules of other shards
+                   are kept. None means all modules belong to current run.
+        """
+        current = set(os.path.abspath(task.plan.full_xml) for task in tasks)
+        current_outputs = set(os.path.abspath(task.script_path) for task in tasks)
+        for full_xml_path in sorted(set(self.modules) - current):
+            if owned is not None and not owned(full_xml_path):
+                continue
+            output_path = self.modules.pop(full_xml_path).get("output")
+            if output_path and output_path not in current_outputs and os.path.isfile(output_path):
+                os.remove(output_path)
+                logging.warning("script %s removed, %s no longer exists", output_path, full_xml_path)
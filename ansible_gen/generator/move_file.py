@@ -2,22 +2,44 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+try:
+    from importlib.util import find_spec
+except ImportError:
+    find_spec = None
 
 DOCUMENTATION = """
 description: get the ansible path.
 """
 
 
+def find_ansible_location():
+    '''
+    find the ansible python module of this interpreter without importing it
+    :return: the directory of ansible package, None if it is not found
+    '''
+    if find_spec is None:
+        return None
+    try:
+        spec = find_spec("ansible")
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return list(spec.submodule_search_locations)[0]
+
+
 def get_ansible_path():
     '''
-    get the ansible path
+    get the ansible path, "ansible --version" is only run when ansible is not installed for this interpreter
     :return:list
     '''
-    res = os.popen('ansible --version').read()
-    try:
-        ansible_path = re.search(r'ansible python module location = (.*)', res).group(1)
-    except Exception:
-        raise Exception('No ansible_path!')
+    ansible_path = find_ansible_location()
+    if ansible_path is None:
+        res = os.popen('ansible --version').read()
+        try:
+            ansible_path = re.search(r'ansible python module location = (.*)', res).group(1)
+        except Exception:
+            raise Exception('No ansible_path!')
     return [ansible_path.strip() + '/modules',
             ansible_path.strip() + '/module_utils']
 
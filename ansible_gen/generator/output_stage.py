@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""output_stage.py docstrings.
+This module generates scripts into a staging directory and moves them into the output directory only when
+their content changed, so unchanged scripts keep their mtime.
+"""
+
+import os
+import re
+import shutil
+import logging
+import tempfile
+from collections import namedtuple
+
+STAGE_DIR_PREFIX = ".ansible-gen-stage-"
+# the generation time in DOCUMENTATION differs in every run, it is not regarded as a change.
+GENERATION_TIME_PATTERN = re.compile(br"^time:\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\r?$", re.M)
+
+
+class OutputReport(namedtuple("OutputReport", ["added", "changed", "unchanged", "removed"])):
+    """
+    The script paths of output directory, grouped by how this run changed them.
+    """
+    __slots__ = ()
+
+    def get_message(self):
+        """Get the report printed when the run finishes, the unchanged scripts are only counted."""
+        lines = ["Output report: {0} added, {1} changed, {2} unchanged, {3} removed.".format(
+            len(self.added), len(self.changed), len(self.unchanged), len(self.removed))]
+        for status, paths in [("added", self.added), ("changed", self.changed), ("removed", self.removed)]:
+            for path in paths:
+                lines.append("  {0}:{1}".format(status, path))
+        return lines
+
+
+def read_bytes(file_path):
+    with open(file_path, 'rb') as handle:
+        return handle.read()
+
+
+def is_same_script(staged_path, output_path):
+    """Whether the staged script has the same content as the one in output directory, except generation time.
+    Args:
+        staged_path: The path of staged script.
+        output_path: The path of script in output directory.
+    Returns:
+        A bool.
+    """
+    if not os.path.isfile(output_path):
+        return False
+    staged_data = read_bytes(staged_path)
+    output_data = read_bytes(output_path)
+    if staged_data == output_data:
+        return True
+    return GENERATION_TIME_PATTERN.sub(b"", staged_data) == GENERATION_TIME_PATTERN.sub(b"", output_data)
+
+
+class OutputStage(object):
+    """
+    A staging directory inside the output directory, so that os.replace() moves a script into place atomically.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.stage_dir = tempfile.mkdtemp(prefix=STAGE_DIR_PREFIX, dir=output_dir)
+
+    def get_staged_path(self, path):
+        return os.path.join(self.stage_dir, os.path.relpath(path, self.output_dir))
+
+    def stage_task(self, task):
+        """Get the task generating its script into the staging directory.
+        Args:
+            task: A ScriptTask whose output_dir is under the output directory.
+        Returns:
+            A ScriptTask.
+        """
+        staged_output_dir = self.get_staged_path(task.output_dir)
+        if not os.path.isdir(staged_output_dir):
+            os.makedirs(staged_output_dir)
+        return task._replace(output_dir=staged_output_dir)
+
+    def is_generated(self, task):
+        return os.path.isfile(self.get_staged_path(task.script_path))
+
+    def commit(self, tasks, clean_dirs=(), up_to_date_tasks=()):
+        """Move the changed scripts into the output directory.
+        Args:
+            tasks: All ScriptTask of this run.
+            clean_dirs: The sub directories of output directory whose entries not generated by this run are removed.
+            up_to_date_tasks: The tasks skipped by incremental build, their scripts are kept as unchanged.
+        Returns:
+            An OutputReport.
+        """
+        added, changed, unchanged, removed = [], [], [], []
+        produced = set()
+        up_to_date_tasks = set(up_to_date_tasks)
+        for task in tasks:
+            output_path = task.script_path
+            staged_path = self.get_staged_path(output_path)
+            if task in up_to_date_tasks:
+                unchanged.append(output_path)
+                produced.add(os.path.abspath(output_path))
+                continue
+            if not os.path.isfile(staged_path):
+                continue
+            produced.add(os.path.abspath(output_path))
+            if is_same_script(staged_path, output_path):
+                unchanged.append(output_path)
+                continue
+            if os.path.isfile(output_path):
+                changed.append(output_path)
+            else:
+                added.append(output_path)
+                if not os.path.isdir(os.path.dirname(output_path)):
+                    os.makedirs(os.path.dirname(output_path))
+            os.replace(staged_path, output_path)
+
+        for sub_dir in clean_dirs:
+            sub_output_dir = os.path.join(self.output_dir, sub_dir)
+            if not os.path.isdir(sub_output_dir):
+                continue
+            for name in sorted(os.listdir(sub_output_dir)):
+                path = os.path.join(sub_output_dir, name)
+                if os.path.abspath(path) in produced:
+                    continue
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+                removed.append(path)
+                logging.warning("%s removed, it is not generated by this run", path)
+        return OutputReport(added, changed, unchanged, removed)
+
+    def discard(self):
+        shutil.rmtree(self.stage_dir, ignore_errors=True)
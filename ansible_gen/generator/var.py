@@ -12,8 +12,6 @@ from ..adapter.get_argument_spec_documentation import get_xml_options, get_xml_d
     gen_documentation, check_xpaths_exists, get_xml_key_leafs, get_xml_list_leafs, get_xml_leafinfos, gen_argument_spec
 from ..adapter.get_rpc_head_tail import get_rpc_head, get_rpc_tail
 
-yang_handler = None
-
 head = """#!/usr/bin/env python
 # -*- coding: utf-8 -*-
 #
@@ -36,23 +34,25 @@ head = """#!/usr/bin/env python
 """
 
 
-def gen_documentation_params(full_xml_file_path, full_xml_ordered_dict, script_name, xml_namespace, xmlns_info):
+def gen_documentation_params(context, full_xml_file_path, full_xml_ordered_dict, script_name, xml_namespace,
+                             xmlns_info):
     """
      get params of the xml_file
+    :param context: the GenerationContext
     :param full_xml_file_path:
     :param full_xml_ordered_dict:
     :param script_name:
     :return:
     """
-    xml_options = get_xml_options(full_xml_file_path, full_xml_ordered_dict, xmlns_info)
+    xml_options = get_xml_options(context, full_xml_file_path, full_xml_ordered_dict, xmlns_info)
     if len(full_xml_ordered_dict) == 0:
         logging.error("xml file %s can't be tranport to OrderedDict", full_xml_file_path)
         return
 
-    if not check_xpaths_exists(full_xml_ordered_dict, xmlns_info):
+    if not check_xpaths_exists(context, full_xml_ordered_dict, xmlns_info):
         logging.error("not all node defined in xml %s occured in yang files", os.path.basename(full_xml_file_path))
         return
-    module_desc = get_xml_descption(xml_namespace)  # Get the overall description of the message
+    module_desc = get_xml_descption(context, xml_namespace)  # Get the overall description of the message
     xml_type = get_head_content(full_xml_ordered_dict)[2]
     documentation = gen_documentation(module_desc, xml_options, script_name, xml_type)
     return documentation
@@ -86,8 +86,8 @@ def get_user_check_stmts_module(user_def_dir, filename):
     return [module, user_check_stmts]
 
 
-def get_params(full_xml_file_path, script_name, output_file_path, user_def_dir=None):
-    """Get params"""
+def get_params(context, full_xml_file_path, script_name, output_file_path, user_def_dir=None, example_files=None):
+    """Get params, the yang files are looked up in context(a GenerationContext)."""
     full_xml_ordered_dict = get_xml_dict(full_xml_file_path)
     if full_xml_ordered_dict is None:
         return {}
@@ -104,17 +104,17 @@ def get_params(full_xml_file_path, script_name, output_file_path, user_def_dir=N
     xmlns_info = xmlns_info_without_prefix(namespace)
 
     # Get documentation
-    documentation = gen_documentation_params(full_xml_file_path, full_xml_ordered_dict, script_name, xml_namespace, xmlns_info)
+    documentation = gen_documentation_params(context, full_xml_file_path, full_xml_ordered_dict, script_name, xml_namespace, xmlns_info)
     # Get key_list
-    key_list = get_xml_key_leafs(full_xml_ordered_dict, xmlns_info)
+    key_list = get_xml_key_leafs(context, full_xml_ordered_dict, xmlns_info)
     # Get list_list
-    list_list = get_xml_list_leafs(full_xml_ordered_dict, xmlns_info)
+    list_list = get_xml_list_leafs(context, full_xml_ordered_dict, xmlns_info)
     # Get leaf_info
-    leaf_info = get_xml_leafinfos(full_xml_ordered_dict, xmlns_info)
+    leaf_info = get_xml_leafinfos(context, full_xml_ordered_dict, xmlns_info)
     # Get argument_spec
-    argument_spec = gen_argument_spec(full_xml_ordered_dict, xmlns_info, key_list, list_list)
+    argument_spec = gen_argument_spec(context, full_xml_ordered_dict, xmlns_info, key_list, list_list)
     # Get example
-    example = gen_example.create_example(full_xml_file_path, script_name, pkg_type, argument_spec)
+    example = gen_example.create_example(full_xml_file_path, script_name, pkg_type, argument_spec, example_files)
     # Get head_content
     head_content = get_head_content(full_xml_ordered_dict)
     # Get xml_tail
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""serve.py docstrings.
+This module serves ansible module generation over localhost HTTP with the yang files parsed once.
+
+POST /generate with a json body:
+    {"name": "ifm_cfg",                                   # the script name
+     "full_xml": "<rpc ...>...</rpc>",                    # the content of xxx_full.xml
+     "examples": {"ifm_cfg_example.xml": "<rpc ...>"},    # optional, the instance-xml files
+     "user_check": "class UserCheck(object): ...",        # optional, the previous script with UserCheck
+     "rpc": false}                                        # optional, true for the xml of rpcs directory
+returns {"name": ..., "module": "<generated script>", "errors": [...], "warnings": [...]}, the errors and warnings
+are the ones the command line run reports, whatever the log level is. A body larger than MAX_REQUEST_SIZE is rejected
+with 413.
+GET /status returns the yang directory and the loaded yang modules.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import logging
+import tempfile
+import traceback
+from optparse import OptionParser
+from .adapter import get_argument_spec_documentation as get_parser
+from .adapter.work_plan import build_work_plan, RPC_DIR_NAME
+from .adapter.utils import base_util
+from .generator import var, ansible_auto_scripts as script_gen
+
+if sys.version_info[0] == 2:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ForkingMixIn
+else:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ForkingMixIn
+
+SERVE_LOG_FILE = "ansible_gen_serve.log"
+# the requests are not authenticated and their user_check scripts are written and loaded, so only local clients are
+# served.
+SERVE_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# the yang directory is checked for changes at most once in the interval(seconds).
+RELOAD_CHECK_INTERVAL = 1.0
+NAME_PATTERN = re.compile(r"^[\w.-]+$")
+# the largest request body accepted(bytes), a larger one is rejected with 413 before it is read.
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+def check_request(request):
+    """Check the json body of generate request.
+    Args:
+        request: The decoded json body.
+    Returns:
+        The error message, None if the request is valid.
+    """
+    if not isinstance(request, dict):
+        return "request body should be a json object"
+    name = request.get("name")
+    if not isinstance(name, str) or not NAME_PATTERN.match(name) or name.startswith("."):
+        return "name should be a valid script name"
+    if not isinstance(request.get("full_xml"), str) or not request["full_xml"].strip():
+        return "full_xml should be the content of xxx_full.xml"
+    examples = request.get("examples") or dict()
+    if not isinstance(examples, dict):
+        return "examples should be an object of {file_name: content}"
+    for file_name, content in examples.items():
+        if not NAME_PATTERN.match(file_name) or not file_name.endswith("_example.xml") \
+                or not isinstance(content, str):
+            return "example %s should be a xxx_example.xml file name with its content" % file_name
+    if request.get("user_check") is not None and not isinstance(request["user_check"], str):
+        return "user_check should be the content of the previous script"
+    return None
+
+
+def write_file(file_path, content):
+    with open(file_path, 'w', encoding="utf-8") as handle:
+        handle.write(content)
+
+
+def generate_module(request, context):
+    """Generate the module of one request in a temporary directory, the same way as a command line run.
+    Args:
+        request: The decoded json body.
+        context: The GenerationContext with yang files loaded.
+    Returns:
+        status: The http status.
+        result: A dict, the response body.
+    """
+    error_msg = check_request(request)
+    if error_msg:
+        return 400, {"errors": [error_msg]}
+
+    name = request["name"]
+    work_dir = tempfile.mkdtemp(prefix="ansible-gen-")
+    with base_util.Diagnostics() as diagnostics:
+        try:
+            return generate_module_files(request, context, work_dir, diagnostics)
+        except Exception:
+            logging.error("generate module %s failed: %s", name, traceback.format_exc())
+            return 500, {"name": name, "errors": diagnostics.get_errors() + [
+                "%s.py generation failed, see the log" % name], "warnings": diagnostics.get_warnings()}
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def generate_module_files(request, context, work_dir, diagnostics):
+    """Write the files of request into work_dir and generate its module.
+    Args:
+        request: The decoded json body, which is valid.
+        context: The GenerationContext with yang files loaded.
+        work_dir: The temporary directory of the request.
+        diagnostics: The active base_util.Diagnostics of the request.
+    Returns:
+        status: The http status.
+        result: A dict, the response body.
+    """
+    name = request["name"]
+    resource_dir = os.path.join(work_dir, "resource")
+    module_dir = os.path.join(resource_dir, RPC_DIR_NAME if request.get("rpc") else "modules", name)
+    os.makedirs(module_dir)
+    write_file(os.path.join(module_dir, name + "_full.xml"), request["full_xml"])
+    for file_name, content in (request.get("examples") or dict()).items():
+        write_file(os.path.join(module_dir, file_name), content)
+    script_dir = None
+    if request.get("user_check"):
+        script_dir = os.path.join(work_dir, "script")
+        os.makedirs(script_dir)
+        write_file(os.path.join(script_dir, name + ".py"), request["user_check"])
+    output_dir = os.path.join(work_dir, "output")
+    os.makedirs(output_dir)
+
+    logging.info("generate module %s by request", name)
+    module_plan = build_work_plan(resource_dir).modules[0]
+    kwargs = var.get_params(context, module_plan.full_xml, name, output_dir, script_dir, module_plan.example_xmls)
+    if kwargs:
+        script_gen.Operation(**kwargs).run()
+    script_path = os.path.join(output_dir, name + ".py")
+    if not os.path.isfile(script_path):
+        errors = diagnostics.get_errors() or ["%s.py can not be generated" % name]
+        return 422, {"name": name, "errors": errors, "warnings": diagnostics.get_warnings()}
+    with open(script_path, encoding="utf-8") as handle:
+        module_text = handle.read()
+    return 200, {"name": name, "module": module_text,
+                 "errors": diagnostics.get_errors(), "warnings": diagnostics.get_warnings()}
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handle the request in the process forked for it.
+    """
+
+    def send_json(self, status, result):
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/status":
+            self.send_json(404, {"errors": ["unknown path %s" % self.path]})
+            return
+        modules = sorted(name for name, _ in self.server.context.ctx.modules.keys())
+        self.send_json(200, {"yang_dir": os.path.abspath(self.server.yang_dir), "modules": modules})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self.send_json(404, {"errors": ["unknown path %s" % self.path]})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.send_json(400, {"errors": ["Content-Length is not a number"]})
+            return
+        if length < 0:
+            self.send_json(400, {"errors": ["Content-Length is negative"]})
+            return
+        if length > MAX_REQUEST_SIZE:
+            # the body is not read, the connection is closed after the response.
+            self.close_connection = True
+            self.send_json(413, {"errors": ["request body of %d bytes is larger than %d bytes"
+                                            % (length, MAX_REQUEST_SIZE)]})
+            return
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError as error:
+            self.send_json(400, {"errors": ["request body is not valid json: %s" % error]})
+            return
+        status, result = generate_module(request, self.server.context)
+        self.send_json(status, result)
+
+    def log_message(self, format, *args):
+        logging.info("%s - %s", self.address_string(), format % args)
+
+
+class GenerationServer(ForkingMixIn, HTTPServer):
+    """
+    A process is forked from the server for each request, so independent requests are handled concurrently and
+    share the parsed yang context copy-on-write. The yang context is parsed again before forking when the yang
+    directory changed.
+    """
+
+    def __init__(self, server_address, yang_dir, features=None):
+        HTTPServer.__init__(self, server_address, GenerationRequestHandler)
+        self.yang_dir = yang_dir
+        self.features = features
+        self.context = None
+        self.yang_snapshot = None
+        self.checked_time = 0
+        self.reload_yang()
+
+    def reload_yang(self):
+        """Parse the yang files if the yang directory changed since last parse."""
+        self.checked_time = time.time()
+        snapshot = base_util.get_dir_snapshot(self.yang_dir)
+        if snapshot == self.yang_snapshot:
+            return
+        logging.info("yang directory %s changed, parse the yang files", self.yang_dir)
+        self.context = get_parser.get_generation_context(self.yang_dir, None, self.features)
+        self.yang_snapshot = snapshot
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    def finish_request(self, request, client_address):
+        """Handle the request in the forked process, whose log thread is not inherited from the server."""
+        base_util.restart_logging()
+        try:
+            HTTPServer.finish_request(self, request, client_address)
+        finally:
+            # the forked process exits without stopping the log thread.
+            base_util.flush_logging()
+
+    def process_request(self, request, client_address):
+        if time.time() - self.checked_time >= RELOAD_CHECK_INTERVAL:
+            try:
+                self.reload_yang()
+            except Exception:
+                logging.error("reload yang directory %s failed: %s", self.yang_dir, traceback.format_exc())
+        ForkingMixIn.process_request(self, request, client_address)
+
+
+def parse_args(argv):
+    """Parse the user input of serve command.
+    Args:
+        argv: The arguments after "serve".
+    Returns:
+        options: The instance record user input.
+    """
+    parser = OptionParser(usage="%prog serve [options]",
+                          description="Serve ansible module generation over localhost HTTP with the yang "
+                                      "files parsed once.")
+    parser.add_option("-y", "--yang_dir", dest="yang_dir", default='',
+                      help="the directory of yang_files.")
+    parser.add_option("-r", "--resource", dest="xml_dir", default='',
+                      help="only parse the yang modules used by the xml files in this directory, "
+                           "all yang modules are parsed if not designated.")
+    parser.add_option("-l", "--log", dest="log_dir", default=None,
+                      help="the log directory, name of log is %s" % SERVE_LOG_FILE)
+    parser.add_option("--port", dest="port", default=DEFAULT_PORT, type="int",
+                      help="the port to listen on at %s, default is %d." % (SERVE_HOST, DEFAULT_PORT))
+    parser.add_option("--log_level", dest="log_level", default="INFO",
+                      help="the log level, default is INFO.")
+    (options, _) = parser.parse_args(argv)
+
+    for name in ["yang_dir", "xml_dir"]:
+        if getattr(options, name) and not os.path.isdir(getattr(options, name)):
+            sys.stderr.write("[0x000001] : %s %s doesn't exists" % (name, getattr(options, name)))
+            sys.exit(1)
+    if not options.yang_dir:
+        sys.stderr.write("[0x000001] : yang_dir is not designated")
+        sys.exit(1)
+    if options.log_dir is None:
+        options.log_dir = os.path.join(os.getcwd(), 'logs')
+    if not os.path.exists(options.log_dir):
+        os.makedirs(options.log_dir)
+    return options
+
+
+def main(argv):
+    """Main function of serve command.
+    Args:
+        argv: The arguments after "serve".
+    """
+    options = parse_args(argv)
+    base_util.start_logging(os.path.join(options.log_dir, SERVE_LOG_FILE), options.log_level.upper())
+    try:
+        features = None
+        if options.xml_dir:
+            features = build_work_plan(options.xml_dir).get_namespaces()
+        server = GenerationServer((SERVE_HOST, options.port), options.yang_dir, features)
+        sys.stdout.write("Ansible-gen serving on http://%s:%d\n" % server.server_address[:2])
+        sys.stdout.flush()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    finally:
+        base_util.stop_logging()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""feature_lookup.py docstrings.
+Time finding the module of an xpath in a context of 2,000 modules, by the namespace dict of YangParser against the
+scan of every module that interfaces.get_feature_info() did before it.
+
+    python benchmarks/feature_lookup.py [--modules 2000] [--yang-dir DIR]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ansible_gen.adapter.utils.yang_parse import interfaces
+from ansible_gen.adapter.utils.yang_parse.yang_parser import YangParser
+from ansible_gen.adapter.utils.xml_parse.xml_parser_get_xmlns import get_node_xmlns
+
+from synthetic import write_lookup_tree, get_lookup_cases
+
+
+def scan_feature_module(xpath, parsed_data, xmlns_info):
+    """Find the module of xpath by scanning ctx.modules, the way get_feature_info() did."""
+    current_node_xmlns = get_node_xmlns(xpath, xmlns_info)
+    xml_namespace = get_node_xmlns("/" + xpath.split("/")[1], xmlns_info)
+    augment_flag = current_node_xmlns != xml_namespace
+    for _, module in parsed_data.ctx.modules.items():
+        if module.keyword != 'module':
+            continue
+        val_namespace = module.search_one("namespace")
+        if not augment_flag:
+            if val_namespace and val_namespace.arg == xml_namespace:
+                return module
+        elif val_namespace and val_namespace.arg == current_node_xmlns:
+            for _, module_by_augment in module.i_ctx.modules.items():
+                val_namespace = module_by_augment.search_one("namespace")
+                if val_namespace and val_namespace.arg == xml_namespace:
+                    return module_by_augment
+            return None
+    return None
+
+
+def dict_feature_module(xpath, parsed_data, xmlns_info):
+    """Find the module of xpath by the namespace dict."""
+    namespace = interfaces.get_feature_namespace(xpath, parsed_data, xmlns_info)
+    return None if namespace is None else parsed_data.namespace_modules[namespace]
+
+
+def time_lookups(function, parsed_data, cases):
+    start_time = time.time()
+    for xpath, xmlns_info in cases:
+        function(xpath, parsed_data, xmlns_info)
+    return time.time() - start_time
+
+
+def main():
+    parser = OptionParser(usage="%prog [--modules N] [--yang-dir DIR]")
+    parser.add_option("--modules", dest="modules", default=2000, type="int",
+                      help="the number of augmented-into modules, every 10th one is augmented, default is 2000.")
+    parser.add_option("--yang-dir", dest="yang_dir", default=None,
+                      help="write the yang files here and keep them, a temporary directory by default.")
+    (options, _) = parser.parse_args()
+
+    yang_dir = options.yang_dir or tempfile.mkdtemp(prefix="feature-lookup-")
+    try:
+        file_count = write_lookup_tree(yang_dir, options.modules)
+        start_time = time.time()
+        # the parse draws its progress bar on stdout.
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            parsed_data = YangParser(yang_dir, None).parse()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        print("parse %d yang files: %.1fs" % (file_count, time.time() - start_time))
+        start_time = time.time()
+        parsed_data.build_indexes()
+        print("build_indexes: %.3fs" % (time.time() - start_time))
+
+        cases = get_lookup_cases(options.modules)
+        for xpath, xmlns_info in cases:
+            if scan_feature_module(xpath, parsed_data, xmlns_info) is not \
+                    dict_feature_module(xpath, parsed_data, xmlns_info):
+                sys.exit("%s: the scan and the namespace dict find different modules" % xpath)
+        for name, function in [("scan", scan_feature_module), ("dict", dict_feature_module)]:
+            print("%s: %d lookups in %.3fs" % (name, len(cases), time_lookups(function, parsed_data, cases)))
+    finally:
+        if options.yang_dir is None:
+            shutil.rmtree(yang_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""logging_overhead.py docstrings.
+Measure what logging costs the generation:
+  - messages: log the per-xpath message many times, written synchronously by a FileHandler the way the log was
+    written before the background thread, through the queue at DEBUG, and dropped by level at INFO.
+  - tree: generate a large synthetic tree whose full-xml have leafs missing from the yang modules, at each log level.
+Every measurement runs in its own process, so the logging of one does not stay configured for the next.
+
+    python benchmarks/logging_overhead.py [--messages 200000] [--modules 150] [--leaves 120] [--levels DEBUG,INFO]
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+import subprocess
+from optparse import OptionParser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from ansible_gen.adapter.utils import base_util
+
+from synthetic import write_logging_tree
+
+MESSAGE_MODES = ["sync-DEBUG", "queue-DEBUG", "queue-INFO"]
+
+
+def count_lines(path):
+    if not os.path.isfile(path):
+        return 0
+    with open(path) as handle:
+        return sum(1 for _ in handle)
+
+
+def log_messages(mode, count, log_file):
+    """Log count per-xpath messages in mode, one of MESSAGE_MODES, and print the seconds spent."""
+    if mode == "sync-DEBUG":
+        logging.basicConfig(filename=log_file, format=base_util.LOG_FORMAT, level=logging.DEBUG)
+        start_time = time.time()
+        for index in range(count):
+            logging.debug("xpath %s not find in yang files", "/top/item/l%d" % index)
+        caller_time = time.time() - start_time
+    else:
+        base_util.start_logging(log_file, mode.split("-")[1])
+        with base_util.Diagnostics():
+            start_time = time.time()
+            for index in range(count):
+                base_util.log_xpath_message(logging.DEBUG, "xpath %s not find in yang files", "/top/item/l%d" % index)
+            caller_time = time.time() - start_time
+        base_util.stop_logging()
+    logging.shutdown()
+    print("%-12s caller %.2fs, written %.2fs, %d lines" % (mode, caller_time, time.time() - start_time,
+                                                          count_lines(log_file)))
+
+
+def run_messages(count, work_dir):
+    for mode in MESSAGE_MODES:
+        subprocess.check_call([sys.executable, os.path.abspath(__file__), "--message-mode", mode,
+                               "--messages", str(count), "--log-file", os.path.join(work_dir, mode + ".log")])
+
+
+def run_tree(options, work_dir):
+    yang_dir, xml_dir = write_logging_tree(os.path.join(work_dir, "tree"), options.modules, options.leaves)
+    for level in options.levels.split(","):
+        cfg_file = os.path.join(work_dir, level + ".cfg")
+        with open(cfg_file, "w") as handle:
+            handle.write("[defaults]\nlog_level = %s\n" % level)
+        log_dir = os.path.join(work_dir, "logs-" + level)
+        start_time = time.time()
+        with open(os.devnull, "w") as devnull:
+            subprocess.call([sys.executable, "-m", "ansible_gen.ansible_gen", "-y", yang_dir, "-r", xml_dir,
+                             "-l", log_dir, "-o", os.path.join(work_dir, "out-" + level), cfg_file],
+                            cwd=ROOT_DIR, stdout=devnull)
+        print("tree %-7s %d modules x %d leafs: %.1fs, %d log lines" % (
+            level, options.modules, options.leaves, time.time() - start_time,
+            count_lines(os.path.join(log_dir, "ansible_gen.log"))))
+
+
+def main():
+    parser = OptionParser(usage="%prog [--messages N] [--modules N] [--leaves N] [--levels DEBUG,INFO]")
+    parser.add_option("--messages", dest="messages", default=200000, type="int",
+                      help="the number of per-xpath messages logged, default is 200000, 0 to skip.")
+    parser.add_option("--modules", dest="modules", default=150, type="int",
+                      help="the number of modules of the synthetic tree, default is 150, 0 to skip.")
+    parser.add_option("--leaves", dest="leaves", default=120, type="int",
+                      help="the number of leafs of each module, every 10th one is missing from the yang module, "
+                           "default is 120.")
+    parser.add_option("--levels", dest="levels", default="DEBUG,INFO",
+                      help="the log levels the tree is generated at, default is DEBUG,INFO.")
+    parser.add_option("--message-mode", dest="message_mode", default=None, help="internal, run one mode of messages.")
+    parser.add_option("--log-file", dest="log_file", default=None, help="internal, the log file of --message-mode.")
+    (options, _) = parser.parse_args()
+
+    if options.message_mode:
+        log_messages(options.message_mode, options.messages, options.log_file)
+        return
+    work_dir = tempfile.mkdtemp(prefix="logging-overhead-")
+    try:
+        if options.messages:
+            run_messages(options.messages, work_dir)
+        if options.modules:
+            run_tree(options, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""synthetic.py docstrings.
+This module writes the synthetic yang and xml trees the benchmarks run on, so that the numbers of a change can be
+measured again on any machine.
+"""
+
+import os
+
+LOOKUP_MODULE = """module k-m{index} {{
+  namespace "urn:k:m{index}";
+  prefix m{index};
+  container top{index} {{
+    leaf name {{ type string; }}
+    leaf value {{ type uint32; }}
+  }}
+}}
+"""
+LOOKUP_AUGMENT = """module k-a{index} {{
+  namespace "urn:k:a{index}";
+  prefix a{index};
+  import k-m{index} {{ prefix m; }}
+  augment "/m:top{index}" {{
+    leaf extra {{ type string; }}
+  }}
+}}
+"""
+
+
+def write_file(path, content):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, "w") as handle:
+        handle.write(content)
+
+
+def write_lookup_tree(yang_dir, module_count=2000, augment_every=10):
+    """Write the yang files of a context with many modules, every augment_every-th one augmented by another module.
+    Args:
+        yang_dir: The directory of yang files written.
+        module_count: The number of augmented-into modules, k-m0.yang ... k-m{module_count - 1}.yang.
+        augment_every: Module k-m{index} is augmented by k-a{index} when index is a multiple of it.
+    Returns:
+        The number of yang files written.
+    """
+    count = 0
+    for index in range(module_count):
+        write_file(os.path.join(yang_dir, "k-m%d.yang" % index), LOOKUP_MODULE.format(index=index))
+        count += 1
+        if index % augment_every == 0:
+            write_file(os.path.join(yang_dir, "k-a%d.yang" % index), LOOKUP_AUGMENT.format(index=index))
+            count += 1
+    return count
+
+
+def get_lookup_cases(module_count=2000, step=7):
+    """Get the (xpath, xmlns_info) looked up in the context of write_lookup_tree(), covering the root, child,
+    augmented and unknown-namespace xpaths of every step-th module."""
+    cases = []
+    for index in range(0, module_count, step):
+        top = "/top%d" % index
+        xmlns_info = [{top: ['', 'xmlns="urn:k:m%d"' % index, top]},
+                      {top + "/name": ['', '', top + "/name"]},
+                      {top + "/extra": ['', 'xmlns="urn:k:a%d"' % index, top + "/extra"]},
+                      {top + "/value": ['', 'xmlns="urn:k:none"', top + "/value"]}]
+        for xpath in [top, top + "/name", top + "/extra", top + "/value"]:
+            cases.append((xpath, xmlns_info))
+    return cases
+
+
+def write_logging_tree(root, module_count=150, leaf_count=120, missing_every=10):
+    """Write a large tree of config modules, where the full-xml has leafs the yang module does not define, so the
+    per-xpath messages are logged for them.
+    Args:
+        root: The directory written, with the yang files in root/yang and the resource directory in root/res.
+        module_count: The number of yang modules and full-xml.
+        leaf_count: The number of leafs in the list of each full-xml.
+        missing_every: Every missing_every-th leaf of full-xml is left out of the yang module.
+    Returns:
+        (yang_dir, xml_dir)
+    """
+    yang_dir = os.path.join(root, "yang")
+    xml_dir = os.path.join(root, "res")
+    for index in range(module_count):
+        leafs = "".join('        leaf l%d { type string; description "Leaf %d."; }\n' % (leaf, leaf)
+                        for leaf in range(leaf_count) if leaf == 0 or leaf % missing_every != 0)
+        write_file(os.path.join(yang_dir, "big-m%d.yang" % index),
+                   'module big-m%d {\n  namespace "urn:big:m%d";\n  prefix m%d;\n  description "Big %d.";\n'
+                   '  container top%d {\n    list item {\n      key "l0";\n%s    }\n  }\n}\n'
+                   % (index, index, index, index, index, leafs))
+        xml_leafs = "".join("          <l%d></l%d>\n" % (leaf, leaf) for leaf in range(leaf_count))
+        write_file(os.path.join(xml_dir, "config", "m%d_cfg" % index, "m%d_cfg_full.xml" % index),
+                   '<rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">\n  <edit-config>\n'
+                   '    <target><running/></target>\n    <config>\n      <top%d xmlns="urn:big:m%d">\n'
+                   '        <item>\n%s        </item>\n      </top%d>\n    </config>\n  </edit-config>\n</rpc>\n'
+                   % (index, index, xml_leafs, index))
+    return yang_dir, xml_dir
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import pytest
+
+from ansible_gen.generator import budget
+
+KEPT = []
+
+
+def get_memory_limit(task, context):
+    # grow the address space of the worker as a leaking task would.
+    KEPT.append(bytearray(32 * 1024 * 1024))
+    return budget.resource.getrlimit(budget.resource.RLIMIT_AS)[0]
+
+
+@pytest.mark.skipif(budget.resource is None or not budget.is_supported(), reason="needs resource and fork")
+def test_reused_worker_keeps_its_memory_limit():
+    results = list(budget.run_in_budget(get_memory_limit, None, [1, 2, 3], 1, budget.Budget(None, 512)))
+    limits = [result for result, error in results]
+    assert [error for result, error in results] == [None, None, None]
+    assert limits[0] != budget.resource.RLIM_INFINITY
+    assert limits == [limits[0]] * 3
@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from optparse import Values
+
+from ansible_gen import ansible_gen
+
+
+def fill_options(args, default=''):
+    """Fill the options parse_args() leaves empty, --default is a store_true flag defaulting to ''."""
+    options = Values({"default": default, "yang_dir": '', "xml_dir": '', "script_dir": '', "log_dir": None,
+                      "cache_dir": None, "timeout": None, "memory_limit": None})
+    ansible_gen.fill_args_from_cfg_file(args, options)
+    return options
+
+
+def test_cfg_file_of_the_command_line_is_read_unless_default(tmp_path, monkeypatch):
+    user_cfg = tmp_path / "user.cfg"
+    user_cfg.write_text("[defaults]\nlog_level = DEBUG\ntimeout = 5\n")
+    default_cfg = tmp_path / "default.cfg"
+    default_cfg.write_text("[defaults]\nlog_level = WARNING\n")
+    monkeypatch.setattr(ansible_gen, "DEFAULT_CFG_FILE", str(default_cfg))
+
+    options = fill_options([str(user_cfg)])
+    assert (options.log_level, options.timeout) == ("DEBUG", 5.0)
+    options = fill_options([str(user_cfg)], default=True)
+    assert (options.log_level, options.timeout) == ("WARNING", None)
+    assert fill_options([]).log_level == "WARNING"
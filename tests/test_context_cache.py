@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import pickle
+
+import pytest
+
+from ansible_gen.adapter.utils.yang_parse.context_cache import ContextCache
+
+
+def write_entry(cache, key, value):
+    with open(cache.get_path(key), "wb") as handle:
+        pickle.dump(value, handle)
+    os.chmod(cache.get_path(key), 0o600)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="needs the owner of files")
+def test_load_only_trusted_entries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir(mode=0o700)
+    cache = ContextCache(str(cache_dir), "test")
+    write_entry(cache, "key", {"parsed": True})
+    assert cache.load("key") == {"parsed": True}
+
+    os.chmod(cache.get_path("key"), 0o620)
+    assert cache.load("key") is None
+    # an untrusted entry is not removed either, it is not ours.
+    assert os.path.isfile(cache.get_path("key"))
+
+    os.chmod(cache.get_path("key"), 0o600)
+    os.chmod(str(cache_dir), 0o777)
+    assert cache.load("key") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+TYPES_MODULE = "module test-types {\n  namespace \"urn:test:types\";\n  prefix types;\n%s}\n"
+IFM_MODULE = "module test-ifm {\n  namespace 'urn:test:ifm';\n  prefix ifm;\n" \
+             "  import 'test-types' { prefix types; }\n" \
+             "  container ifm { leaf name { type types:name; } }\n}\n"
+OTHER_MODULE = "module test-other {\n  namespace \"urn:test:other\";\n  prefix %s;\n}\n"
+
+
+def test_key_covers_the_imported_modules_only(tmp_path):
+    yang_dir = tmp_path / "yang"
+    yang_dir.mkdir()
+    (yang_dir / "test-types.yang").write_text(TYPES_MODULE % "  typedef name { type string; }\n")
+    (yang_dir / "test-ifm.yang").write_text(IFM_MODULE)
+    (yang_dir / "test-other.yang").write_text(OTHER_MODULE % "o")
+    cache = ContextCache(str(tmp_path / "cache"), "test")
+    key = cache.get_key(str(yang_dir), set(["urn:test:ifm"]))
+
+    (yang_dir / "test-other.yang").write_text(OTHER_MODULE % "other")
+    assert cache.get_key(str(yang_dir), set(["urn:test:ifm"])) == key
+
+    # the import is single-quoted, the key still changes with the imported module.
+    (yang_dir / "test-types.yang").write_text(TYPES_MODULE % "  typedef name { type string { length 1..8; } }\n")
+    assert cache.get_key(str(yang_dir), set(["urn:test:ifm"])) != key
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+
+from ansible_gen.adapter.impact import get_affected_plans
+from ansible_gen.adapter.work_plan import build_work_plan
+from ansible_gen.adapter.utils.yang_parse.namespace_index import get_namespace_index
+
+IFM_MODULE = "module test-ifm {\n  namespace 'urn:test:ifm';\n  prefix ifm;\n" \
+             "  container ifm { leaf name { type string; } }\n}\n"
+EXT_MODULE = "module test-ext {\n  namespace \"urn:test:ext\";\n  prefix ext;\n" \
+             "  import 'test-ifm' { prefix ifm; }\n%s}\n"
+FULL_XML = '<rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"><edit-config><config>' \
+           '<ifm xmlns="urn:test:ifm"/></config></edit-config></rpc>'
+
+
+def write_file(path, content):
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as handle:
+        handle.write(content)
+
+
+def write_tree(root):
+    yang_dir, xml_dir = os.path.join(root, "yang"), os.path.join(root, "res")
+    write_file(os.path.join(yang_dir, "test-ifm.yang"), IFM_MODULE)
+    write_file(os.path.join(yang_dir, "test-ext.yang"),
+               EXT_MODULE % "  augment \"/ifm:ifm\" { leaf extra { type string; } }\n")
+    write_file(os.path.join(xml_dir, "config", "ifm", "ifm_full.xml"), FULL_XML)
+    return yang_dir, xml_dir
+
+
+def get_affected_dirs(xml_dir, yang_dir, changed_files, cache_dir=None):
+    affected, unmatched = get_affected_plans(build_work_plan(xml_dir), yang_dir, changed_files, cache_dir=cache_dir)
+    return [plan.module_dir for plan in affected], unmatched
+
+
+def test_removed_augment_affects_the_augmented_module(tmp_path):
+    yang_dir, xml_dir = write_tree(str(tmp_path))
+    cache_dir = str(tmp_path / "cache")
+    # the generation saves the namespace index into its cache directory.
+    get_namespace_index(cache_dir).scan(yang_dir, set())
+    ext_file = os.path.join(yang_dir, "test-ext.yang")
+    write_file(ext_file, EXT_MODULE % "")
+
+    assert get_affected_dirs(xml_dir, yang_dir, [ext_file], cache_dir) == ([os.path.join(xml_dir, "config", "ifm")], [])
+    # the plan does not save the index, the next plan still knows the augment.
+    assert get_affected_dirs(xml_dir, yang_dir, [ext_file], cache_dir)[1] == []
+
+    os.remove(ext_file)
+    assert get_affected_dirs(xml_dir, yang_dir, [ext_file], cache_dir)[1] == []
+    assert get_affected_dirs(xml_dir, yang_dir, [ext_file])[1] == [ext_file]
+
+
+def test_changed_yang_file_without_index_affects_its_imports(tmp_path):
+    yang_dir, xml_dir = write_tree(str(tmp_path))
+    ext_file = os.path.join(yang_dir, "test-ext.yang")
+    write_file(ext_file, EXT_MODULE % "")
+    assert get_affected_dirs(xml_dir, yang_dir, [ext_file]) == ([os.path.join(xml_dir, "config", "ifm")], [])
+
+
+def test_example_in_sub_directory_affects_the_module(tmp_path):
+    yang_dir, xml_dir = write_tree(str(tmp_path))
+    example = os.path.join(xml_dir, "config", "ifm", "examples", "removed_example.xml")
+    other = os.path.join(xml_dir, "config", "ifm2", "other_example.xml")
+    assert get_affected_dirs(xml_dir, yang_dir, [example, other]) == ([os.path.join(xml_dir, "config", "ifm")], [other])
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import pytest
+
+from ansible_gen.adapter.utils.yang_parse.interval_set import IntervalSet, get_type_domain
+from ansible_gen.generator.checkparams import check_int, check_string, in_bounds
+
+
+class FailJson(Exception):
+    pass
+
+
+class FakeModule(object):
+    def fail_json(self, msg):
+        raise FailJson(msg)
+
+
+def test_from_intervals_merges_overlapping_and_adjacent():
+    interval_set = IntervalSet.from_intervals([(20, 30), (1, 5), (6, 10), (25, 40), (50, 49)])
+    assert interval_set.bounds == (1, 10, 20, 40)
+    assert interval_set.get_intervals() == [(1, 10), (20, 40)]
+
+
+def test_intersection():
+    left = IntervalSet.from_intervals([(1, 10), (20, 30), (40, 50)])
+    right = IntervalSet.from_intervals([(5, 25), (30, 45)])
+    assert left.intersection(right).bounds == (5, 10, 20, 25, 30, 30, 40, 45)
+    assert right.intersection(left) == left.intersection(right)
+    assert left.intersection(IntervalSet(())).bounds == ()
+
+
+def test_union():
+    left = IntervalSet.from_intervals([(1, 10)])
+    right = IntervalSet.from_intervals([(11, 20), (30, 40)])
+    assert left.union(right).bounds == (1, 20, 30, 40)
+
+
+def test_restrict_resolves_min_and_max_to_the_base():
+    base = get_type_domain("uint16").restrict([(1, 1023), (2048, "max")])
+    assert base.bounds == (1, 1023, 2048, 65535)
+    assert base.restrict([("min", 10), (3000, "max")]).bounds == (1, 10, 3000, 65535)
+    # a single value has no high
+    assert base.restrict([(7, None), (2000, None)]).bounds == (7, 7)
+
+
+def test_restrict_of_the_uint64_and_int64_limits():
+    assert get_type_domain("uint64").restrict([(10, "max")]).bounds == (10, 18446744073709551615)
+    assert get_type_domain("int64").restrict([("min", -5)]).bounds == (-9223372036854775808, -5)
+
+
+def test_contains_and_in_bounds():
+    interval_set = IntervalSet.from_intervals([(1, 1), (3, 3), (5, 6)])
+    for value in range(-1, 9):
+        expected = value in (1, 3, 5, 6)
+        assert interval_set.contains(value) == expected
+        assert in_bounds(interval_set.bounds, value) == expected
+    assert not in_bounds((), 0)
+
+
+def test_check_int_and_check_string_look_up_the_bounds():
+    module = FakeModule()
+    check_int((1, 10, 20, 30), 20, module)
+    check_int((1, 10, 20, 30), {'value': '30'}, module)
+    check_string((1, 3), [], 'abc', module)
+    with pytest.raises(FailJson):
+        check_int((1, 10, 20, 30), 15, module)
+    with pytest.raises(FailJson):
+        check_string((1, 3), [], 'abcd', module)
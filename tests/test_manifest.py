@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+
+from ansible_gen.adapter.work_plan import ModulePlan, ScriptTask
+from ansible_gen.generator.manifest import Manifest
+
+TEST_YANG = """module test {
+  namespace "urn:test";
+  prefix t;
+  container top { list item { key "name"; leaf name { type string; } leaf mtu { type uint32; } } }
+}
+"""
+DEVIATION_YANG = """module test-dev {
+  namespace "urn:test:dev";
+  prefix dev;
+  import test { prefix t; }
+  deviation "/t:top/t:item/t:mtu" { deviate replace { type uint32 { range "100..200"; } } }
+}
+"""
+OTHER_YANG = """module other {
+  namespace "urn:other";
+  prefix o;
+  leaf x { type string; }
+}
+"""
+
+
+def write_file(path, content):
+    with open(path, "w") as handle:
+        handle.write(content)
+
+
+def make_project(tmp_path):
+    yang_dir = tmp_path / "yang"
+    module_dir = tmp_path / "res" / "test_cfg"
+    output_dir = tmp_path / "out"
+    for directory in (yang_dir, module_dir, output_dir):
+        directory.mkdir(parents=True)
+    write_file(str(yang_dir / "test.yang"), TEST_YANG)
+    full_xml = str(module_dir / "test_cfg_full.xml")
+    write_file(full_xml, '<config><top xmlns="urn:test"/></config>')
+    plan = ModulePlan(str(module_dir), full_xml, (), frozenset(["urn:test"]), None)
+    task = ScriptTask(plan, str(output_dir), None)
+    write_file(task.script_path, "# generated\n")
+    return str(yang_dir), str(output_dir), task
+
+
+def record(output_dir, yang_dir, task):
+    manifest = Manifest(output_dir, "1.0.0", yang_dir)
+    manifest.record(task, manifest.get_dependency_files(task.plan.namespaces))
+    manifest.save()
+
+
+def test_up_to_date_without_changes(tmp_path):
+    yang_dir, output_dir, task = make_project(tmp_path)
+    record(output_dir, yang_dir, task)
+    assert Manifest(output_dir, "1.0.0", yang_dir).is_up_to_date(task)
+
+
+def test_unrelated_yang_file_keeps_module_up_to_date(tmp_path):
+    yang_dir, output_dir, task = make_project(tmp_path)
+    record(output_dir, yang_dir, task)
+    write_file(os.path.join(yang_dir, "other.yang"), OTHER_YANG)
+    assert Manifest(output_dir, "1.0.0", yang_dir).is_up_to_date(task)
+
+
+def test_deviation_added_makes_module_outdated(tmp_path):
+    yang_dir, output_dir, task = make_project(tmp_path)
+    record(output_dir, yang_dir, task)
+    write_file(os.path.join(yang_dir, "test-dev.yang"), DEVIATION_YANG)
+    manifest = Manifest(output_dir, "1.0.0", yang_dir)
+    assert not manifest.is_up_to_date(task)
+    assert os.path.join(os.path.abspath(yang_dir), "test-dev.yang") in manifest.get_dependency_files(
+        task.plan.namespaces)
+
+
+def test_deviation_changed_or_removed_makes_module_outdated(tmp_path):
+    yang_dir, output_dir, task = make_project(tmp_path)
+    deviation = os.path.join(yang_dir, "test-dev.yang")
+    write_file(deviation, DEVIATION_YANG)
+    record(output_dir, yang_dir, task)
+    assert Manifest(output_dir, "1.0.0", yang_dir).is_up_to_date(task)
+    write_file(deviation, DEVIATION_YANG.replace("100..200", "100..300"))
+    assert not Manifest(output_dir, "1.0.0", yang_dir).is_up_to_date(task)
+    record(output_dir, yang_dir, task)
+    os.remove(deviation)
+    assert not Manifest(output_dir, "1.0.0", yang_dir).is_up_to_date(task)
+
+
+def test_template_or_version_change_makes_module_outdated(tmp_path):
+    yang_dir, output_dir, task = make_project(tmp_path)
+    record(output_dir, yang_dir, task)
+    assert not Manifest(output_dir, "2.0.0", yang_dir).is_up_to_date(task)
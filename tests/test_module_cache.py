@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from ansible_gen.adapter.utils.yang_parse.module_cache import ModuleCache
+from ansible_gen.adapter.utils.yang_parse.namespace_index import get_namespace_index
+
+TYPES_MODULE = "module test-types {\n  namespace \"urn:test:types\";\n  prefix types;\n%s}\n"
+IFM_MODULE = "module test-ifm {\n  namespace 'urn:test:ifm';\n  prefix ifm;\n" \
+             "  import 'test-types' { prefix types; }\n" \
+             "  container ifm { leaf name { type types:name; } }\n}\n"
+AUG_MODULE = "module test-aug {\n  namespace \"urn:test:aug\";\n  prefix aug;\n  import test-ifm { prefix ifm; }\n" \
+             "  augment \"/ifm:ifm\" { leaf extra { type string; } }\n}\n"
+
+
+def get_keys(yang_dir):
+    headers, _ = get_namespace_index().scan(yang_dir, set())
+    return ModuleCache().get_keys(headers, ["test-ifm"])
+
+
+def test_keys_follow_the_load_closure(tmp_path):
+    (tmp_path / "test-types.yang").write_text(TYPES_MODULE % "  typedef name { type string; }\n")
+    (tmp_path / "test-ifm.yang").write_text(IFM_MODULE)
+    (tmp_path / "test-aug.yang").write_text(AUG_MODULE)
+    keys = get_keys(str(tmp_path))
+    assert sorted(keys) == ["test-aug", "test-ifm", "test-types"]
+    # test-ifm and test-aug load the same modules, their keys still differ.
+    assert len(set(keys.values())) == 3
+
+    # the single-quoted import is followed, the importing modules are keyed by the imported content.
+    (tmp_path / "test-types.yang").write_text(TYPES_MODULE % "  typedef name { type string { length 1..8; } }\n")
+    new_keys = get_keys(str(tmp_path))
+    assert all(new_keys[name] != keys[name] for name in keys)
+
+    (tmp_path / "test-aug.yang").unlink()
+    assert sorted(get_keys(str(tmp_path))) == ["test-ifm", "test-types"]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+
+from ansible_gen.adapter.work_plan import ModulePlan, ScriptTask
+from ansible_gen.generator.output_stage import OutputStage
+
+SCRIPT = "#!/usr/bin/env python\nDOCUMENTATION = '''\nmodule: {name}\ntime:{time}\n'''\nleaf = {leaf!r}\n"
+
+
+def make_task(output_dir, name):
+    plan = ModulePlan(os.path.join("res", "config", name), os.path.join("res", "config", name, name + "_full.xml"),
+                      (), frozenset(), "config")
+    return ScriptTask(plan, os.path.join(output_dir, "config"), None)
+
+
+def stage_script(stage, task, time="2026-10-18 10:00:00", leaf="name"):
+    staged_task = stage.stage_task(task)
+    with open(staged_task.script_path, "w") as handle:
+        handle.write(SCRIPT.format(name=task.plan.script_name, time=time, leaf=leaf))
+
+
+def read_file(path):
+    with open(path) as handle:
+        return handle.read()
+
+
+def commit(output_dir, scripts, **kwargs):
+    """Stage {task: (time, leaf)} in a new OutputStage and commit all of them."""
+    stage = OutputStage(output_dir)
+    try:
+        for task, (time, leaf) in scripts.items():
+            stage_script(stage, task, time, leaf)
+        return stage.commit(list(scripts), **kwargs)
+    finally:
+        stage.discard()
+
+
+def test_commit_reports_added_changed_and_unchanged(tmp_path):
+    output_dir = str(tmp_path)
+    first, second = make_task(output_dir, "first"), make_task(output_dir, "second")
+    report = commit(output_dir, {first: ("2026-10-18 10:00:00", "a"), second: ("2026-10-18 10:00:00", "b")})
+    assert sorted(report.added) == sorted([first.script_path, second.script_path])
+    assert (report.changed, report.unchanged, report.removed) == ([], [], [])
+
+    report = commit(output_dir, {first: ("2026-10-18 10:00:00", "a"), second: ("2026-10-18 10:00:00", "c")})
+    assert (report.added, report.changed, report.unchanged) == ([], [second.script_path], [first.script_path])
+    assert "leaf = 'c'" in read_file(second.script_path)
+    assert not [name for name in os.listdir(output_dir) if name.startswith(".ansible-gen-stage-")]
+
+
+def test_commit_ignores_the_generation_time(tmp_path):
+    output_dir = str(tmp_path)
+    task = make_task(output_dir, "first")
+    commit(output_dir, {task: ("2026-10-18 10:00:00", "a")})
+    os.utime(task.script_path, (1000000000, 1000000000))
+
+    report = commit(output_dir, {task: ("2026-10-19 11:22:33", "a")})
+    assert report.unchanged == [task.script_path]
+    # the script is not touched, it keeps the time and mtime of the run that changed it.
+    assert "time:2026-10-18 10:00:00" in read_file(task.script_path)
+    assert os.path.getmtime(task.script_path) == 1000000000
+
+
+def test_commit_replaces_the_script_atomically(tmp_path):
+    output_dir = str(tmp_path)
+    task = make_task(output_dir, "first")
+    commit(output_dir, {task: ("2026-10-18 10:00:00", "a")})
+    old_inode = os.stat(task.script_path).st_ino
+    with open(task.script_path) as old_handle:
+        report = commit(output_dir, {task: ("2026-10-18 10:00:00", "b")})
+        # a reader of the old script sees it whole, the new one is renamed over it instead of rewritten in place.
+        assert "leaf = 'a'" in old_handle.read()
+    assert report.changed == [task.script_path]
+    assert os.stat(task.script_path).st_ino != old_inode
+    assert "leaf = 'b'" in read_file(task.script_path)
+
+
+def test_commit_cleans_the_scripts_not_generated(tmp_path):
+    output_dir = str(tmp_path)
+    first, second, stale = [make_task(output_dir, name) for name in ["first", "second", "stale"]]
+    commit(output_dir, {first: ("2026-10-18 10:00:00", "a"), second: ("2026-10-18 10:00:00", "b"),
+                        stale: ("2026-10-18 10:00:00", "c")})
+
+    stage = OutputStage(output_dir)
+    try:
+        stage_script(stage, first, leaf="a")
+        report = stage.commit([first, second, stale], clean_dirs=["config"], up_to_date_tasks=[second])
+    finally:
+        stage.discard()
+    assert report.unchanged == [first.script_path, second.script_path]
+    assert report.removed == [stale.script_path]
+    assert sorted(os.listdir(os.path.join(output_dir, "config"))) == ["first.py", "second.py"]
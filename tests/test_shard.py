@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import json
+
+import pytest
+
+from ansible_gen.adapter.utils import base_util
+from ansible_gen.adapter.work_plan import build_work_plan, get_shard_index
+from ansible_gen.ansible_gen import merge_shards, SCRIPT_GEN_SUMMARY_FILE, SCRIPT_GEN_LOG_FILE
+
+FULL_XML = '<rpc xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"><edit-config><config>' \
+           '<top{index} xmlns="urn:test:m{index}"/></config></edit-config></rpc>'
+
+
+def write_resource_dir(xml_dir, count):
+    for index in range(count):
+        module_dir = os.path.join(xml_dir, "config", "m%d" % index)
+        os.makedirs(module_dir)
+        with open(os.path.join(module_dir, "m%d_full.xml" % index), "w") as handle:
+            handle.write(FULL_XML.format(index=index))
+
+
+def test_shard_index_only_depends_on_the_relative_path(tmp_path):
+    for count in [1, 2, 7]:
+        for name in ["m0", "m1", "a/b/m2"]:
+            index = get_shard_index(os.path.join("/one/res", name), "/one/res", count)
+            assert 1 <= index <= count
+            assert get_shard_index(os.path.join(str(tmp_path), name), str(tmp_path), count) == index
+
+
+def test_shards_partition_the_modules(tmp_path):
+    xml_dir = str(tmp_path / "res")
+    write_resource_dir(xml_dir, 40)
+    all_modules = [module.full_xml for module in build_work_plan(xml_dir)]
+    shards = [[module.full_xml for module in build_work_plan(xml_dir).select_shard((index, 3))]
+              for index in range(1, 4)]
+    assert sorted(sum(shards, [])) == sorted(all_modules)
+    assert all(shards)
+
+
+def write_shard_log_dir(log_dir, shard, message=""):
+    os.makedirs(log_dir)
+    with open(os.path.join(log_dir, SCRIPT_GEN_SUMMARY_FILE), "w") as handle:
+        json.dump({"version": "test", "shard": list(shard), "message": message,
+                   "diagnostics": base_util.Diagnostics().to_dict()}, handle)
+    with open(os.path.join(log_dir, SCRIPT_GEN_LOG_FILE), "w") as handle:
+        handle.write("shard %d/%d\n" % shard)
+
+
+def run_merge(argv):
+    with pytest.raises(SystemExit) as exit_info:
+        merge_shards(argv)
+    return exit_info.value.code
+
+
+def test_merge_detects_missing_shards(tmp_path, capsys):
+    shard_dirs = [str(tmp_path / ("shard%d" % index)) for index in range(1, 4)]
+    for index, shard_dir in enumerate(shard_dirs):
+        write_shard_log_dir(shard_dir, (index + 1, 3))
+
+    assert run_merge([shard_dirs[0], shard_dirs[2]]) == 1
+    assert "shard 2/3 is missing" in capsys.readouterr().out
+
+    merged_dir = str(tmp_path / "merged")
+    assert run_merge(["-l", merged_dir] + shard_dirs) == 0
+    assert "missing" not in capsys.readouterr().out
+    with open(os.path.join(merged_dir, SCRIPT_GEN_LOG_FILE)) as handle:
+        assert handle.read() == "shard 1/3\nshard 2/3\nshard 3/3\n"
+
+
+def test_merge_detects_duplicate_and_unfinished_shards(tmp_path, capsys):
+    write_shard_log_dir(str(tmp_path / "first"), (1, 2))
+    write_shard_log_dir(str(tmp_path / "again"), (1, 2))
+    os.makedirs(str(tmp_path / "unfinished"))
+
+    assert run_merge([str(tmp_path / name) for name in ["first", "again", "unfinished"]]) == 1
+    out = capsys.readouterr().out
+    assert "shard 1/2 is designated more than once" in out
+    assert "shard 2/2 is missing" in out
+    assert "did not finish" in out
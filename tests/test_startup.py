@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import sys
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_MODULE = "ansible_gen.ansible_gen"
+# imported only by the stages parsing yang and xml files or rendering scripts.
+HEAVY_MODULES = ("pyang", "lxml", "jinja2", "xmltodict", "ansible_gen.api", "ansible_gen.serve",
+                 "ansible_gen.generator.var", "ansible_gen.adapter.get_argument_spec_documentation")
+
+
+def test_startup_does_not_import_the_heavy_modules():
+    # a new interpreter, the modules imported by the other tests are not in its sys.modules.
+    code = "import sys, %s\nprint('\\n'.join(sys.modules))" % STARTUP_MODULE
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT_DIR, universal_newlines=True)
+    imported = output.split()
+    assert STARTUP_MODULE in imported
+    assert [heavy for heavy in HEAVY_MODULES
+            if any(name == heavy or name.startswith(heavy + ".") for name in imported)] == []